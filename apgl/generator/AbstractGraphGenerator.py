@@ -6,8 +6,39 @@ Created on 3 Jul 2009
 An abstract base class which represents a graph generator. The graph generator
 takes an existing empty graph and produces edges over it. 
 '''
+import numpy
 from apgl.util.Util import Util
 
 class AbstractGraphGenerator(object):
     def generate(self, graph):
-        Util.abstract() 
\ No newline at end of file
+        Util.abstract()
+
+    def setSeed(self, seed):
+        """
+        Set the seed of the random number generator used by generate for those 
+        generators which support it. Using the same integer seed or 
+        numpy.random.SeedSequence results in the same graph for each call, and 
+        a numpy.random.Generator is used (and advanced) directly. 
+
+        :param seed: None to seed from the global numpy.random state, an int, a numpy.random.SeedSequence or a numpy.random.Generator.
+        """
+        self.seed = seed
+
+    def getSeed(self):
+        """
+        :returns: the seed of the random number generator.
+        """
+        return self.seed
+
+    def _randomGenerator(self):
+        """
+        :returns: a numpy.random.Generator created from the seed of this object.
+        If the seed is None then the generator is seeded from the global 
+        numpy.random state, so that numpy.random.seed gives reproducible graphs. 
+        """
+        if self.seed is None:
+            return numpy.random.default_rng(numpy.random.randint(2**32, dtype=numpy.uint64))
+
+        return numpy.random.default_rng(self.seed)
+
+    seed = None 
\ No newline at end of file
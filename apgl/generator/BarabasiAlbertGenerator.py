@@ -1,5 +1,4 @@
 
-
 from apgl.util.Parameter import Parameter
 from apgl.graph.AbstractMatrixGraph import AbstractMatrixGraph
 from apgl.generator.AbstractGraphGenerator import AbstractGraphGenerator
@@ -11,6 +10,14 @@ class  BarabasiAlbertGenerator(AbstractGraphGenerator):
     A class which generates graphs according to the Barabasi-Albert Model. We start with
     ell vertices, and then add a new vertex at each iteration with m edges. The probability
     of attachment to vertex i is d_i / \sum_j d_j where d_i is the degree of the ith vertex.
+
+    The endpoints of the edges are kept in a preallocated array in which each
+    vertex i occurs d_i times, so that attachment corresponds to choosing a 
+    uniform position in the array, and repeated choices of the same vertex are
+    rejected and sampled again. After the first few iterations the choices 
+    for all vertices are made at once, and positions which refer to the 
+    endpoint of an earlier edge are resolved by pointer jumping. The edges are
+    added to the graph in one operation. 
     '''
 
     def __init__(self, ell, m):
@@ -56,31 +63,128 @@ class  BarabasiAlbertGenerator(AbstractGraphGenerator):
         if graph.getNumEdges()!= 0:
             raise ValueError("Graph must have no edges")
         
-        #Keep a list of node indices with degrees
-        #First start off with ell vertices assume they each have degree 1, without
-        #adding edges. This is a bit weird but seems the way to do it. 
-        vertexList = list(range(0, self.ell))
-
-        #Now perform preferential attachment, making sure we add m edges at each
-        #iteration. 
-        for i in range(self.ell, graph.getNumVertices()):
-            perm = numpy.random.permutation(len(vertexList))
-            numEdgesAdded = 0
-            j = 0 
-
-            while numEdgesAdded != self.m:
-                ind = perm[j]
-                vertexIndex = vertexList[ind]
-                
-                if graph.getEdge(i, vertexIndex) == None:
-                    graph.addEdge(i, vertexIndex)
-                    vertexList.append(i)
-                    vertexList.append(vertexIndex)
-                    numEdgesAdded += 1
-                
-                j = j+1
+        edges = self.generateEdges(graph.getNumVertices())
+        graph.addEdges(edges)
 
         return graph
 
+    def generateEdges(self, numVertices): 
+        """
+        Sample the edges of a Barabasi-Albert graph without creating a graph. 
+        The ith group of m edges joins vertex ell+i to m distinct vertices with 
+        smaller indices.
+
+        :param numVertices: the number of vertices.
+        :type numVertices: :class:`int`
+
+        :returns: An array with 2 columns and an edge on each row. 
+        """
+        Parameter.checkInt(numVertices, 0, float('inf'))
+        numSteps = max(numVertices - self.ell, 0)
+        numEdges = numSteps*self.m 
+        randGen = self._randomGenerator()
+
+        #Targets of each edge, in which -1 means unresolved 
+        targets = numpy.zeros(numEdges, numpy.int64)
+
+        #Choose the early targets one vertex at a time since there are many repeats 
+        numSeqSteps = min(numSteps, self.sequentialSteps)
+        numSeqEdges = numSeqSteps*self.m
+        endpoints = numpy.zeros(self.ell + 2*numSeqEdges, numpy.int64)
+        endpoints[0:self.ell] = numpy.arange(self.ell)
+        numEndpoints = self.ell 
+
+        for i in range(numSeqSteps): 
+            vertices = numpy.zeros(0, numpy.int64) 
+
+            while vertices.shape[0] < self.m: 
+                inds = randGen.integers(0, numEndpoints, 2*self.m)
+                vertices = numpy.r_[vertices, endpoints[inds]]
+                firstInds = numpy.sort(numpy.unique(vertices, return_index=True)[1])
+                vertices = vertices[firstInds[0:self.m]]
+
+            targets[i*self.m:(i+1)*self.m] = vertices
+            endpoints[numEndpoints:numEndpoints+2*self.m:2] = self.ell + i 
+            endpoints[numEndpoints+1:numEndpoints+2*self.m:2] = vertices
+            numEndpoints += 2*self.m
+
+        #Now choose the remaining targets for all vertices at once 
+        if numSeqEdges != numEdges: 
+            edgeInds = numpy.arange(numSeqEdges, numEdges)
+            numStepEndpoints = self.ell + 2*(edgeInds//self.m)*self.m
+            positions = randGen.integers(0, numStepEndpoints)
+
+            while True: 
+                targets[numSeqEdges:] = self.__resolveTargets(positions, targets[0:numSeqEdges])
+                repeats = self.__repeatedTargets(targets[numSeqEdges:])
+
+                if repeats.shape[0] == 0: 
+                    break 
+
+                positions[repeats] = randGen.integers(0, numStepEndpoints[repeats])
+
+        sources = self.ell + numpy.arange(numEdges)//max(self.m, 1)
+        return numpy.c_[sources, targets]
+
+    def __resolveTargets(self, positions, seqTargets): 
+        """
+        Find the vertices at the given positions of the endpoint array, where
+        the array starts with the initial vertices followed by the source and 
+        target of each edge in turn. The targets of the first edges are given 
+        by seqTargets. 
+        """
+        numSeqEdges = seqTargets.shape[0]
+        offsets = positions - self.ell
+
+        #References are indices of earlier edges whose target is at the position 
+        isTarget = numpy.logical_and(offsets >= 0, offsets % 2 == 1)
+        references = offsets//2 
+
+        targets = numpy.where(offsets < 0, positions, self.ell + references//max(self.m, 1))
+        references = references[isTarget]
+        unresolved = numpy.flatnonzero(isTarget)
+        targets[unresolved] = -1
+
+        isSeq = references < numSeqEdges 
+        targets[unresolved[isSeq]] = seqTargets[references[isSeq]]
+        unresolved = unresolved[~isSeq]
+        references = references[~isSeq] - numSeqEdges
+
+        #Pointer jumping halves the length of the chains of references each time 
+        chains = references.copy()
+        chainEdges = numpy.full(targets.shape[0], -1, numpy.int64)
+        chainEdges[unresolved] = numpy.arange(unresolved.shape[0])
+
+        while unresolved.shape[0] != 0: 
+            values = targets[references]
+            done = values >= 0 
+            targets[unresolved[done]] = values[done]
+
+            unresolved = unresolved[~done]
+            references = references[~done]
+            nextEdges = chainEdges[references]
+            canJump = nextEdges >= 0 
+            references[canJump] = chains[nextEdges[canJump]]
+            chains[chainEdges[unresolved]] = references 
+
+        return targets 
+
+    def __repeatedTargets(self, targets): 
+        """
+        Return the indices of the targets which repeat a target with a smaller 
+        index of the same source vertex. 
+        """
+        if self.m <= 1: 
+            return numpy.zeros(0, numpy.int64)
+
+        targets = targets.reshape((-1, self.m))
+        order = numpy.argsort(targets, axis=1, kind="mergesort")
+        sortedTargets = numpy.take_along_axis(targets, order, axis=1)
+        rows, cols = numpy.nonzero(sortedTargets[:, 1:] == sortedTargets[:, 0:-1])
+
+        return rows*self.m + order[rows, cols+1]
+
     def __str__(self):
-        return "BarabasiAlbertGenerator_ell="+str(self.ell)+",m="+str(self.m)
\ No newline at end of file
+        return "BarabasiAlbertGenerator_ell="+str(self.ell)+",m="+str(self.m)
+
+    sequentialSteps = 50 
@@ -1,6 +1,5 @@
 
 from apgl.util.Parameter import Parameter
-from apgl.util.Util import Util
 from apgl.graph.AbstractMatrixGraph import AbstractMatrixGraph
 from apgl.generator.AbstractGraphGenerator import AbstractGraphGenerator
 import numpy
@@ -10,9 +9,16 @@ class ConfigModelGenerator(AbstractGraphGenerator):
     '''
     A class which generates graphs according to the configuration model. In this model
     one specifies a degree sequence and the generated graph fits the sequence as closely
-    as possible. 
+    as possible. Each vertex has a number of "stubs" equal to its degree and the 
+    stubs are paired at random. The pairing may result in multiple edges between 
+    the same vertices and self edges, which are treated according to the 
+    policy of the generator: 
+
+    - "keep": multiple edges are merged into one edge and self edges are kept.
+    - "erase": multiple edges are merged into one edge and self edges are removed.
+    - "rewire": the endpoints of multiple and self edges are swapped with those of randomly chosen edges, which preserves the degrees, and any remaining ones are erased.
     '''
-    def __init__(self, outDegSequence, inDegSequence=None):
+    def __init__(self, outDegSequence, inDegSequence=None, policy="keep"):
         '''
         Create a ConfigModelGenerator object with the given degree sequence. If inDegreeSequence
         is None then we assume an undirected graph, otherwise it is directed. Note that the sum
@@ -25,12 +31,15 @@ class ConfigModelGenerator(AbstractGraphGenerator):
         :param inDegSequence: a vector of in-degrees for each vertex in the graph or None for undirected graphs. 
         :type inDegSequence: :class:`numpy.ndarray`
 
+        :param policy: how to treat multiple edges and self edges: "keep", "erase" or "rewire".
+        :type policy: :class:`str`
         '''
         self.setOutDegSequence(outDegSequence)
-        if inDegSequence != None:
+        if inDegSequence is not None:
             self.setInDegSequence(inDegSequence)
         else:
             self.inDegSequence = None 
+        self.setPolicy(policy)
 
     def setOutDegSequence(self, outDegSequence):
         '''
@@ -62,6 +71,34 @@ class ConfigModelGenerator(AbstractGraphGenerator):
 
         self.inDegSequence = inDegSequence
 
+    def setPolicy(self, policy):
+        '''
+        Set how multiple edges and self edges are treated.
+
+        :param policy: one of "keep", "erase" or "rewire".
+        :type policy: :class:`str`
+        '''
+        if policy not in ["keep", "erase", "rewire"]:
+            raise ValueError("Invalid policy: " + str(policy))
+
+        self.policy = policy
+
+    def getPolicy(self):
+        """
+        :returns: How multiple edges and self edges are treated.
+        """
+        return self.policy
+
+    def setMaxRewires(self, maxRewires):
+        '''
+        Set the maximum number of rounds of edge swaps used by the "rewire" policy.
+
+        :param maxRewires: the maximum number of rounds of swaps.
+        :type maxRewires: :class:`int`
+        '''
+        Parameter.checkInt(maxRewires, 0, float('inf'))
+        self.maxRewires = maxRewires
+
     def getOutDegSequence(self):
         """
         :returns: A vector of integers corresponding to the (out)degree sequence.
@@ -77,9 +114,9 @@ class ConfigModelGenerator(AbstractGraphGenerator):
     def generate(self, graph, requireEmpty=True):
         '''
         Create an Configuration Model graph. Note the the degree sequence(s) given
-        in the constructor cannot be guarenteed. The algorithm randomly selects
-        two free "spokes" and then tried to connect them. If two vertices are
-        already connected the corresponding spokes are not used again. In the case
+        in the constructor cannot be guarenteed. The stubs of the vertices are 
+        randomly paired and the resulting edges are added to the graph at once, 
+        with multiple and self edges treated according to the policy. In the case
         that requireEmpty is False then a non-empty graph can be used and the given
         degree sequence(s) is(are) the difference(s) in degrees between the output graph and
         input one. 
@@ -97,23 +134,117 @@ class ConfigModelGenerator(AbstractGraphGenerator):
             raise ValueError("Graph must have no edges")
         if graph.getNumVertices() != self.outDegSequence.shape[0]:
             raise ValueError("Graph must have same number of vertices as degree sequence")
-        if self.getInDegSequence()!=None and graph.isUndirected():
+        if self.getInDegSequence() is not None and graph.isUndirected():
             raise ValueError("In-degree sequence must be used in conjunction with directed graphs")
 
-        if self.getInDegSequence()==None:
-            expandedInds = Util.expandIntArray(self.outDegSequence)
-            numpy.random.shuffle(expandedInds)
-            for i in range(0, len(expandedInds), 2):
-                if i != len(expandedInds)-1:
-                    graph.addEdge(expandedInds[i], expandedInds[i+1])
+        graph.addEdges(self.generateEdges())
+
+        return graph
+
+    def generateEdges(self):
+        '''
+        Pair the stubs of the degree sequence(s) at random without creating a 
+        graph. For undirected graphs the stubs are shuffled and reshaped into 
+        pairs, and an odd stub is left unused. For directed graphs the shuffled 
+        out-stubs are paired with the shuffled in-stubs, and the extra stubs of 
+        the larger sequence are unused. 
+
+        :returns: An array with 2 columns and an edge on each row, treated according to the policy.
+        '''
+        randGen = self._randomGenerator()
+        numVertices = self.outDegSequence.shape[0]
+        outStubs = randGen.permutation(numpy.repeat(numpy.arange(numVertices), self.outDegSequence))
+
+        if self.inDegSequence is None:
+            edges = outStubs[0:(outStubs.shape[0]//2)*2].reshape((-1, 2))
         else:
-            expandedOutInds = Util.expandIntArray(self.outDegSequence)
-            expandedInInds = Util.expandIntArray(self.inDegSequence)
-            numpy.random.shuffle(expandedOutInds)
-            numpy.random.shuffle(expandedInInds)
+            inStubs = randGen.permutation(numpy.repeat(numpy.arange(numVertices), self.inDegSequence))
+            numEdges = min(outStubs.shape[0], inStubs.shape[0])
+            edges = numpy.c_[outStubs[0:numEdges], inStubs[0:numEdges]]
 
-            for i in range(numpy.min(numpy.array([expandedOutInds.shape[0], expandedInInds.shape[0]]))):
-                graph.addEdge(expandedOutInds[i], expandedInInds[i])
+        if self.policy == "rewire":
+            for i in range(self.maxRewires):
+                invalid = self.__invalidEdges(edges)
 
-        return graph
+                if invalid.shape[0] == 0:
+                    break
+
+                self.__swapEdges(edges, invalid, randGen)
+
+        if self.policy == "keep":
+            edges = edges[self.__firstEdges(edges), :]
+        else:
+            edges = numpy.delete(edges, self.__invalidEdges(edges), 0)
+
+        return edges
+
+    def degreeError(self, edges):
+        '''
+        Compare the degrees of a set of edges, for example those from generateEdges, 
+        with the requested degree sequence(s). Self edges contribute 2 to the 
+        degree of a vertex in undirected graphs, as in degreeSequence. 
+
+        :param edges: An array with 2 columns and an edge on each row.
+        :type edges: :class:`numpy.ndarray`
+
+        :returns: The requested minus the realised degrees for an undirected graph, otherwise a tuple of the errors in the out- and in-degrees. 
+        '''
+        numVertices = self.outDegSequence.shape[0]
+        edges = numpy.asarray(edges, numpy.int)
+
+        if self.inDegSequence is None:
+            degrees = numpy.bincount(edges.ravel(), minlength=numVertices)
+            return self.outDegSequence - degrees
+        else:
+            outDegrees = numpy.bincount(edges[:, 0], minlength=numVertices)
+            inDegrees = numpy.bincount(edges[:, 1], minlength=numVertices)
+            return self.outDegSequence - outDegrees, self.inDegSequence - inDegrees
+
+    def __edgeKeys(self, edges):
+        """
+        Return a key for each edge, which is independent of direction for 
+        undirected graphs. 
+        """
+        numVertices = self.outDegSequence.shape[0]
+
+        if self.inDegSequence is None:
+            return numpy.minimum(edges[:, 0], edges[:, 1])*numVertices + numpy.maximum(edges[:, 0], edges[:, 1])
+        else:
+            return edges[:, 0]*numVertices + edges[:, 1]
+
+    def __firstEdges(self, edges):
+        """
+        Return the indices of the first occurrence of each edge. 
+        """
+        return numpy.sort(numpy.unique(self.__edgeKeys(edges), return_index=True)[1])
+
+    def __invalidEdges(self, edges):
+        """
+        Return the indices of the self edges and of the repeats of earlier edges.
+        """
+        invalid = numpy.ones(edges.shape[0], numpy.bool)
+        invalid[self.__firstEdges(edges)] = False
+        invalid[edges[:, 0] == edges[:, 1]] = True
+
+        return numpy.flatnonzero(invalid)
+
+    def __swapEdges(self, edges, invalid, randGen):
+        """
+        Swap the second endpoint of each invalid edge with that of a distinct 
+        randomly chosen valid edge, in place. 
+        """
+        valid = numpy.setdiff1d(numpy.arange(edges.shape[0]), invalid)
+        if valid.shape[0] == 0:
+            return
+
+        partners = valid[randGen.integers(0, valid.shape[0], invalid.shape[0])]
+        partners, inds = numpy.unique(partners, return_index=True)
+        invalid = invalid[inds]
+
+        endpoints = edges[invalid, 1].copy()
+        edges[invalid, 1] = edges[partners, 1]
+        edges[partners, 1] = endpoints
 
+    inDegSequence = None
+    policy = "keep"
+    maxRewires = 20
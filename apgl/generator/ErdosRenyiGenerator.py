@@ -1,29 +1,36 @@
-
 from apgl.util.Parameter import Parameter
 from apgl.graph.AbstractMatrixGraph import AbstractMatrixGraph
 from apgl.generator.AbstractGraphGenerator import AbstractGraphGenerator
 import numpy
-import scipy
 
 class ErdosRenyiGenerator(AbstractGraphGenerator):
     '''
     A class which generates graphs according to the Erdos-Renyi Model. At construction time, it
-    takes an empty graph, for which it creates edges.
+    takes an empty graph, for which it creates edges. Edges are sampled in 
+    O(n + m) time for n vertices and m edges by skipping over the candidate 
+    vertex pairs using geometrically distributed gaps (the G(n, p) model), or 
+    by choosing exactly m distinct pairs (the G(n, m) model). For undirected 
+    graphs only the lower triangle of the weight matrix is sampled. 
     '''
-    def __init__(self, p, selfEdges=False):
+    def __init__(self, p, selfEdges=False, m=None):
         '''
         Create an Erdos-Renyi generator with edge probability p. For all pairs
         of vertices in the graph, an edge exists with probability p. If selfEdges
-        is False edges from a vertex to itself are not created.
+        is False edges from a vertex to itself are not created. If m is not None
+        then exactly m edges are chosen uniformly at random and p is ignored. 
 
         :param p: the probability of an edge
         :type p: :class:`float`
 
         :param selfEdges: whether to allow self edges
         :type selfEdges: :class:`bool` 
+
+        :param m: the number of edges, or None to use the edge probability.
+        :type m: :class:`int`
         '''
         self.setP(p)
         self.setSelfEdges(selfEdges)
+        self.setM(m)
 
     def setSelfEdges(self, selfEdges):
         """
@@ -41,9 +48,20 @@ class ErdosRenyiGenerator(AbstractGraphGenerator):
         Parameter.checkFloat(p, 0.0, 1.0)
         self.p = p 
 
+    def setM(self, m):
+        '''
+        :param m: the number of edges, or None to use the edge probability.
+        :type m: :class:`int`
+        '''
+        if m is not None: 
+            Parameter.checkInt(m, 0, float('inf'))
+        self.m = m 
+
     def generate(self, graph, requireEmpty=True):
         '''
-        Create an Erdos-Renyi graph from the given input graph. 
+        Create an Erdos-Renyi graph from the given input graph. If requireEmpty
+        is False, the edges of the graph are retained and sampled edges are 
+        set to 1. 
 
         :param graph: an empty graph to populate with edges
         :type graph: :class:`apgl.graph.AbstractMatrixGraph`
@@ -57,59 +75,171 @@ class ErdosRenyiGenerator(AbstractGraphGenerator):
         if requireEmpty and graph.getNumEdges()!= 0:
             raise ValueError("Graph must have no edges")
         
-        numVertices = graph.getNumVertices()
-        #This function seems slightly weird- sometimes the last cols are empty 
-        W = scipy.sparse.rand(numVertices, numVertices, self.p)
-        W = W/W
+        edges = self.generateEdges(graph.getNumVertices(), graph.isUndirected())
+        graph.addEdges(edges)
+            
+        return graph
         
-        if graph.isUndirected():
-            diagW = W.diagonal()
-            W = scipy.sparse.triu(W, 1)
-            W = W + W.T
+    def generate2(self, graph, requireEmpty=True): 
+        """
+        An alternative way of generating random edges, which is now identical 
+        to generate. 
+        """
+        return self.generate(graph, requireEmpty)
 
-            if self.selfEdges:
-                W.setdiag(diagW)
+    def generateEdges(self, numVertices, undirected=True): 
+        """
+        Sample the edges of an Erdos-Renyi graph without creating a graph. 
 
-        if not self.selfEdges:
-            W.setdiag(numpy.zeros(numVertices))
+        :param numVertices: the number of vertices.
+        :type numVertices: :class:`int`
 
-        if not requireEmpty:
-            W = W + graph.getWeightMatrix()
+        :param undirected: whether to sample an undirected graph, in which case edges (i, j) have i >= j.
+        :type undirected: :class:`bool`
 
-        graph.setWeightMatrix(W)
-            
-        return graph
-        
-    def generate2(self, graph, requireEmpty=True): 
+        :returns: An array with 2 columns and an edge on each row, sorted by row and then column.
         """
-        An alternative way of generating random edges which might work better 
-        than generate. 
+        blocks = list(self.edgeBlocks(numVertices, undirected))
+
+        if len(blocks) == 0: 
+            return numpy.zeros((0, 2), numpy.int64)
+
+        return numpy.concatenate(blocks)
+
+    def edgeBlocks(self, numVertices, undirected=True, blockSize=2**20): 
         """
-        Parameter.checkClass(graph, AbstractMatrixGraph)
-        if requireEmpty and graph.getNumEdges()!= 0:
-            raise ValueError("Graph must have no edges")
-            
-        numVertices = graph.getNumVertices()
-        W = numpy.random.rand(numVertices, numVertices) < self.p
-        W = numpy.array(W, numpy.int)
-        
-        if graph.isUndirected():
-            diagW = numpy.diag(W)
-            W = numpy.triu(W, 1)
-            W = W + W.T
-  
-        
-        graph.setWeightMatrix(scipy.sparse.csr_matrix(W, dtype=numpy.float))
-            
-        return graph
-        
+        A generator over blocks of the edges of an Erdos-Renyi graph, which
+        allows graphs larger than memory to be sampled. The blocks are in 
+        coordinate (COO) format, i.e. arrays with 2 columns and an edge on each
+        row, and the edges are in order of row and then column. 
+
+        :param numVertices: the number of vertices.
+        :type numVertices: :class:`int`
+
+        :param undirected: whether to sample an undirected graph, in which case edges (i, j) have i >= j.
+        :type undirected: :class:`bool`
+
+        :param blockSize: the maximum number of edges in each block. 
+        :type blockSize: :class:`int`
+        """
+        Parameter.checkInt(numVertices, 0, float('inf'))
+        Parameter.checkBoolean(undirected)
+        Parameter.checkInt(blockSize, 1, float('inf'))
+
+        numPairs = self.__numPairs(numVertices, undirected)
+        randGen = self._randomGenerator()
+
+        if self.m is not None: 
+            if self.m > numPairs: 
+                raise ValueError("Cannot choose " + str(self.m) + " edges from " + str(numPairs) + " vertex pairs")
+
+            keys = numpy.sort(randGen.choice(numPairs, self.m, replace=False, shuffle=False))
+
+            for i in range(0, self.m, blockSize): 
+                yield self.__pairs(keys[i:i+blockSize], numVertices, undirected)
+        elif self.p != 0 and numPairs != 0: 
+            #Skip over the pairs without edges using geometric gaps. Each draw is 
+            #sized from the expected number of remaining edges plus 4 standard 
+            #deviations, so that small graphs take O(n + m) time. The gaps are 
+            #read in order, so the edges do not depend on the draw sizes. 
+            lastKey = -1 
+
+            while True: 
+                expectedEdges = (numPairs - lastKey - 1)*self.p
+                numGaps = min(blockSize, int(expectedEdges + 4*numpy.sqrt(expectedEdges)) + 1)
+                keys = lastKey + numpy.cumsum(randGen.geometric(self.p, numGaps))
+                keys = keys[keys < numPairs]
+
+                if keys.shape[0] != 0: 
+                    yield self.__pairs(keys, numVertices, undirected)
+
+                if keys.shape[0] != numGaps: 
+                    break 
+
+                lastKey = keys[-1]
+
+    def writeEdges(self, fileName, numVertices, undirected=True, blockSize=2**20): 
+        """
+        Sample the edges of an Erdos-Renyi graph and write them block by block 
+        to a binary file of int64 vertex index pairs, without storing the graph
+        in memory. The edges can be read using 
+        numpy.memmap(fileName, numpy.int64).reshape((-1, 2)). 
+
+        :param fileName: the name of the output file.
+        :type fileName: :class:`str`
+
+        :param numVertices: the number of vertices.
+        :type numVertices: :class:`int`
+
+        :param undirected: whether to sample an undirected graph, in which case edges (i, j) have i >= j.
+        :type undirected: :class:`bool`
+
+        :param blockSize: the maximum number of edges in each block. 
+        :type blockSize: :class:`int`
+
+        :returns: The number of edges written.
+        """
+        numEdges = 0 
+
+        with open(fileName, "wb") as fileObj: 
+            for edges in self.edgeBlocks(numVertices, undirected, blockSize): 
+                numpy.array(edges, numpy.int64).tofile(fileObj)
+                numEdges += edges.shape[0]
+
+        return numEdges
+
+    def __numPairs(self, numVertices, undirected): 
+        """
+        The number of vertex pairs which can be joined by an edge. 
+        """
+        if undirected and self.selfEdges: 
+            return numVertices*(numVertices+1)//2
+        elif undirected: 
+            return numVertices*(numVertices-1)//2
+        elif self.selfEdges: 
+            return numVertices**2
+        else: 
+            return numVertices*(numVertices-1)
+
+    def __pairs(self, keys, numVertices, undirected): 
+        """
+        Map an array of indices of vertex pairs to an array of edges. For 
+        undirected graphs the pairs are enumerated row by row in the lower 
+        triangle. 
+        """
+        keys = numpy.asarray(keys, numpy.int64)
+
+        if undirected: 
+            #Row i starts at key i(i+1)/2 with self edges, otherwise i(i-1)/2
+            offset = 0 if self.selfEdges else 1
+            rows = numpy.floor((numpy.sqrt(8*keys.astype(numpy.float) + 1) - 1)/2).astype(numpy.int64) + offset
+            starts = (rows - offset)*(rows - offset + 1)//2
+            rows -= starts > keys 
+            starts = (rows - offset)*(rows - offset + 1)//2
+            nextStarts = (rows - offset + 1)*(rows - offset + 2)//2
+            rows += nextStarts <= keys
+            starts = (rows - offset)*(rows - offset + 1)//2
+            cols = keys - starts 
+        elif self.selfEdges: 
+            rows = keys // numVertices
+            cols = keys % numVertices
+        else: 
+            rows = keys // (numVertices-1)
+            cols = keys % (numVertices-1)
+            cols += cols >= rows
+
+        return numpy.c_[rows, cols]
             
     def clusteringCoefficient(self):
         '''
         Returns the clustering coefficient for the generator.
         ''' 
-        return p
+        return self.p
 
     def __str__(self):
-        return "ErdosRenyiGenerator:p="+str(self.p)
-    
\ No newline at end of file
+        output = "ErdosRenyiGenerator:p="+str(self.p)
+        if self.m is not None: 
+            output += ",m="+str(self.m)
+        return output
+
+    m = None
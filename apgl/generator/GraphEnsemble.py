@@ -0,0 +1,176 @@
+import copy
+import multiprocessing
+import numpy
+from apgl.util.Parameter import Parameter
+from apgl.generator.AbstractGraphGenerator import AbstractGraphGenerator
+
+
+def _generateReplica(args):
+    """
+    Generate a single replica of an ensemble using the given seed, and return
+    func applied to it. This is a module level function so that it can be used
+    with a process pool.
+    """
+    generator, graph, seed, func = args
+    generator = copy.copy(generator)
+    generator.setSeed(seed)
+
+    if graph is None:
+        graph = generator.generateGraph()
+    else:
+        graph = generator.generate(graph.copy())
+
+    if func is None:
+        return graph
+    else:
+        return func(graph)
+
+
+class GraphEnsemble(object):
+    """
+    Generate ensembles of independent random graphs from a graph generator,
+    optionally over a pool of processes. Each replica is generated with its own
+    numpy.random.SeedSequence spawned from the seed of the ensemble, so that the
+    ith graph is the same for a given seed irrespective of the number of
+    processes or the size of the ensemble.
+    """
+    def __init__(self, generator, graph=None, numProcesses=1, seed=None):
+        """
+        Create an ensemble of graphs from a generator. Each replica is generated
+        using generator.generate on a copy of graph, or if graph is None using
+        generator.generateGraph (e.g. for StochasticKroneckerGenerator). The
+        generator, graph and any statistics functions must be picklable when
+        more than one process is used.
+
+        :param generator: the graph generator.
+        :type generator: :class:`apgl.generator.AbstractGraphGenerator`
+
+        :param graph: an empty graph which is copied for each replica, or None.
+        :type graph: :class:`apgl.graph.AbstractMatrixGraph`
+
+        :param numProcesses: the number of processes to use, or None for the number of CPUs.
+        :type numProcesses: :class:`int`
+
+        :param seed: None for fresh entropy, or an int.
+        """
+        Parameter.checkClass(generator, AbstractGraphGenerator)
+        self.generator = generator
+        self.graph = graph
+        self.setNumProcesses(numProcesses)
+        self.setSeed(seed)
+
+    def setNumProcesses(self, numProcesses):
+        """
+        Set the number of processes used to generate graphs. If numProcesses is
+        1 then the graphs are generated in the current process.
+
+        :param numProcesses: the number of processes to use, or None for the number of CPUs.
+        :type numProcesses: :class:`int`
+        """
+        if numProcesses is None:
+            numProcesses = multiprocessing.cpu_count()
+        Parameter.checkInt(numProcesses, 1, float('inf'))
+        self.numProcesses = numProcesses
+
+    def setSeed(self, seed):
+        """
+        Set the seed from which the seeds of the replicas are spawned. If seed is
+        None then fresh entropy is drawn once, so that the same ensemble is
+        generated on each call.
+
+        :param seed: None for fresh entropy, or an int.
+        """
+        self.seedSequence = numpy.random.SeedSequence(seed)
+
+    def getSeed(self):
+        """
+        :returns: the entropy of the seed sequence of this ensemble.
+        """
+        return self.seedSequence.entropy
+
+    def seeds(self, numGraphs):
+        """
+        Spawn the seeds of the first numGraphs replicas, which are the same as
+        the children given by numpy.random.SeedSequence.spawn.
+
+        :param numGraphs: the number of replicas.
+        :type numGraphs: :class:`int`
+
+        :returns: A list of numpy.random.SeedSequence objects.
+        """
+        Parameter.checkInt(numGraphs, 0, float('inf'))
+        entropy = self.seedSequence.entropy
+        spawnKey = self.seedSequence.spawn_key
+        return [numpy.random.SeedSequence(entropy, spawn_key=spawnKey + (i,)) for i in range(numGraphs)]
+
+    def graphs(self, numGraphs):
+        """
+        A lazy iterator over numGraphs independent graphs in order. Note that
+        each graph is sent between processes when numProcesses > 1, and
+        statistics or meanStatistics are more efficient for large graphs.
+
+        :param numGraphs: the number of graphs to generate.
+        :type numGraphs: :class:`int`
+        """
+        return self.statistics(numGraphs, None)
+
+    def statistics(self, numGraphs, statsFunc, chunkSize=1):
+        """
+        A lazy iterator over statsFunc(graph) for numGraphs independent graphs
+        in order. The function is applied in the worker processes so only its
+        output is sent between processes.
+
+        :param numGraphs: the number of graphs to generate.
+        :type numGraphs: :class:`int`
+
+        :param statsFunc: a function taking a graph, e.g. GraphStatistics().scalarStatistics.
+
+        :param chunkSize: the number of replicas sent to a process at a time.
+        :type chunkSize: :class:`int`
+        """
+        Parameter.checkInt(chunkSize, 1, float('inf'))
+        args = [(self.generator, self.graph, seed, statsFunc) for seed in self.seeds(numGraphs)]
+
+        if self.numProcesses == 1 or numGraphs <= 1:
+            for arg in args:
+                yield _generateReplica(arg)
+        else:
+            pool = multiprocessing.Pool(min(self.numProcesses, numGraphs))
+            try:
+                for result in pool.imap(_generateReplica, args, chunkSize):
+                    yield result
+            finally:
+                pool.terminate()
+
+    def meanStatistics(self, numGraphs, statsFunc, chunkSize=1):
+        """
+        Compute the mean and standard deviation of statsFunc(graph) over
+        numGraphs independent graphs. The statistics are reduced as they arrive
+        so only a single array from each replica is held at a time.
+
+        :param numGraphs: the number of graphs to generate.
+        :type numGraphs: :class:`int`
+
+        :param statsFunc: a function taking a graph and returning an array of a fixed shape.
+
+        :param chunkSize: the number of replicas sent to a process at a time.
+        :type chunkSize: :class:`int`
+
+        :returns: The mean and standard deviation arrays of the statistics.
+        """
+        Parameter.checkInt(numGraphs, 1, float('inf'))
+        mean = 0
+        sumSquares = 0
+
+        for i, stats in enumerate(self.statistics(numGraphs, statsFunc, chunkSize)):
+            stats = numpy.asarray(stats, numpy.float)
+            delta = stats - mean
+            mean = mean + delta/(i+1)
+            sumSquares = sumSquares + delta*(stats - mean)
+
+        return mean, numpy.sqrt(sumSquares/numGraphs)
+
+    generator = None
+    graph = None
+    numProcesses = 1
+    seedSequence = None
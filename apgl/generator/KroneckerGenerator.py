@@ -1,5 +1,6 @@
 
 import numpy
+import scipy.sparse
 from apgl.util.Parameter import Parameter
 from apgl.graph.VertexList import VertexList
 from apgl.graph.SparseGraph import SparseGraph
@@ -42,17 +43,18 @@ class KroneckerGenerator(object):
     def generate(self):
         """
         Generate a Kronecker graph using the adjacency matrix of the input graph.
+        The Kronecker powers are computed using sparse matrices so only the 
+        edges of the output graph are stored. 
 
         :returns: The generate graph as a SparseGraph object.
         """
-        W = self.initialGraph.adjacencyMatrix()
+        W = scipy.sparse.csr_matrix(self.initialGraph.adjacencyMatrix())
         Wi = W
 
         for i in range(1, self.k):
-            Wi = numpy.kron(Wi, W)
+            Wi = scipy.sparse.kron(Wi, W, format="csr")
 
         vList = VertexList(Wi.shape[0], 0)
-        graph = SparseGraph(vList, self.initialGraph.isUndirected())
-        graph.setWeightMatrix(Wi)
+        graph = SparseGraph(vList, self.initialGraph.isUndirected(), W=Wi)
 
-        return graph
\ No newline at end of file
+        return graph
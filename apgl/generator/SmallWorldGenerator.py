@@ -63,28 +63,65 @@ class SmallWorldGenerator(AbstractGraphGenerator):
         if not graph.isUndirected():
             raise ValueError("Graph must be undirected")
         
-
-        numVertices = graph.getNumVertices()
-        
-        #First, create a lattice with k neighbours
-        #For each vertex, create an edge to the next k vertices
-        for i in range(0, numVertices): 
-            for j in range(0, self.k):
-                graph.addEdge(i, (i+j+1)%numVertices)
-        
-        #Now, let's get re-wiring, but only for forward links and no self-edges
-        for i in range(0, numVertices): 
-            v = numpy.random.rand(self.k, 1)
-            for j in range(0, self.k):
-                if (v[j] < self.p):
-                    ind = numpy.random.randint(0, numVertices)
-
-                    if graph.getEdge(i, ind)==None and ind!=i:
-                        graph.addEdge(i, ind)
-                        graph.removeEdge(i, (i+j+1)%numVertices)
+        edges = self.generateEdges(graph.getNumVertices())
+        graph.addEdges(edges)
                     
         return graph
 
+    def generateEdges(self, numVertices): 
+        """
+        Sample the edges of a small-world graph without creating a graph. The 
+        lattice edges from each vertex i to the next k vertices are built as 
+        arrays, and then each is rewired with probability p to a new vertex 
+        chosen uniformly at random. Rewirings which would create a self edge, an
+        edge of the lattice or an edge chosen by an earlier rewiring are 
+        rejected, and in this case the lattice edge is kept. 
+
+        :param numVertices: the number of vertices.
+        :type numVertices: :class:`int`
+
+        :returns: An array with 2 columns and an edge on each row. 
+        """
+        Parameter.checkInt(numVertices, 0, float('inf'))
+        randGen = self._randomGenerator()
+
+        #Banded lattice in which vertex i is joined to vertices i+1, ..., i+k 
+        sources = numpy.repeat(numpy.arange(numVertices, dtype=numpy.int64), self.k)
+        targets = (sources + numpy.tile(numpy.arange(1, self.k+1), numVertices)) % max(numVertices, 1)
+        latticeKeys = numpy.unique(self.__edgeKeys(sources, targets, numVertices))
+
+        #Propose new targets for the rewired edges in order of source vertex 
+        rewired = numpy.flatnonzero(randGen.random(sources.shape[0]) < self.p)
+        newTargets = randGen.integers(0, max(numVertices, 1), rewired.shape[0])
+        newKeys = self.__edgeKeys(sources[rewired], newTargets, numVertices)
+
+        #Reject conflicts with the lattice and with earlier rewirings 
+        valid = numpy.logical_and(newTargets != sources[rewired], ~self.__isMember(newKeys, latticeKeys))
+        valid[numpy.setdiff1d(numpy.arange(newKeys.shape[0]), numpy.unique(newKeys, return_index=True)[1])] = False
+
+        removedKeys = self.__edgeKeys(sources[rewired[valid]], targets[rewired[valid]], numVertices)
+        keys = numpy.r_[numpy.setdiff1d(latticeKeys, removedKeys), newKeys[valid]]
+
+        return numpy.c_[keys // max(numVertices, 1), keys % max(numVertices, 1)]
+
+    @staticmethod
+    def __edgeKeys(sources, targets, numVertices): 
+        """
+        Return a key for each undirected edge which is independent of its direction. 
+        """
+        return numpy.minimum(sources, targets)*numVertices + numpy.maximum(sources, targets)
+
+    @staticmethod
+    def __isMember(keys, sortedKeys): 
+        """
+        Find whether each key is in an array of sorted unique keys. 
+        """
+        if sortedKeys.shape[0] == 0: 
+            return numpy.zeros(keys.shape[0], numpy.bool)
+
+        inds = numpy.minimum(numpy.searchsorted(sortedKeys, keys), sortedKeys.shape[0]-1)
+        return sortedKeys[inds] == keys 
+
     def clusteringCoefficient(self):
         '''
         Returns the clustering coefficient for the generator.
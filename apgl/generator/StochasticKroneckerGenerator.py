@@ -3,10 +3,18 @@ import numpy
 from apgl.util.Parameter import Parameter
 from apgl.graph.VertexList import VertexList
 from apgl.graph.SparseGraph import SparseGraph
+from apgl.generator.AbstractGraphGenerator import AbstractGraphGenerator
 
-class StochasticKroneckerGenerator(object):
+class StochasticKroneckerGenerator(AbstractGraphGenerator):
     '''
     A class which generates graphs according to the Stochastic Kronecker method.
+    The probability of an edge is given by the kth Kronecker power of the 
+    weight matrix of the initial graph, however this matrix is never formed. 
+    Instead edges are sampled by "ball dropping" as in the R-MAT model: each 
+    edge descends k levels of the Kronecker product choosing an entry of the 
+    initial weight matrix in proportion to its value at each level. Edges are
+    sampled until the number of distinct edges is the expected number of 
+    edges, which takes O(mk) time for m edges. 
     '''
     def __init__(self, initialGraph, k):
         """
@@ -43,18 +51,118 @@ class StochasticKroneckerGenerator(object):
     def generateGraph(self):
         """
         Generate a Kronecker graph
+
+        :returns: The generated graph as a SparseGraph object.
+        """
+        numVertices = self.initialGraph.getNumVertices()**self.k
+
+        vList = VertexList(numVertices, 0)
+        graph = SparseGraph(vList, self.initialGraph.isUndirected())
+        graph.addEdges(self.generateEdges())
+
+        return graph
+
+    def expectedNumEdges(self):
+        """
+        :returns: The expected number of edges of a generated graph. 
         """
         W = self.initialGraph.getWeightMatrix()
-        Wi = W
+        numEdges = numpy.sum(W)**self.k
 
-        for i in range(1, self.k):
-            Wi = numpy.kron(Wi, W)
+        if self.initialGraph.isUndirected():
+            numEdges = (numEdges + numpy.trace(W)**self.k)/2
 
-        P = numpy.random.rand(Wi.shape[0], Wi.shape[0])
-        Wi = numpy.array(P < Wi, numpy.float64)
+        return numEdges
 
-        vList = VertexList(Wi.shape[0], 0)
-        graph = SparseGraph(vList, self.initialGraph.isUndirected())
-        graph.setWeightMatrix(Wi)
+    def generateEdges(self, maxRounds=100):
+        """
+        Sample the distinct edges of a stochastic Kronecker graph without 
+        creating a graph. Balls are dropped in rounds until the expected number 
+        of distinct edges is reached, or until maxRounds rounds. For undirected 
+        graphs the edges (i, j) have i >= j. 
+
+        :param maxRounds: the maximum number of rounds of ball dropping. 
+        :type maxRounds: :class:`int`
+
+        :returns: An array with 2 columns and an edge on each row.
+        """
+        numEdges = int(round(self.expectedNumEdges()))
+        numVertices = self.initialGraph.getNumVertices()**self.k
+        randGen = self._randomGenerator()
+        keys = numpy.zeros(0, numpy.int64)
+
+        for i in range(maxRounds):
+            numMissing = numEdges - keys.shape[0]
+            if numMissing <= 0:
+                break
+
+            edges = self.__dropBalls(2*numMissing + 16, randGen)
+            newKeys = numpy.r_[keys, edges[:, 0]*numVertices + edges[:, 1]]
+            keys = newKeys[numpy.sort(numpy.unique(newKeys, return_index=True)[1])]
+
+        keys = keys[0:numEdges]
+        return numpy.c_[keys // numVertices, keys % numVertices]
+
+    def edgeBlocks(self, numEdges=None, blockSize=2**20):
+        """
+        A generator over blocks of edges sampled by ball dropping, in 
+        coordinate (COO) format, for graphs which are too large to sample all at
+        once. Each block contains distinct edges, however an edge may occur in 
+        more than one block. For undirected graphs the edges (i, j) have i >= j. 
+
+        :param numEdges: the number of balls to drop, or None to use the expected number of edges. 
+        :type numEdges: :class:`int`
+
+        :param blockSize: the number of balls in each block. 
+        :type blockSize: :class:`int`
+        """
+        if numEdges is None:
+            numEdges = int(round(self.expectedNumEdges()))
+        Parameter.checkInt(numEdges, 0, float('inf'))
+        Parameter.checkInt(blockSize, 1, float('inf'))
+
+        numVertices = self.initialGraph.getNumVertices()**self.k
+        randGen = self._randomGenerator()
+
+        for i in range(0, numEdges, blockSize):
+            edges = self.__dropBalls(min(blockSize, numEdges-i), randGen)
+            keys = numpy.unique(edges[:, 0]*numVertices + edges[:, 1])
+            yield numpy.c_[keys // numVertices, keys % numVertices]
+
+    def __dropBalls(self, numBalls, randGen):
+        """
+        Sample edges in proportion to their probabilities by choosing an entry 
+        of the initial weight matrix at each of the k levels. Several levels are
+        sampled at a time using a small Kronecker power of the initial weight 
+        matrix. For undirected graphs the balls in the upper triangle are 
+        discarded so that edges (i, j) with i >= j are sampled in proportion to 
+        their probabilities. 
+        """
+        W = self.initialGraph.getWeightMatrix()
+        W = W/numpy.sum(W)
+        numLevels = max(int(numpy.log(self.maxLevelEntries)/(2*numpy.log(max(W.shape[0], 2)))), 1)
+
+        rows = numpy.zeros(numBalls, numpy.int64)
+        cols = numpy.zeros(numBalls, numpy.int64)
+        i = 0 
+
+        while i < self.k:
+            levels = min(numLevels, self.k - i)
+            Wi = W 
+            for j in range(1, levels):
+                Wi = numpy.kron(Wi, W)
+
+            n = Wi.shape[0]
+            inds = numpy.searchsorted(numpy.cumsum(Wi.ravel()), randGen.random(numBalls)*numpy.sum(Wi), side="right")
+            inds = numpy.minimum(inds, n**2-1)
+            rows = rows*n + inds // n
+            cols = cols*n + inds % n
+            i += levels
+
+        if self.initialGraph.isUndirected():
+            lower = rows >= cols
+            rows, cols = rows[lower], cols[lower]
+
+        return numpy.c_[rows, cols]
 
-        return graph
\ No newline at end of file
+    maxLevelEntries = 2**12
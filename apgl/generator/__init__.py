@@ -2,3 +2,4 @@ from apgl.generator.ErdosRenyiGenerator import ErdosRenyiGenerator
 from apgl.generator.ConfigModelGenerator import ConfigModelGenerator 
 from apgl.generator.SmallWorldGenerator import SmallWorldGenerator 
 from apgl.generator.BarabasiAlbertGenerator import BarabasiAlbertGenerator 
+from apgl.generator.GraphEnsemble import GraphEnsemble 
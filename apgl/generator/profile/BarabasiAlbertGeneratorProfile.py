@@ -0,0 +1,21 @@
+from apgl.graph.SparseGraph import SparseGraph
+from apgl.graph.GeneralVertexList import GeneralVertexList
+from apgl.generator.BarabasiAlbertGenerator import BarabasiAlbertGenerator
+import cProfile
+import pstats
+
+
+profileFileName = "profile.cprof"
+
+ell = 10
+m = 5
+
+numVertices = 1000000
+
+sGraph = SparseGraph(GeneralVertexList(numVertices))
+bag = BarabasiAlbertGenerator(ell, m)
+bag.setSeed(21)
+
+cProfile.runctx('bag.generate(sGraph)', globals(), locals(), profileFileName)
+stats = pstats.Stats(profileFileName)
+stats.strip_dirs().sort_stats("cumulative").print_stats(20)
@@ -1,6 +1,8 @@
 
 import unittest
 import logging
+import numpy
+import numpy.testing as nptst
 from apgl.generator.BarabasiAlbertGenerator import BarabasiAlbertGenerator
 from apgl.graph.VertexList import VertexList
 from apgl.graph.SparseGraph import SparseGraph
@@ -42,6 +44,40 @@ class  BarabasiAlbertGeneratorTest(unittest.TestCase):
         self.assertEquals(graph.getNumEdges(), (numVertices-ell)*m)
 
 
+    def testGenerateEdges(self):
+        numVertices = 500
+
+        for ell, m in [(2, 1), (3, 3), (10, 4)]:
+            generator = BarabasiAlbertGenerator(ell, m)
+            generator.setSeed(22)
+            edges = generator.generateEdges(numVertices)
+
+            self.assertEquals(edges.shape[0], (numVertices-ell)*m)
+            nptst.assert_array_equal(edges[:, 0], numpy.repeat(numpy.arange(ell, numVertices), m))
+            self.assertTrue((edges[:, 1] < edges[:, 0]).all())
+            self.assertTrue((edges[:, 1] >= 0).all())
+
+            #Each new vertex joins m distinct vertices 
+            keys = edges[:, 0]*numVertices + edges[:, 1]
+            self.assertEquals(numpy.unique(keys).shape[0], keys.shape[0])
+
+            #The same seed gives the same edges 
+            nptst.assert_array_equal(generator.generateEdges(numVertices), edges)
+
+            #Sample all vertices at once
+            generator.sequentialSteps = 0
+            edges2 = generator.generateEdges(numVertices)
+            keys = edges2[:, 0]*numVertices + edges2[:, 1]
+            self.assertEquals(numpy.unique(keys).shape[0], keys.shape[0])
+            self.assertTrue((edges2[:, 1] < edges2[:, 0]).all())
+
+        #Early vertices have larger degrees 
+        generator = BarabasiAlbertGenerator(2, 2)
+        graph = generator.generate(SparseGraph(VertexList(5000, 0)))
+        degrees = graph.degreeSequence()
+        self.assertTrue(numpy.mean(degrees[0:50]) > 2*numpy.mean(degrees[-1000:]))
+        self.assertEquals(graph.getNumEdges(), (5000-2)*2)
+
     def testGraphDisplay(self):
         try:
             import networkx
@@ -70,6 +106,14 @@ class  BarabasiAlbertGeneratorTest(unittest.TestCase):
         nodesAndEdges = networkx.draw_networkx(nxGraph, pos=nodePositions)
         #matplotlib.pyplot.show()
 
+    def testGlobalSeed(self):
+        #Without a seed the graphs are reproducible using numpy.random.seed
+        generator = BarabasiAlbertGenerator(5, 2)
+        numpy.random.seed(21)
+        edges = generator.generateEdges(100)
+        numpy.random.seed(21)
+        nptst.assert_array_equal(generator.generateEdges(100), edges)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -4,6 +4,7 @@ from apgl.graph.GeneralVertexList import GeneralVertexList
 from apgl.generator.ConfigModelGenerator import ConfigModelGenerator
 import unittest
 import numpy 
+import numpy.testing as nptst
 
 class ConfigModelGeneratorTest(unittest.TestCase):
     def setUp(self):
@@ -155,5 +156,67 @@ class ConfigModelGeneratorTest(unittest.TestCase):
         graph = generator.generate(graph, False)
         self.assertTrue((degSequence3>= graph.outDegreeSequence()).all())
 
+    def testPolicies(self):
+        numVertices = 200
+        degSequence = numpy.random.randint(1, 20, numVertices)
+        degSequence[0] = 150
+
+        for inDegSequence in [None, numpy.random.permutation(degSequence)]:
+            generator = ConfigModelGenerator(degSequence, inDegSequence)
+            generator.setSeed(45)
+            edges = generator.generateEdges()
+
+            #The stubs are all used with the keep policy, apart from merged edges 
+            keys = edges[:, 0]*numVertices + edges[:, 1]
+            self.assertEquals(numpy.unique(keys).shape[0], keys.shape[0])
+            self.assertTrue((edges[:, 0] == edges[:, 1]).any())
+            nptst.assert_array_equal(generator.generateEdges(), edges)
+
+            generator.setPolicy("erase")
+            erasedEdges = generator.generateEdges()
+            self.assertFalse((erasedEdges[:, 0] == erasedEdges[:, 1]).any())
+            self.assertTrue(erasedEdges.shape[0] < edges.shape[0])
+
+            #Rewiring recovers the degrees which are lost by erasing edges
+            generator.setPolicy("rewire")
+            rewiredEdges = generator.generateEdges()
+            self.assertFalse((rewiredEdges[:, 0] == rewiredEdges[:, 1]).any())
+            keys = numpy.minimum(rewiredEdges[:, 0], rewiredEdges[:, 1])*numVertices + numpy.maximum(rewiredEdges[:, 0], rewiredEdges[:, 1])
+            if inDegSequence is None: 
+                self.assertEquals(numpy.unique(keys).shape[0], keys.shape[0])
+                erasedError = numpy.abs(generator.degreeError(erasedEdges)).sum()
+                rewiredError = numpy.abs(generator.degreeError(rewiredEdges)).sum()
+            else: 
+                erasedError = numpy.abs(numpy.r_[generator.degreeError(erasedEdges)]).sum()
+                rewiredError = numpy.abs(numpy.r_[generator.degreeError(rewiredEdges)]).sum()
+            self.assertTrue(rewiredError < erasedError)
+
+            graph = SparseGraph(GeneralVertexList(numVertices), inDegSequence is None)
+            graph = generator.generate(graph)
+            self.assertEquals(graph.getNumDirEdges(), rewiredEdges.shape[0]*(1 + (inDegSequence is None)))
+
+        self.assertRaises(ValueError, generator.setPolicy, "abc")
+
+    def testDegreeError(self):
+        degSequence = numpy.array([2, 1, 3, 0])
+        generator = ConfigModelGenerator(degSequence)
+
+        edges = numpy.array([[0, 2], [2, 2], [1, 0]])
+        nptst.assert_array_equal(generator.degreeError(edges), numpy.array([0, 0, 0, 0]))
+        nptst.assert_array_equal(generator.degreeError(edges[0:2, :]), numpy.array([1, 1, 0, 0]))
+
+        generator = ConfigModelGenerator(degSequence, degSequence)
+        outError, inError = generator.degreeError(edges)
+        nptst.assert_array_equal(outError, numpy.array([1, 0, 2, 0]))
+        nptst.assert_array_equal(inError, numpy.array([1, 1, 1, 0]))
+
+    def testGlobalSeed(self):
+        #Without a seed the graphs are reproducible using numpy.random.seed
+        generator = ConfigModelGenerator(numpy.random.randint(0, 5, 50))
+        numpy.random.seed(21)
+        edges = generator.generateEdges()
+        numpy.random.seed(21)
+        nptst.assert_array_equal(generator.generateEdges(), edges)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
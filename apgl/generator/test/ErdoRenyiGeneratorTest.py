@@ -12,6 +12,8 @@ import unittest
 import logging
 import apgl
 import numpy 
+import numpy.testing as nptst
+from apgl.util.PathDefaults import PathDefaults
 
 class ErdoRenyiGeneratorTest(unittest.TestCase):
     def setUp(self):    
@@ -142,6 +144,80 @@ class ErdoRenyiGeneratorTest(unittest.TestCase):
         generator = ErdosRenyiGenerator(p)
         graph = generator.generate(graph)
     
+    def testGenerateM(self): 
+        numVertices = 50
+        m = 200
+
+        for undirected in [True, False]: 
+            graph = SparseGraph(GeneralVertexList(numVertices), undirected)
+            generator = ErdosRenyiGenerator(0.0, m=m)
+            graph = generator.generate(graph)
+
+            self.assertEquals(graph.getNumEdges(), m)
+            self.assertEquals(numpy.sum(graph.diagonal() != 0), 0)
+
+        #Can have at most n(n-1)/2 edges 
+        generator.setM(numVertices*(numVertices-1)//2 + 1)
+        self.assertRaises(ValueError, generator.generateEdges, numVertices, True)
+
+        generator.setSelfEdges(True)
+        edges = generator.generateEdges(numVertices, True)
+        self.assertEquals(edges.shape[0], generator.m)
+
+    def testEdgeBlocks(self): 
+        numVertices = 100
+        p = 0.2 
+
+        for selfEdges in [True, False]: 
+            for undirected in [True, False]:
+                generator = ErdosRenyiGenerator(p, selfEdges)
+                generator.setSeed(21)
+                edges = generator.generateEdges(numVertices, undirected)
+                
+                #Edges are sorted and distinct 
+                keys = edges[:, 0]*numVertices + edges[:, 1]
+                self.assertTrue((numpy.diff(keys) > 0).all())
+                self.assertTrue(edges.min() >= 0 and edges.max() < numVertices)
+                self.assertEquals(selfEdges, (edges[:, 0] == edges[:, 1]).any())
+                if undirected: 
+                    self.assertTrue((edges[:, 0] >= edges[:, 1]).all())
+
+                #The seed gives the same edges with any block size 
+                blocks = list(generator.edgeBlocks(numVertices, undirected, 100))
+                self.assertTrue(max([block.shape[0] for block in blocks]) <= 100)
+                nptst.assert_array_equal(numpy.concatenate(blocks), edges)
+
+        numVertices = 2000
+        generator = ErdosRenyiGenerator(0.001)
+        generator.setSeed(numpy.random.default_rng(21))
+        edges = generator.generateEdges(numVertices, False)
+        self.assertAlmostEquals(edges.shape[0]/float(numVertices**2 - numVertices), 0.001, places=3)
+
+        #A generator is advanced by each call 
+        edges2 = generator.generateEdges(numVertices, False)
+        self.assertFalse(edges.shape == edges2.shape and (edges == edges2).all())
+
+    def testWriteEdges(self): 
+        numVertices = 200
+        generator = ErdosRenyiGenerator(0.1)
+        generator.setSeed(12)
+        fileName = PathDefaults.getTempDir() + "erdosRenyiEdges.bin"
+
+        numEdges = generator.writeEdges(fileName, numVertices, blockSize=50)
+        edges = numpy.memmap(fileName, numpy.int64, mode="r").reshape((-1, 2))
+
+        self.assertEquals(edges.shape[0], numEdges)
+        nptst.assert_array_equal(edges, generator.generateEdges(numVertices))
+
+    def testGlobalSeed(self):
+        #Without a seed the graphs are reproducible using numpy.random.seed
+        generator = ErdosRenyiGenerator(0.1)
+        numpy.random.seed(21)
+        graph = generator.generate(SparseGraph(VertexList(50, 0)))
+        numpy.random.seed(21)
+        graph2 = generator.generate(SparseGraph(VertexList(50, 0)))
+        nptst.assert_array_equal(graph.getAllEdges(), graph2.getAllEdges())
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(ErdoRenyiGeneratorTest)
     unittest.TextTestRunner(verbosity=2).run(suite)
\ No newline at end of file
@@ -0,0 +1,86 @@
+
+import unittest
+import functools
+import numpy
+import numpy.testing as nptst
+from apgl.generator.GraphEnsemble import GraphEnsemble
+from apgl.generator.ErdosRenyiGenerator import ErdosRenyiGenerator
+from apgl.generator.StochasticKroneckerGenerator import StochasticKroneckerGenerator
+from apgl.graph.GeneralVertexList import GeneralVertexList
+from apgl.graph.SparseGraph import SparseGraph
+from apgl.graph.GraphStatistics import GraphStatistics
+
+class  GraphEnsembleTest(unittest.TestCase):
+    def setUp(self):
+        self.numVertices = 30
+        self.graph = SparseGraph(GeneralVertexList(self.numVertices))
+        self.generator = ErdosRenyiGenerator(0.2)
+
+    def testGraphs(self):
+        ensemble = GraphEnsemble(self.generator, self.graph, seed=21)
+        graphs = list(ensemble.graphs(4))
+
+        self.assertEquals(len(graphs), 4)
+        self.assertEquals(self.graph.getNumEdges(), 0)
+        self.assertEquals(self.generator.getSeed(), None)
+
+        for graph in graphs:
+            self.assertEquals(graph.getNumVertices(), self.numVertices)
+            self.assertTrue(graph.getNumEdges() > 0)
+
+        #Replicas are different but reproducible
+        self.assertTrue((graphs[0].getWeightMatrix() != graphs[1].getWeightMatrix()).any())
+
+        graphs2 = list(ensemble.graphs(2))
+        for i in range(2):
+            nptst.assert_array_equal(graphs[i].getWeightMatrix(), graphs2[i].getWeightMatrix())
+
+        #Results do not depend on the number of processes
+        ensemble.setNumProcesses(2)
+        graphs3 = list(ensemble.graphs(4))
+        for i in range(4):
+            nptst.assert_array_equal(graphs[i].getWeightMatrix(), graphs3[i].getWeightMatrix())
+
+        ensemble.setSeed(22)
+        graphs4 = list(ensemble.graphs(1))
+        self.assertTrue((graphs[0].getWeightMatrix() != graphs4[0].getWeightMatrix()).any())
+
+        self.assertEquals(list(ensemble.graphs(0)), [])
+        self.assertRaises(ValueError, ensemble.setNumProcesses, 0)
+
+    def testGenerateGraph(self):
+        vList = GeneralVertexList(2)
+        initialGraph = SparseGraph(vList)
+        initialGraph.addEdge(0, 0, 0.9)
+        initialGraph.addEdge(0, 1, 0.5)
+        initialGraph.addEdge(1, 1, 0.2)
+        generator = StochasticKroneckerGenerator(initialGraph, 5)
+
+        ensemble = GraphEnsemble(generator, seed=21)
+        for graph in ensemble.graphs(3):
+            self.assertEquals(graph.getNumVertices(), 2**5)
+
+    def testMeanStatistics(self):
+        ensemble = GraphEnsemble(self.generator, self.graph, seed=21)
+        numGraphs = 5
+
+        stats = numpy.array(list(ensemble.statistics(numGraphs, SparseGraph.degreeSequence)))
+        mean, std = ensemble.meanStatistics(numGraphs, SparseGraph.degreeSequence)
+
+        self.assertEquals(stats.shape, (numGraphs, self.numVertices))
+        nptst.assert_array_almost_equal(mean, stats.mean(0))
+        nptst.assert_array_almost_equal(std, stats.std(0))
+
+        ensemble.setNumProcesses(2)
+        mean2, std2 = ensemble.meanStatistics(numGraphs, SparseGraph.degreeSequence, chunkSize=2)
+        nptst.assert_array_almost_equal(mean, mean2)
+        nptst.assert_array_almost_equal(std, std2)
+
+        #Reduce scalar statistics as in GraphStatistics.meanSeqScalarStats
+        graphStats = GraphStatistics()
+        statsFunc = functools.partial(graphStats.scalarStatistics, slowStats=False)
+        mean, std = ensemble.meanStatistics(3, statsFunc)
+        self.assertEquals(mean.shape[0], graphStats.getNumStats())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 
+import scipy.sparse
 import numpy 
 from apgl.graph.VertexList import VertexList
 from apgl.graph.SparseGraph import SparseGraph
@@ -82,4 +83,19 @@ class KroneckerGeneratorTest(unittest.TestCase):
         generator = KroneckerGenerator(initialGraph, k)
         graph = generator.generate()
 
-        logging.debug((graph.degreeDistribution()))
\ No newline at end of file
+        logging.debug((graph.degreeDistribution()))
+
+    def testGenerateSparse(self):
+        vList = VertexList(2, 0)
+        initialGraph = SparseGraph(vList)
+        initialGraph.addEdge(0, 0)
+        initialGraph.addEdge(0, 1)
+        initialGraph.addEdge(1, 1)
+
+        k = 12
+        generator = KroneckerGenerator(initialGraph, k)
+        graph = generator.generate()
+
+        self.assertEquals(graph.getNumVertices(), 2**k)
+        self.assertEquals(graph.getNumDirEdges(), initialGraph.getNumDirEdges()**k)
+        self.assertTrue(scipy.sparse.issparse(graph.getSparseWeightMatrix()))
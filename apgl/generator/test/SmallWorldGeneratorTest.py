@@ -9,6 +9,8 @@ from apgl.generator.SmallWorldGenerator import SmallWorldGenerator
 from apgl.io.PajekWriter import PajekWriter
 import unittest
 import logging
+import numpy
+import numpy.testing as nptst
 
 class SmallWorldGeneratorTest(unittest.TestCase):
     def setUp(self):    
@@ -63,6 +65,32 @@ class SmallWorldGeneratorTest(unittest.TestCase):
         sGraph = self.swg.generate(self.graph)
         self.assertEquals(sGraph.getNumEdges(), sGraph.getNumVertices()*k)
 
+    def testGenerateEdges(self): 
+        numVertices = 1000 
+        k = 4 
+
+        for p in [0.0, 0.2, 1.0]: 
+            swg = SmallWorldGenerator(p, k)
+            swg.setSeed(33)
+            edges = swg.generateEdges(numVertices)
+
+            #Rewiring keeps the number of edges and creates no self or repeated edges
+            self.assertEquals(edges.shape[0], numVertices*k)
+            self.assertTrue((edges[:, 0] != edges[:, 1]).all())
+            keys = numpy.minimum(edges[:, 0], edges[:, 1])*numVertices + numpy.maximum(edges[:, 0], edges[:, 1])
+            self.assertEquals(numpy.unique(keys).shape[0], keys.shape[0])
+
+            latticeDists = numpy.abs(edges[:, 0] - edges[:, 1])
+            latticeDists = numpy.minimum(latticeDists, numVertices - latticeDists)
+            numRewired = numpy.sum(latticeDists > k)
+            self.assertTrue(abs(numRewired - p*numVertices*k) < 0.05*numVertices*k)
+
+            nptst.assert_array_equal(swg.generateEdges(numVertices), edges)
+
+        graph = SparseGraph(VertexList(numVertices, 0))
+        graph = swg.generate(graph)
+        self.assertEquals(graph.getNumEdges(), numVertices*k)
+
     def tearDown(self):
         pass
 
@@ -88,6 +116,14 @@ class SmallWorldGeneratorTest(unittest.TestCase):
         self.swg.setK(k)
         self.assertEquals(self.swg.clusteringCoefficient(), 0)
 
+    def testGlobalSeed(self):
+        #Without a seed the graphs are reproducible using numpy.random.seed
+        swg = SmallWorldGenerator(0.3, 2)
+        numpy.random.seed(21)
+        edges = swg.generateEdges(100)
+        numpy.random.seed(21)
+        nptst.assert_array_equal(swg.generateEdges(100), edges)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(SmallWorldGeneratorTest)
     unittest.TextTestRunner(verbosity=2).run(suite)
\ No newline at end of file
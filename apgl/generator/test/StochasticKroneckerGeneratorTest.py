@@ -1,5 +1,6 @@
 
 import numpy
+import numpy.testing as nptst
 from apgl.graph.VertexList import VertexList
 from apgl.graph.SparseGraph import SparseGraph
 from apgl.generator.StochasticKroneckerGenerator import StochasticKroneckerGenerator
@@ -82,4 +83,78 @@ class StochasticKroneckerGeneratorTest(unittest.TestCase):
         generator = StochasticKroneckerGenerator(initialGraph, k)
         graph = generator.generateGraph()
 
-        logging.debug((graph.degreeDistribution()))
\ No newline at end of file
+        logging.debug((graph.degreeDistribution()))
+
+    def testGenerateEdges(self):
+        numVertices = 2
+        vList = VertexList(numVertices, 0)
+        initialGraph = SparseGraph(vList)
+        initialGraph.addEdge(0, 0, 0.9)
+        initialGraph.addEdge(0, 1, 0.5)
+        initialGraph.addEdge(1, 1, 0.2)
+
+        k = 10
+        generator = StochasticKroneckerGenerator(initialGraph, k)
+        generator.setSeed(21)
+        edges = generator.generateEdges()
+        generator.setSeed(21)
+        edges2 = generator.generateEdges()
+
+        numpy.testing.assert_array_equal(edges, edges2)
+        self.assertEquals(edges.shape[0], int(round(generator.expectedNumEdges())))
+        self.assertTrue((edges[:, 0] >= edges[:, 1]).all())
+        self.assertTrue((edges < numVertices**k).all())
+
+        keys = edges[:, 0]*numVertices**k + edges[:, 1]
+        self.assertEquals(numpy.unique(keys).shape[0], edges.shape[0])
+
+        #A large graph is generated without forming the weight matrix
+        generator.setK(20)
+        graph = generator.generateGraph()
+        self.assertEquals(graph.getNumVertices(), numVertices**20)
+        self.assertEquals(graph.getNumEdges(), int(round(generator.expectedNumEdges())))
+
+    def testEdgeBlocks(self):
+        numVertices = 3
+        vList = VertexList(numVertices, 0)
+        initialGraph = SparseGraph(vList, False)
+        initialGraph.addEdge(0, 0, 0.8)
+        initialGraph.addEdge(0, 1, 0.6)
+        initialGraph.addEdge(1, 1, 0.5)
+        initialGraph.addEdge(2, 1, 0.3)
+        initialGraph.addEdge(2, 2, 0.4)
+
+        k = 8
+        generator = StochasticKroneckerGenerator(initialGraph, k)
+        generator.setSeed(21)
+
+        numEdges = 0
+        for edges in generator.edgeBlocks(5000, blockSize=1000):
+            keys = edges[:, 0]*numVertices**k + edges[:, 1]
+            self.assertTrue(0 < edges.shape[0] <= 1000)
+            self.assertEquals(numpy.unique(keys).shape[0], edges.shape[0])
+            numEdges += 1
+
+        self.assertEquals(numEdges, 5)
+
+        #Edges with a higher probability are sampled more often
+        edges = numpy.concatenate(list(generator.edgeBlocks(2*10**5)))
+        W = initialGraph.getWeightMatrix()
+        counts = numpy.zeros((numVertices, numVertices))
+        numpy.add.at(counts, (edges[:, 0] // numVertices**(k-1), edges[:, 1] // numVertices**(k-1)), 1)
+        self.assertTrue(numpy.all((counts == 0) == (W == 0)))
+        self.assertTrue(counts[0, 0] > counts[2, 1])
+
+    def testGlobalSeed(self):
+        #Without a seed the graphs are reproducible using numpy.random.seed
+        initialGraph = SparseGraph(VertexList(3, 0))
+        initialGraph.addEdge(0, 0, 0.8)
+        initialGraph.addEdge(0, 1, 0.6)
+        initialGraph.addEdge(1, 1, 0.5)
+        initialGraph.addEdge(2, 2, 0.4)
+        generator = StochasticKroneckerGenerator(initialGraph, 4)
+
+        numpy.random.seed(21)
+        edges = generator.generateEdges()
+        numpy.random.seed(21)
+        nptst.assert_array_equal(generator.generateEdges(), edges)
@@ -74,4 +74,27 @@ class AbstractGraph(object):
         """
         Util.abstract() 
 
+    @staticmethod
+    def setVerifyEdgeCounts(verify):
+        """
+        Graphs which maintain counts of their edges as they are modified can
+        check these counts against a full recount on every query, raising a 
+        ValueError if they differ. This is slow and intended for debugging. 
+
+        :param verify: Whether edge counts are verified.
+        :type verify: :class:`bool`
+        """
+        AbstractGraph.verifyEdgeCounts = verify
+
+    def _verifyEdgeCounts(self, edgeCounts, countFunc):
+        """
+        If verification is turned on, check that the maintained edgeCounts are
+        equal to those returned by countFunc(). 
+        """
+        if AbstractGraph.verifyEdgeCounts:
+            trueEdgeCounts = countFunc()
+            if list(edgeCounts) != list(trueEdgeCounts):
+                raise ValueError("Maintained edge counts " + str(edgeCounts) + " differ from recount " + str(trueEdgeCounts))
+
+    verifyEdgeCounts = False
     size = property(getNumVertices, doc="The number of vertices in the graph")
\ No newline at end of file
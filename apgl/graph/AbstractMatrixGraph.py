@@ -2,11 +2,13 @@
 import numpy
 import heapq
 import scipy
+import scipy.sparse
 import logging
 import os.path
 import tempfile 
 import base64 
 import shutil 
+from collections import deque 
 #Fix for Python3 renaming of Queue 
 try: 
     import Queue 
@@ -16,10 +18,14 @@ except ImportError:
 import apgl
 from apgl.util.Util import Util
 from apgl.util.Parameter import Parameter
+from apgl.util.SparseUtils import SparseUtils
 from apgl.graph.AbstractSingleGraph import AbstractSingleGraph
 from apgl.graph.VertexList import VertexList
 from apgl.graph.GeneralVertexList import GeneralVertexList
 from apgl.graph.DictGraph import DictGraph
+from apgl.graph.SubgraphView import SubgraphView
+from apgl.graph.ComplementView import ComplementView
+from apgl.graph.GraphUtils import GraphUtils
 
 class AbstractMatrixGraph(AbstractSingleGraph):
     """
@@ -180,9 +186,15 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         if edge == 0 or edge == float('inf'):
             raise ValueError("Cannot add a zero or infinite edge")
 
+        edgeCounts = self.__currentEdgeCounts()
+        if edgeCounts is not None and self.W[vertexIndex1, vertexIndex2] == 0:
+            self.__updateEdgeCounts(edgeCounts, vertexIndex1, vertexIndex2, 1)
+
         self.W[vertexIndex1, vertexIndex2] = edge
         if self.undirected:
             self.W[vertexIndex2, vertexIndex1] = edge
+        self._clearCache()
+        self.__setEdgeCounts(edgeCounts)
 
     def addEdges(self, edgeIndexArray, edgeValues=[]):
         """
@@ -199,19 +211,70 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         if (edgeIndexArray < 0).any() or (edgeIndexArray >= self.vList.getNumVertices()).any():
             raise ValueError("Invalid indices for edges.")
 
-        if edgeValues == []: 
+        if len(edgeValues) == 0: 
             edgeValues = numpy.ones(edgeIndexArray.shape[0])
         elif (edgeValues == 0).any():
             raise ValueError("Invalid entry, found zero edge value(s): " + str(numpy.nonzero(edgeValues==0)[0]))
 
-        if self.undirected:
+        #Count the distinct edges which are not already present 
+        edgeCounts = self.__currentEdgeCounts()
+        if edgeCounts is not None and edgeIndexArray.shape[0] != 0: 
+            edges = numpy.array(edgeIndexArray, numpy.int64)
+            if self.undirected: 
+                edges = numpy.sort(edges, 1)
+            edges = edges[numpy.unique(edges[:, 0]*self.getNumVertices() + edges[:, 1], return_index=True)[1], :]
+            newEdges = edges[self.__edgeValues(edges) == 0, :]
+            numSelfEdges = numpy.sum(newEdges[:, 0] == newEdges[:, 1])
+            
+            if self.undirected: 
+                edgeCounts[0] += 2*newEdges.shape[0] - numSelfEdges
+            else: 
+                edgeCounts[0] += newEdges.shape[0]
+            edgeCounts[1] += numSelfEdges
+
+        if edgeIndexArray.shape[0] == 0:
+            pass 
+        elif type(self.W) == numpy.ndarray or scipy.sparse.isspmatrix_csr(self.W) or scipy.sparse.isspmatrix_csc(self.W):
+            self.__setEdgeValues(edgeIndexArray, edgeValues)
+        elif self.undirected:
             for i in range(edgeIndexArray.shape[0]):
                 self.W[int(edgeIndexArray[i, 0]), int(edgeIndexArray[i, 1])] = edgeValues[i]
                 self.W[int(edgeIndexArray[i, 1]), int(edgeIndexArray[i, 0])] = edgeValues[i]
         else:
             for i in range(edgeIndexArray.shape[0]):
                 self.W[int(edgeIndexArray[i, 0]), int(edgeIndexArray[i, 1])] = edgeValues[i]
+        self._clearCache()
+        self.__setEdgeCounts(edgeCounts)
+
+    def __setEdgeValues(self, edgeIndexArray, edgeValues): 
+        """
+        Set the values of an array of edges in a dense, csr or csc weight matrix 
+        in bulk. As with individual assignments, the last value of a repeated 
+        edge is used. A sparse weight matrix is merged with the new edges rather 
+        than modified in place, which avoids changing its sparsity structure once 
+        per edge. 
+        """
+        rows = numpy.array(edgeIndexArray[:, 0], numpy.int64)
+        cols = numpy.array(edgeIndexArray[:, 1], numpy.int64)
+        values = numpy.asarray(edgeValues)
+
+        if self.undirected: 
+            rows, cols = numpy.c_[rows, cols].ravel(), numpy.c_[cols, rows].ravel()
+            values = numpy.repeat(values, 2)
+
+        #Keep the last occurrence of each edge 
+        keys = rows*self.W.shape[1] + cols 
+        inds = keys.shape[0] - 1 - numpy.unique(keys[::-1], return_index=True)[1]
+        rows, cols, values = rows[inds], cols[inds], values[inds]
 
+        if type(self.W) == numpy.ndarray: 
+            self.W[rows, cols] = values 
+        else: 
+            X = scipy.sparse.csr_matrix((numpy.array(values, self.W.dtype), (rows, cols)), shape=self.W.shape)
+            mask = scipy.sparse.csr_matrix((numpy.ones(rows.shape[0], self.W.dtype), (rows, cols)), shape=self.W.shape)
+            W = (self.W - self.W.multiply(mask) + X).asformat(self.W.format)
+            W.eliminate_zeros()
+            self.W = W 
 
     def getEdge(self, vertexIndex1, vertexIndex2):
         """
@@ -236,20 +299,57 @@ class AbstractMatrixGraph(AbstractSingleGraph):
     def getEdgeValues(self, edgeArray):
         """
         Take an array of n x 2 of vertex indices and return the corresponding edge
-        values.
+        values, which are zero for pairs of vertices without an edge. For sparse 
+        weight matrices the edges are found using a binary search over the rows 
+        and columns of the csr adjacency matrix, and dense matrices are indexed 
+        directly. 
 
         :param edgeArray: An array with an edge on each row
         :type edgeArray: :class:`numpy.ndarray`
 
         :returns: A vector of n values corresponding to the edge weights of edgeArray
         """
-        edgeValues = numpy.zeros(edgeArray.shape[0])
+        edgeArray = numpy.asarray(edgeArray)
+        if edgeArray.shape[0] == 0:
+            return numpy.zeros(0)
+
+        rows = numpy.asarray(edgeArray[:, 0], numpy.int64)
+        cols = numpy.asarray(edgeArray[:, 1], numpy.int64)
+        Parameter.checkIndexArray(rows, 0, self.getNumVertices())
+        Parameter.checkIndexArray(cols, 0, self.getNumVertices())
+
+        if scipy.sparse.issparse(self.W):
+            A = self._adjacencyCsr()
+            keys = self._cachedValue("edgeKeys", self.__edgeKeys)
+            queryKeys = rows*A.shape[1] + cols
 
-        for i in range(edgeValues.shape[0]):
-            edgeValues[i] = self.getEdge(edgeArray[i, 0], edgeArray[i, 1])
+            edgeValues = numpy.zeros(queryKeys.shape[0])
+
+            if keys.shape[0] != 0:
+                inds = numpy.minimum(numpy.searchsorted(keys, queryKeys), keys.shape[0]-1)
+                found = keys[inds] == queryKeys
+                edgeValues[found] = A.data[inds[found]]
+        elif type(self.W) == numpy.ndarray:
+            edgeValues = numpy.array(self.W[rows, cols], numpy.float)
+        else:
+            edgeValues = numpy.zeros(edgeArray.shape[0])
+
+            for i in range(edgeValues.shape[0]):
+                edgeValue = self.getEdge(int(rows[i]), int(cols[i]))
+                if edgeValue is not None:
+                    edgeValues[i] = edgeValue
 
         return edgeValues 
 
+    def __edgeKeys(self):
+        """
+        Returns a sorted array of the keys i*n + j of the entries (i, j) of the 
+        csr adjacency matrix, in the order of its data array. 
+        """
+        A = self._adjacencyCsr()
+        rows = numpy.repeat(numpy.arange(A.shape[0], dtype=numpy.int64), numpy.diff(A.indptr))
+        return rows*A.shape[1] + A.indices
+
     def removeEdge(self, vertexIndex1, vertexIndex2):
         """
         Remove an edge between two vertices.
@@ -262,9 +362,16 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         """
         Parameter.checkIndex(vertexIndex1, 0, self.vList.getNumVertices())
         Parameter.checkIndex(vertexIndex2, 0, self.vList.getNumVertices())
+
+        edgeCounts = self.__currentEdgeCounts()
+        if edgeCounts is not None and self.W[vertexIndex1, vertexIndex2] != 0:
+            self.__updateEdgeCounts(edgeCounts, vertexIndex1, vertexIndex2, -1)
+
         self.W[vertexIndex1, vertexIndex2] = 0
         if self.undirected:
             self.W[vertexIndex2, vertexIndex1] = 0
+        self._clearCache()
+        self.__setEdgeCounts(edgeCounts)
 
     def isUndirected(self):
         """
@@ -438,19 +545,19 @@ class AbstractMatrixGraph(AbstractSingleGraph):
 
         :returns:  The mean geodesic distance of this graph.
         """
-        if P!=None and (type(P) != numpy.ndarray or P.shape != (self.getNumVertices(), self.getNumVertices())):
+        if P is not None and (type(P) != numpy.ndarray or P.shape != (self.getNumVertices(), self.getNumVertices())):
             raise ValueError("P must be array of same size as weight matrix of graph")
-        if vertexInds!=None:
+        if vertexInds is not None:
             Parameter.checkList(vertexInds, Parameter.checkInt, [0, self.getNumVertices()])
-        if self.getNumVertices() == 0 or (vertexInds != None and len(vertexInds)==0):
+        if self.getNumVertices() == 0 or (vertexInds is not None and len(vertexInds)==0):
             return 0
         
-        if P == None:
+        if P is None:
             P = self.floydWarshall(True)
         else:
             P = P.copy()
 
-        if vertexInds != None:
+        if vertexInds is not None:
             P = P[vertexInds, :][:, vertexInds]
 
         n = P.shape[0]
@@ -479,19 +586,19 @@ class AbstractMatrixGraph(AbstractSingleGraph):
 
         :returns:  The mean harmonic geodesic distance of this graph. 
         """
-        if P!=None and (type(P) != numpy.ndarray or P.shape != (self.getNumVertices(), self.getNumVertices())):
+        if P is not None and (type(P) != numpy.ndarray or P.shape != (self.getNumVertices(), self.getNumVertices())):
             raise ValueError("P must be array of same size as weight matrix of graph")
-        if vertexInds!=None:
+        if vertexInds is not None:
             Parameter.checkList(vertexInds, Parameter.checkInt, [0, self.getNumVertices()])
-        if self.getNumVertices() == 0 or (vertexInds != None and len(vertexInds)==0):
+        if self.getNumVertices() == 0 or (vertexInds is not None and len(vertexInds)==0):
             return 0
 
-        if P == None:
+        if P is None:
             P = self.floydWarshall(True)
         else:
             P = P.copy()
 
-        if vertexInds != None:
+        if vertexInds is not None:
             P = P[vertexInds, :][:, vertexInds]
 
         n = P.shape[0]
@@ -549,6 +656,17 @@ class AbstractMatrixGraph(AbstractSingleGraph):
 
         Util.abstract()
 
+    def complementView(self):
+        """
+        Returns a read-only view of the complement of this graph, which answers
+        neighbour, edge and degree queries from the edges of this graph without
+        storing the complement. The view is invalidated if this graph is
+        modified and can be converted into a graph using toGraph().
+
+        :returns: A ComplementView object of the complement graph.
+        """
+        return ComplementView(self)
+
     def save(self, filename):
         """
         Save the graph object to the corresponding filename under the .zip extension. The
@@ -709,14 +827,24 @@ class AbstractMatrixGraph(AbstractSingleGraph):
             raise ValueError("degreeSequence is only for undirected graphs")
 
         degSequence = self.outDegreeSequence()
-
-        #A very slow method of adding diagonal entries
-        for i in range(self.getNumVertices()):
-            if self.getEdge(i, i) != None:
-                degSequence[i] += 1
+        degSequence += self.diagonal() != 0
 
         return degSequence 
 
+    def diagonal(self):
+        """
+        :returns: a vector of the values of the self edges of each vertex, which is zero for vertices without a self edge. 
+        """
+        def computeDiagonal():
+            if scipy.sparse.issparse(self.W):
+                return SparseUtils.diag(self.W)[0:self.getNumVertices()]
+            elif type(self.W) == numpy.ndarray:
+                return numpy.diag(self.W).copy()
+            else:
+                return numpy.array([self.W[i, i] for i in range(self.getNumVertices())])
+
+        return self._cachedValue("diagonal", computeDiagonal).copy()
+
     def degreeDistribution(self):
         """
         Return a vector of (out)degree distributions. The ith element of the vector
@@ -1023,6 +1151,210 @@ class AbstractMatrixGraph(AbstractSingleGraph):
 
         return maxDiameter
     
+    def _checkVertexIndices(self, vertexIndices):
+        """
+        Check an array or list of vertex indices in a single vectorised pass and
+        return them as a sorted array of unique indices.
+        """
+        vertexIndices = numpy.asarray(vertexIndices)
+
+        if vertexIndices.ndim == 1 and vertexIndices.shape[0] == 0:
+            return numpy.zeros(0, numpy.int64)
+        Parameter.checkIndexArray(vertexIndices, 0, self.getNumVertices())
+
+        return numpy.unique(vertexIndices)
+
+    def _getCache(self):
+        """
+        Returns a dict of values derived from the weight matrix, such as
+        alternative sparse formats. The dict is emptied when the weight matrix is
+        modified through the methods of this class, or replaced. 
+        """
+        if self._cacheW is not self.W:
+            self._cache = {}
+            self._cacheW = self.W
+
+        return self._cache
+
+    def _cachedValue(self, key, func):
+        """
+        Returns the cached value with the given key, computing it using func() 
+        if it is not in the cache. 
+        """
+        cache = self._getCache()
+
+        if key not in cache:
+            cache[key] = func()
+
+        return cache[key]
+
+    def _getEdgeCounts(self):
+        """
+        Returns a list containing the number of directed edges and the number of 
+        self edges of this graph. The counts are maintained by addEdge, addEdges 
+        and removeEdge, and recomputed if the weight matrix is replaced. 
+        """
+        if self._edgeCountsW is not self.W:
+            self._edgeCounts = self._countEdges()
+            self._edgeCountsW = self.W
+        else: 
+            self._verifyEdgeCounts(self._edgeCounts, self._countEdges)
+
+        return self._edgeCounts
+
+    def _countEdges(self):
+        """
+        Count the number of directed edges and self edges of this graph from 
+        the weight matrix. 
+        """
+        if self.getNumVertices() == 0:
+            return [0, 0]
+        elif type(self.W) == numpy.ndarray:
+            numDirEdges = numpy.count_nonzero(self.W)
+            diagonal = numpy.diag(self.W)
+        elif scipy.sparse.issparse(self.W):
+            numDirEdges = self.W.count_nonzero()
+            diagonal = SparseUtils.diag(self.W)
+        else:
+            numDirEdges = self._adjacencyCsr().nnz
+            diagonal = self.diagonal()
+
+        return [int(numDirEdges), int(numpy.count_nonzero(diagonal))]
+
+    def __currentEdgeCounts(self):
+        """
+        Returns the edge counts if they are up to date with the weight matrix,
+        otherwise None. 
+        """
+        if self._edgeCountsW is self.W and self._edgeCounts is not None:
+            return self._edgeCounts
+        else:
+            return None
+
+    def __setEdgeCounts(self, edgeCounts):
+        """
+        Record edgeCounts as the counts for the current weight matrix, or mark 
+        the counts as out of date if edgeCounts is None. 
+        """
+        self._edgeCounts = edgeCounts
+        self._edgeCountsW = self.W if edgeCounts is not None else None
+
+    def __updateEdgeCounts(self, edgeCounts, vertexIndex1, vertexIndex2, delta):
+        """
+        Update the edge counts when an edge is added (delta=1) or removed 
+        (delta=-1). 
+        """
+        if vertexIndex1 == vertexIndex2:
+            edgeCounts[0] += delta
+            edgeCounts[1] += delta
+        elif self.undirected:
+            edgeCounts[0] += 2*delta
+        else:
+            edgeCounts[0] += delta
+
+    def __edgeValues(self, edges):
+        """
+        Returns the values of the weight matrix at the given array of edges. 
+        """
+        if edges.shape[0] == 0:
+            return numpy.zeros(0)
+        return numpy.asarray(self.W[edges[:, 0], edges[:, 1]]).ravel()
+
+    def _clearCache(self):
+        """
+        Empty the cache of values derived from the weight matrix. This must be
+        called after the weight matrix is modified in place, together with 
+        _clearEdgeCounts unless the edge counts are updated. 
+        """
+        self._cache = None
+        self._cacheW = None
+
+    def _clearEdgeCounts(self):
+        """
+        Mark the edge counts as out of date so that they are recomputed from 
+        the weight matrix when next needed. 
+        """
+        self._edgeCounts = None
+        self._edgeCountsW = None
+
+    def neighboursOfMany(self, vertexIndices):
+        """
+        Find the neighbours of several vertices at once. The result is ragged
+        and stored in the same way as a CSR matrix: the neighbours of
+        vertexIndices[i] are neighbours[indptr[i]:indptr[i+1]].
+
+        :param vertexIndices: an array of vertex indices.
+        :type vertexIndices: :class:`numpy.ndarray`
+
+        :returns: A tuple (indptr, neighbours) of arrays.
+        """
+        return self._raggedNeighbours(vertexIndices, self.neighbours)
+
+    def inNeighboursOfMany(self, vertexIndices):
+        """
+        Find the vertices with an edge towards each of several vertices. The
+        result is stored as in neighboursOfMany, such that the in-neighbours of
+        vertexIndices[i] are neighbours[indptr[i]:indptr[i+1]].
+
+        :param vertexIndices: an array of vertex indices.
+        :type vertexIndices: :class:`numpy.ndarray`
+
+        :returns: A tuple (indptr, neighbours) of arrays.
+        """
+        return self._raggedNeighbours(vertexIndices, self.neighbourOf)
+
+    def _raggedNeighbours(self, vertexIndices, neighbourFunc):
+        """
+        Concatenate neighbourFunc(i) for each i in vertexIndices into a ragged
+        array. 
+        """
+        vertexIndices = numpy.asarray(vertexIndices)
+        Parameter.checkIndexArray(vertexIndices, 0, self.getNumVertices())
+
+        neighbourList = [neighbourFunc(int(i)) for i in vertexIndices]
+        indptr = numpy.zeros(vertexIndices.shape[0]+1, numpy.int64)
+        indptr[1:] = numpy.cumsum([x.shape[0] for x in neighbourList])
+
+        if len(neighbourList) != 0:
+            neighbours = numpy.concatenate(neighbourList).astype(numpy.int64)
+        else:
+            neighbours = numpy.zeros(0, numpy.int64)
+
+        return indptr, neighbours
+
+    def subgraphIndexMap(self, vertexIndices):
+        """
+        Returns an array whose ith element is the index of vertex i in the subgraph
+        induced by vertexIndices, or -1 if vertex i is not in the subgraph. The
+        map can be reused to translate vertex indices into those of the
+        subgraph, for example indexMap[edges] for an array of edges.
+
+        :param vertexIndices: the indices of the subgraph vertices.
+        :type vertexIndices: :class:`list`
+
+        :returns: An array of subgraph indices for each vertex of this graph.
+        """
+        vertexIndices = self._checkVertexIndices(vertexIndices)
+        indexMap = numpy.ones(self.getNumVertices(), numpy.int64)*-1
+        indexMap[vertexIndices] = numpy.arange(vertexIndices.shape[0])
+
+        return indexMap
+
+    def subgraphView(self, vertexIndices):
+        """
+        Returns a read-only view of the subgraph containing the vertices in
+        vertexIndices and the edges between them, without copying the edges or
+        vertices of this graph. The view is invalidated if this graph is
+        modified and can be converted into a graph using toGraph().
+
+        :param vertexIndices: the indices of the subgraph vertices.
+        :type vertexIndices: :class:`list`
+
+        :returns: A SubgraphView object of the induced subgraph.
+        """
+        vertexIndices = self._checkVertexIndices(vertexIndices)
+        return SubgraphView(self, vertexIndices)
+
     def egoGraph(self, vertexIndex):
         """
         Returns the subgraph composed of the given vertex and its immediate neighbours.
@@ -1044,7 +1376,7 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         """
         Returns true if this graph is a tree. Every vertex must have an in-degree
         of 1 (i.e. one parent), except the root which has an in-degree of zero
-        and non-zero out-degree.
+        and non-zero out-degree, and every vertex must be reachable from the root.
 
         :returns: A boolean indicating whether the current graph is a tree. 
         """
@@ -1054,25 +1386,17 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         if self.getNumVertices()==0:
             return True 
 
-        inDegSeq = self.inDegreeSequence()
-        j = numpy.ones(inDegSeq.shape[0])
-        nonZeroInds = inDegSeq!=0
-        zeroInds = inDegSeq==0
+        X = self._adjacencyCsr()
+        inDegSeq = numpy.bincount(X.indices, minlength=self.getNumVertices())
 
-        if (inDegSeq[nonZeroInds] != j[nonZeroInds]).any():
+        if (inDegSeq > 1).any() or numpy.sum(inDegSeq==0) != 1:
             return False
 
-        if numpy.sum(zeroInds) != 1:
-            return False 
-
-        #Find zero entry and ensure it has out-degree > 0
-        root = numpy.nonzero(zeroInds)[0][0]
-        neighbours = self.neighbours(root)
-
-        if self.getNumVertices()>1 and neighbours.shape[0]==0:
-            return False
+        #The root must reach every vertex, which also rules out cycles 
+        root = numpy.flatnonzero(inDegSeq==0)[0]
+        order = GraphUtils.breadthFirstArrays(X, root)[0]
 
-        return True 
+        return order.shape[0] == self.getNumVertices()
 
     def findTrees(self):
         """
@@ -1085,12 +1409,20 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         if self.isUndirected():
             raise ValueError("Can only find trees on directed graphs")
 
+        X = self._adjacencyCsr()
+        numVertices = self.getNumVertices()
+        visited = numpy.zeros(numVertices, numpy.bool)
+        parents = numpy.zeros(numVertices, numpy.int64)
+        depths = numpy.zeros(numVertices, numpy.int64)
         trees = []
 
-        #Find all vertices with in-degree 0
-        for i in range(0, self.getNumVertices()):
-            if self.neighbourOf(i).shape[0] == 0:
-                trees.append(sorted(self.depthFirstSearch(i)))
+        #Find all vertices with in-degree 0, and reset the visited vertices 
+        #after each search so that trees can overlap 
+        inDegSeq = numpy.bincount(X.indices, minlength=numVertices)
+        for i in numpy.flatnonzero(inDegSeq[0:numVertices]==0):
+            order = GraphUtils.breadthFirstArrays(X, i, None, visited, parents, depths)[0]
+            visited[order] = False
+            trees.append(numpy.sort(order).tolist())
 
         sortedIndices = numpy.array([len(x) for x in trees]).argsort()
         sortedTrees = []
@@ -1100,6 +1432,37 @@ class AbstractMatrixGraph(AbstractSingleGraph):
 
         return sortedTrees
 
+    def findConnectedComponents(self):
+        """
+        Finds a list of all connected components of the graph, in order of size
+        with the largest first. The components are found with breadth first 
+        searches which share a visited array. 
+
+        :returns: A list of lists of component indices. 
+        """
+        if not self.isUndirected():
+            raise ValueError("Can only find components on undirected graphs")
+
+        X = self._adjacencyCsr()
+        numVertices = self.getNumVertices()
+        visited = numpy.zeros(numVertices, numpy.bool)
+        parents = numpy.zeros(numVertices, numpy.int64)
+        depths = numpy.zeros(numVertices, numpy.int64)
+        components = []
+
+        for i in range(numVertices):
+            if not visited[i]:
+                order = GraphUtils.breadthFirstArrays(X, i, None, visited, parents, depths)[0]
+                components.append(numpy.sort(order).tolist())
+
+        sortedIndices = numpy.array([len(x) for x in components]).argsort()
+        sortedComponents = []
+
+        for i in reversed(list(range(len(components)))):
+            sortedComponents.append(components[sortedIndices[i]])
+
+        return sortedComponents
+
     def toNetworkXGraph(self):
         """
         Convert this graph into a networkx Graph or DiGraph object, which requires
@@ -1131,26 +1494,7 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         """
         Parameter.checkIndex(root, 0, self.size)        
         
-        currentPath = [root]
-        visited = set()
-        searchPath = [] 
-
-        while len(currentPath) != 0:
-            currentVertex = currentPath[-1]
-
-            if currentVertex not in visited:
-                visited.add(currentVertex)
-                searchPath.append(currentVertex)
-
-            neighbours = self.neighbours(currentVertex)            
-            unvisited = (set(neighbours).difference(visited))
-            
-            if len(unvisited) != 0: 
-                currentPath.append(unvisited.pop())
-            else: 
-                currentPath.pop()
-
-        return searchPath
+        return GraphUtils.depthFirstArrays(self._adjacencyCsr(), root)[0].tolist()
 
     def breadthFirstSearch(self, root):
         """
@@ -1164,25 +1508,171 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         """
         Parameter.checkIndex(root, 0, self.size)        
         
-        toVisit = [root]
-        visited = set()
-        searchPath = [] 
+        return GraphUtils.breadthFirstArrays(self._adjacencyCsr(), root)[0].tolist()
+
+    def depthFirstSearchArrays(self, roots, maxDepth=None):
+        """
+        Depth first search starting from one or more roots, which are searched 
+        in turn. Neighbours are visited in order of increasing index. The search 
+        is run over the compressed adjacency structure of the graph, which is 
+        cached until the graph is modified.
 
-        #adjacencyList, weights = self.adjacencyList()
+        :param roots: The index of the root vertex or an array of root indices.
+        :type roots: :class:`numpy.ndarray`
 
-        while len(toVisit) != 0:
-            currentVertex = toVisit.pop(0)
+        :param maxDepth: The maximum depth of the search, or None for no limit.
+        :type maxDepth: :class:`int`
 
-            if currentVertex not in visited:
-                visited.add(currentVertex)
-                searchPath.append(currentVertex)
+        :returns: A tuple (order, parents, depths) of arrays, in which order contains the vertices in the order they were found, and parents and depths give the parent and depth of each vertex in the search forest, with -1 for the parents of roots and for unvisited vertices.
+        """
+        roots = self.__checkRoots(roots, maxDepth)
+        return GraphUtils.depthFirstArrays(self._adjacencyCsr(), roots, maxDepth)
 
-            neighbours = self.neighbours(currentVertex)
-            
-            unvisited = sorted(set(neighbours).difference(visited))
-            toVisit.extend(list(unvisited))
+    def breadthFirstSearchArrays(self, roots, maxDepth=None):
+        """
+        Breadth first search starting from one or more roots simultaneously, 
+        so that the depth of a vertex is its distance to the nearest root. The 
+        search expands one level at a time in a vectorised way. Neighbours are 
+        visited in order of increasing index.
+
+        :param roots: The index of the root vertex or an array of root indices.
+        :type roots: :class:`numpy.ndarray`
+
+        :param maxDepth: The maximum depth of the search, or None for no limit.
+        :type maxDepth: :class:`int`
+
+        :returns: A tuple (order, parents, depths) as in depthFirstSearchArrays.
+        """
+        roots = self.__checkRoots(roots, maxDepth)
+        return GraphUtils.breadthFirstArrays(self._adjacencyCsr(), roots, maxDepth)
+
+    def iterBreadthFirst(self, root, maxDepth=None, expandFunc=None):
+        """
+        Lazy breadth first search starting from a particular vertex, which yields 
+        a tuple (vertex, depth, parent) for each vertex as it is found, with a 
+        parent of None for the root. Neighbours are visited in order of 
+        increasing index, and are only examined when the next vertex is 
+        requested, so stopping the iteration early avoids searching the rest 
+        of the graph. The graph must not be modified during the iteration. 
+
+        :param root: The index of the root vertex.
+        :type root: :class:`int`
+
+        :param maxDepth: The maximum depth of the search, or None for no limit.
+        :type maxDepth: :class:`int`
+
+        :param expandFunc: An optional function f(vertex, depth, neighbours) called before a vertex is expanded with an array of its unvisited neighbours, which returns those neighbours to search.
 
-        return searchPath
+        :returns: A generator of (vertex, depth, parent) tuples.
+        """
+        self.__checkRoots(root, maxDepth)
+        return self.__iterSearch(root, maxDepth, expandFunc, True)
+
+    def iterDepthFirst(self, root, maxDepth=None, expandFunc=None):
+        """
+        Lazy depth first search starting from a particular vertex, which yields 
+        a tuple (vertex, depth, parent) for each vertex as it is found, with a 
+        parent of None for the root. The arguments are as in iterBreadthFirst, 
+        and the graph must not be modified during the iteration. 
+
+        :param root: The index of the root vertex.
+        :type root: :class:`int`
+
+        :param maxDepth: The maximum depth of the search, or None for no limit.
+        :type maxDepth: :class:`int`
+
+        :param expandFunc: An optional function f(vertex, depth, neighbours) called before a vertex is expanded with an array of its unvisited neighbours, which returns those neighbours to search.
+
+        :returns: A generator of (vertex, depth, parent) tuples.
+        """
+        self.__checkRoots(root, maxDepth)
+        return self.__iterSearch(root, maxDepth, expandFunc, False)
+
+    def __iterSearch(self, root, maxDepth, expandFunc, breadthFirst):
+        """
+        A generator for breadth or depth first search over the cached compressed 
+        adjacency structure, using a visited array. 
+        """
+        X = self._adjacencyCsr()
+        visited = numpy.zeros(X.shape[0], numpy.bool)
+
+        def expand(vertex, depth):
+            if maxDepth is not None and depth >= maxDepth:
+                return []
+
+            neighbours = X.indices[X.indptr[vertex]:X.indptr[vertex+1]]
+            neighbours = neighbours[numpy.logical_not(visited[neighbours])]
+
+            if expandFunc is not None:
+                neighbours = expandFunc(vertex, depth, neighbours)
+
+            return numpy.asarray(neighbours, numpy.int64).tolist()
+
+        visited[root] = True
+
+        if breadthFirst:
+            toVisit = deque([(root, 0, None)])
+
+            while len(toVisit) != 0:
+                vertex, depth, parent = toVisit.popleft()
+                yield vertex, depth, parent
+
+                for neighbour in expand(vertex, depth):
+                    if not visited[neighbour]:
+                        visited[neighbour] = True
+                        toVisit.append((neighbour, depth+1, vertex))
+        else:
+            yield root, 0, None
+            currentPath = [(root, iter(expand(root, 0)))]
+
+            while len(currentPath) != 0:
+                vertex, neighbours = currentPath[-1]
+
+                for neighbour in neighbours:
+                    if not visited[neighbour]:
+                        break
+                else:
+                    currentPath.pop()
+                    continue
+
+                depth = len(currentPath)
+                visited[neighbour] = True
+                yield neighbour, depth, vertex
+                currentPath.append((neighbour, iter(expand(neighbour, depth))))
+
+    def __checkRoots(self, roots, maxDepth):
+        """
+        Check the roots and maximum depth of a search. 
+        """
+        roots = numpy.atleast_1d(numpy.asarray(roots))
+        Parameter.checkIndexArray(roots, 0, self.getNumVertices())
+        if maxDepth is not None: 
+            Parameter.checkInt(maxDepth, 0, float("inf"))
+
+        return roots
+
+    def _adjacencyCsr(self):
+        """
+        Returns a csr matrix whose stored entries are the edges of this graph, 
+        with sorted indices and no explicit zeros. The matrix is cached until 
+        the graph is modified. 
+        """
+        cache = self._getCache()
+
+        if "adjacencyCsr" not in cache:
+            if scipy.sparse.issparse(self.W):
+                X = self.W.tocsr(copy=True)
+                X.eliminate_zeros()
+            elif type(self.W) == numpy.ndarray:
+                X = scipy.sparse.csr_matrix(self.W)
+            else:
+                numVertices = self.getNumVertices()
+                edges = self.getAllDirEdges()
+                X = scipy.sparse.csr_matrix((numpy.ones(edges.shape[0]), (edges[:, 0], edges[:, 1])), shape=(numVertices, numVertices))
+            X.sort_indices()
+            cache["adjacencyCsr"] = X
+
+        return cache["adjacencyCsr"]
 
     def getAllEdges(self):
         """
@@ -1198,6 +1688,44 @@ class AbstractMatrixGraph(AbstractSingleGraph):
 
         return edges
 
+    def iterEdges(self, chunkSize=2**20, withValues=True):
+        """
+        Iterate over the edges of this graph in blocks of at most chunkSize
+        edges, in the order given by getAllEdges. The blocks are read directly 
+        from the entries of the csr adjacency matrix so only a single block is 
+        held in memory at a time in addition to the matrix. 
+
+        :param chunkSize: The maximum number of edges in each block.
+        :type chunkSize: :class:`int`
+
+        :param withValues: Whether to include the edge values in each block.
+        :type withValues: :class:`bool`
+
+        :returns: A generator of tuples of arrays (rows, cols, values), or (rows, cols) if withValues is False.
+        """
+        Parameter.checkInt(chunkSize, 1, float("inf"))
+        Parameter.checkBoolean(withValues)
+        X = self._adjacencyCsr()
+        dataValues = scipy.sparse.issparse(self.W) or type(self.W) == numpy.ndarray
+
+        for i in range(0, X.nnz, chunkSize):
+            positions = numpy.arange(i, min(i+chunkSize, X.nnz))
+            rows = numpy.searchsorted(X.indptr, positions, "right") - 1
+            cols = numpy.array(X.indices[positions], numpy.int64)
+
+            if self.undirected:
+                inds = rows >= cols
+                positions, rows, cols = positions[inds], rows[inds], cols[inds]
+
+            if rows.shape[0] == 0:
+                continue
+            elif not withValues:
+                yield rows, cols
+            elif dataValues:
+                yield rows, cols, numpy.array(X.data[positions], numpy.float)
+            else:
+                yield rows, cols, self.getEdgeValues(numpy.c_[rows, cols])
+
     def union(self, graph):
         """
         Take the union of the edges of this graph and the input graph. Resulting edge
@@ -1258,22 +1786,17 @@ class AbstractMatrixGraph(AbstractSingleGraph):
 
         graph = cls(vList, undirected)
 
-        #Map from networkx nodes to an index
+        #Map from networkx nodes to an index, note that vertex names are ignored
         nodeDict = {}
 
-        #Set the vertices - note that vertex names are ignored
-        for i in range(len(networkXGraph.nodes())):
-            if "label" in networkXGraph.node[networkXGraph.nodes()[i]]:
-                graph.setVertex(i, networkXGraph.node[networkXGraph.nodes()[i]]["label"])
-            else:
-                graph.setVertex(i, None)
-            nodeDict[networkXGraph.nodes()[i]] = i
+        for i, (node, nodeData) in enumerate(networkXGraph.nodes(data=True)):
+            graph.setVertex(i, nodeData.get("label", None))
+            nodeDict[node] = i
+
+        edges = numpy.array([(nodeDict[u], nodeDict[v]) for u, v in networkXGraph.edges()], numpy.int)
 
-        #Set edges
-        for i in range(len(networkXGraph.edges())):
-            vertexIndex1 = nodeDict[networkXGraph.edges()[i][0]]
-            vertexIndex2 = nodeDict[networkXGraph.edges()[i][1]]
-            graph.addEdge(vertexIndex1, vertexIndex2)
+        if edges.shape[0] != 0:
+            graph.addEdges(edges)
 
         return graph
 
@@ -1370,15 +1893,19 @@ class AbstractMatrixGraph(AbstractSingleGraph):
         
         :return graph: A DictGraph object.
         """
-        edges = self.getAllEdges() 
-        values = self.getEdgeValues(edges)
         graph = DictGraph(self.undirected)
-        graph.addEdges(edges, values)
+
+        for rows, cols, values in self.iterEdges():
+            graph.addEdges(zip(rows.tolist(), cols.tolist()), values.tolist())
         
         return graph 
 
     vList = None
     undirected = None
+    _cache = None
+    _cacheW = None
+    _edgeCounts = None
+    _edgeCountsW = None
     _wFilename = "weightMatrix.mtx"
     _metaFilename = "metaDict.dat"
     _verticesFilename = "vertices"
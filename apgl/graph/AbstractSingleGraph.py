@@ -7,6 +7,7 @@ Created on 30 Jun 2009
 import numpy 
 from collections import deque 
 from apgl.util.Util import Util
+from apgl.util.Parameter import Parameter
 from apgl.graph.AbstractGraph import AbstractGraph
 
 
@@ -143,6 +144,32 @@ class AbstractSingleGraph(AbstractGraph):
         """
         Util.abstract()
 
+    def iterEdges(self, chunkSize=2**20, withValues=True):
+        """
+        Iterate over the edges of this graph in blocks of at most chunkSize
+        edges, in the order given by getAllEdges. Each block is a tuple of
+        arrays (rows, cols, values) of vertex ids and edge values, or (rows, cols)
+        if withValues is False. This implementation slices getAllEdges and 
+        subclasses read the blocks directly from their storage. 
+
+        :param chunkSize: The maximum number of edges in each block.
+        :type chunkSize: :class:`int`
+
+        :param withValues: Whether to include the edge values in each block.
+        :type withValues: :class:`bool`
+        """
+        Parameter.checkInt(chunkSize, 1, float("inf"))
+        Parameter.checkBoolean(withValues)
+        edges = numpy.asarray(self.getAllEdges())
+
+        for i in range(0, edges.shape[0], chunkSize):
+            block = edges[i:i+chunkSize]
+
+            if withValues:
+                yield block[:, 0], block[:, 1], numpy.asarray(self.getEdgeValues(block))
+            else:
+                yield block[:, 0], block[:, 1]
+
     def toNetworkXGraph(self):
         """
         Convert this graph into a networkx Graph or DiGraph object, which requires 
@@ -163,17 +190,26 @@ class AbstractSingleGraph(AbstractGraph):
         else:
             networkXGraph = networkx.DiGraph()
 
-        for i in range(self.getNumVertices()):
-            networkXGraph.add_node(i, label=self.getVertex(i))
+        vertexIds = self.getAllVertexIds()
+        vertices = self.getVertices(vertexIds)
+        networkXGraph.add_nodes_from([(vertexIds[i], {"label": vertices[i]}) for i in range(len(vertexIds))])
 
-        allEdges = self.getAllEdges()
-
-        for i in range(allEdges.shape[0]):
-            edgeVal = self.getEdge(allEdges[i, 0], allEdges[i, 1])
-            networkXGraph.add_edge(allEdges[i, 0], allEdges[i, 1], value=edgeVal)
+        for rows, cols, values in self.iterEdges():
+            networkXGraph.add_edges_from([(vertex1, vertex2, {"value": value}) for vertex1, vertex2, value in zip(rows.tolist(), cols.tolist(), values.tolist())])
 
         return networkXGraph 
 
+    def getEdgeValues(self, edgeArray):
+        """
+        Take a sequence of pairs of vertex indices and return the corresponding 
+        edge values, which are None for pairs of vertices without an edge.
+
+        :param edgeArray: A sequence with an edge on each row
+
+        :returns: A list of values corresponding to the edge values of edgeArray
+        """
+        return [self.getEdge(edge[0], edge[1]) for edge in edgeArray]
+
     def findConnectedComponents(self):
         """
         Finds a list of all connected components of the graph, in order of size
@@ -248,16 +284,14 @@ class AbstractSingleGraph(AbstractGraph):
         #Add all vertices 
         newGraph.vs["label"] = self.getVertices(self.getAllVertexIds())
 
-        vertices = self.getAllVertexIds()
-        allEdges = self.getAllEdges()
-        
+        #Map vertex ids to the indices of the igraph vertices 
+        vertexInds = dict((vertexId, i) for i, vertexId in enumerate(self.getAllVertexIds()))
+        numEdges = 0
 
-        for i in range(len(allEdges)):
-            vertexId1 = vertices.index(allEdges[i, 0])
-            vertexId2 = vertices.index(allEdges[i, 1])            
-            
-            newGraph.add_edge(vertexId1, vertexId2)
-            newGraph.es[i]["value"] = self.getEdge(allEdges[i, 0], allEdges[i, 1])
+        for rows, cols, values in self.iterEdges():
+            newGraph.add_edges([(vertexInds[vertex1], vertexInds[vertex2]) for vertex1, vertex2 in zip(rows.tolist(), cols.tolist())])
+            newGraph.es[numEdges:numEdges+values.shape[0]]["value"] = values.tolist()
+            numEdges += values.shape[0]
 
         return newGraph
 
@@ -332,4 +366,96 @@ class AbstractSingleGraph(AbstractGraph):
             toVisit.extend(sorted(unvisited))
             
         return searchPath
-    
\ No newline at end of file
+
+    def iterBreadthFirst(self, root, maxDepth=None, expandFunc=None):
+        """
+        Lazy breadth first search starting from a particular vertex, which yields 
+        a tuple (vertex, depth, parent) for each vertex as it is found, with a 
+        parent of None for the root. Neighbours of a vertex are only examined 
+        when the next vertex is requested, so stopping the iteration early 
+        avoids searching the rest of the graph. The graph must not be modified 
+        during the iteration. 
+
+        :param root: The index of the root vertex.
+        :type root: :class:`int`
+
+        :param maxDepth: The maximum depth of the search, or None for no limit.
+        :type maxDepth: :class:`int`
+
+        :param expandFunc: An optional function f(vertex, depth, neighbours) called before a vertex is expanded with its unvisited neighbours, which returns those neighbours to search.
+
+        :returns: A generator of (vertex, depth, parent) tuples.
+        """
+        if maxDepth is not None:
+            Parameter.checkInt(maxDepth, 0, float("inf"))
+
+        return self.__iterBreadthFirst(root, maxDepth, expandFunc)
+
+    def iterDepthFirst(self, root, maxDepth=None, expandFunc=None):
+        """
+        Lazy depth first search starting from a particular vertex, which yields 
+        a tuple (vertex, depth, parent) for each vertex as it is found, with a 
+        parent of None for the root. The arguments are as in iterBreadthFirst, 
+        and the graph must not be modified during the iteration. 
+
+        :param root: The index of the root vertex.
+        :type root: :class:`int`
+
+        :param maxDepth: The maximum depth of the search, or None for no limit.
+        :type maxDepth: :class:`int`
+
+        :param expandFunc: An optional function f(vertex, depth, neighbours) called before a vertex is expanded with its unvisited neighbours, which returns those neighbours to search.
+
+        :returns: A generator of (vertex, depth, parent) tuples.
+        """
+        if maxDepth is not None:
+            Parameter.checkInt(maxDepth, 0, float("inf"))
+
+        return self.__iterDepthFirst(root, maxDepth, expandFunc)
+
+    def __expand(self, vertex, depth, visited, maxDepth, expandFunc):
+        """
+        Returns the unvisited neighbours of a vertex which should be searched.
+        """
+        if maxDepth is not None and depth >= maxDepth:
+            return []
+
+        neighbours = [v for v in self.neighbours(vertex) if v not in visited]
+
+        if expandFunc is not None:
+            neighbours = expandFunc(vertex, depth, neighbours)
+
+        return neighbours
+
+    def __iterBreadthFirst(self, root, maxDepth, expandFunc):
+        visited = set([root])
+        toVisit = deque([(root, 0, None)])
+
+        while len(toVisit) != 0:
+            vertex, depth, parent = toVisit.popleft()
+            yield vertex, depth, parent
+
+            for neighbour in self.__expand(vertex, depth, visited, maxDepth, expandFunc):
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    toVisit.append((neighbour, depth+1, vertex))
+
+    def __iterDepthFirst(self, root, maxDepth, expandFunc):
+        visited = set([root])
+        yield root, 0, None
+        currentPath = [(root, iter(self.__expand(root, 0, visited, maxDepth, expandFunc)))]
+
+        while len(currentPath) != 0:
+            vertex, neighbours = currentPath[-1]
+
+            for neighbour in neighbours:
+                if neighbour not in visited:
+                    break
+            else:
+                currentPath.pop()
+                continue
+
+            depth = len(currentPath)
+            visited.add(neighbour)
+            yield neighbour, depth, vertex
+            currentPath.append((neighbour, iter(self.__expand(neighbour, depth, visited, maxDepth, expandFunc))))
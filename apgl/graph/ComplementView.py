@@ -0,0 +1,200 @@
+import numpy
+import scipy.sparse
+from apgl.graph.AbstractSingleGraph import AbstractSingleGraph
+
+
+class ComplementView(AbstractSingleGraph):
+    """
+    A read-only view of the complement of an AbstractMatrixGraph, i.e. the graph
+    on the same vertices with an edge of weight 1 wherever the parent graph has
+    no edge (including self edges). Queries are answered from the edges of the
+    parent graph so the n^2 entries of the complement are never stored unless
+    explicitly requested with getAllDirEdges, toCsr or toGraph. The view is
+    invalid if the parent graph is subsequently modified.
+    """
+    def __init__(self, graph):
+        """
+        Create a view of the complement of graph.
+
+        :param graph: the parent graph.
+        :type graph: :class:`apgl.graph.AbstractMatrixGraph`
+        """
+        self.graph = graph
+        self.undirected = graph.isUndirected()
+
+    def getNumVertices(self):
+        """
+        :returns: the number of vertices in this graph.
+        """
+        return self.graph.getNumVertices()
+
+    def isUndirected(self):
+        """
+        :returns: true if the parent graph is undirected, otherwise false.
+        """
+        return self.undirected
+
+    def neighbours(self, vertexIndex):
+        """
+        Return an array of the indices of the neighbours of the given vertex in
+        the complement graph, in sorted order. For a directed graph these are
+        the vertices connected by an edge from the given vertex.
+
+        :param vertexIndex: the index of a vertex.
+        :type vertexIndex: :class:`int`
+        """
+        neighbours = numpy.asarray(self.graph.neighbours(vertexIndex), numpy.int64)
+        return numpy.setdiff1d(numpy.arange(self.getNumVertices()), neighbours, assume_unique=True)
+
+    def neighbourOf(self, vertexIndex):
+        """
+        Return an array of the indices of the vertices with an edge to the given
+        vertex in the complement graph, in sorted order.
+
+        :param vertexIndex: the index of a vertex.
+        :type vertexIndex: :class:`int`
+        """
+        neighbours = numpy.asarray(self.graph.neighbourOf(vertexIndex), numpy.int64)
+        return numpy.setdiff1d(numpy.arange(self.getNumVertices()), neighbours, assume_unique=True)
+
+    def getEdge(self, vertexIndex1, vertexIndex2):
+        """
+        Get the value of an edge, which is 1 if the parent graph has no such
+        edge and otherwise None.
+
+        :param vertexIndex1: The index of the first vertex.
+        :type vertexIndex1: :class:`int`
+
+        :param vertexIndex2: The index of the second vertex.
+        :type vertexIndex2: :class:`int`
+        """
+        if self.graph.getEdge(vertexIndex1, vertexIndex2) is None:
+            return 1
+        else:
+            return None
+
+    def getVertex(self, vertexIndex):
+        """
+        Returns the vertex associated with the given vertex index.
+
+        :param vertexIndex: the index of the vertex.
+        :type vertexIndex: :class:`int`
+        """
+        return self.graph.getVertex(vertexIndex)
+
+    def getAllVertexIds(self):
+        """
+        Returns a list of all the vertex indices of this graph.
+        """
+        return list(range(0, self.getNumVertices()))
+
+    def outDegreeSequence(self):
+        """
+        :returns: a vector of the (out)degree sequence for each vertex.
+        """
+        return (self.getNumVertices() - self.graph.outDegreeSequence()).astype(numpy.int32)
+
+    def inDegreeSequence(self):
+        """
+        :returns: a vector of the (in)degree sequence for each vertex.
+        """
+        return (self.getNumVertices() - self.graph.inDegreeSequence()).astype(numpy.int32)
+
+    def diagonal(self):
+        """
+        :returns: a vector of the values of the self edges of each vertex, which is zero for vertices without a self edge.
+        """
+        return numpy.array(self.graph.diagonal() == 0, numpy.float)
+
+    def degreeSequence(self):
+        """
+        :returns: a vector of the degrees (including self edges) for each vertex for an undirected graph.
+        """
+        if not self.isUndirected():
+            raise ValueError("degreeSequence is only for undirected graphs")
+
+        return self.outDegreeSequence() + (self.graph.diagonal() == 0)
+
+    def getNumDirEdges(self):
+        """
+        :returns: the number of edges, taking this graph as a directed graph.
+        """
+        return self.getNumVertices()**2 - self.graph.getNumDirEdges()
+
+    def getNumEdges(self):
+        """
+        :returns: the total number of edges in the complement graph.
+        """
+        if self.undirected:
+            numSelfEdges = numpy.sum(self.graph.diagonal() == 0)
+            return (self.getNumDirEdges() + numSelfEdges)/2
+        else:
+            return self.getNumDirEdges()
+
+    def toCsr(self):
+        """
+        Compute the adjacency matrix of the complement graph as a csr_matrix,
+        built row-wise from the sorted edges of the parent graph. Note that this
+        matrix has up to n^2 non-zero entries.
+
+        :returns: A scipy.sparse.csr_matrix adjacency matrix of the complement.
+        """
+        numVertices = self.getNumVertices()
+
+        if numVertices == 0:
+            return scipy.sparse.csr_matrix((0, 0))
+
+        A = self.graph._adjacencyCsr()
+        rowCounts = numpy.diff(A.indptr)
+        rows = numpy.repeat(numpy.arange(numVertices, dtype=numpy.int64), rowCounts)
+
+        mask = numpy.ones(numVertices**2, numpy.bool)
+        mask[rows*numVertices + A.indices] = False
+        cols = numpy.flatnonzero(mask) % numVertices
+
+        indptr = numpy.zeros(numVertices+1, numpy.int64)
+        indptr[1:] = numpy.cumsum(numVertices - rowCounts)
+
+        return scipy.sparse.csr_matrix((numpy.ones(cols.shape[0]), cols, indptr), shape=(numVertices, numVertices))
+
+    def getAllDirEdges(self):
+        """
+        :returns: A matrix with 2 columns, and each row corresponding to a directed edge.
+        """
+        X = self.toCsr()
+        rows = numpy.repeat(numpy.arange(X.shape[0]), numpy.diff(X.indptr))
+        return numpy.c_[rows, X.indices]
+
+    def getAllEdges(self):
+        """
+        Returns the set of edges of the complement graph as a matrix in which
+        each row corresponds to an edge. For an undirected graph, v1>=v2.
+        """
+        edges = self.getAllDirEdges()
+
+        if self.undirected and edges.shape[0] != 0:
+            edges = edges[edges[:, 0] >= edges[:, 1], :]
+
+        return edges
+
+    def toGraph(self):
+        """
+        Materialise this view as a new graph of the same type as the parent
+        graph, using the complement method of the parent.
+
+        :returns: The complement of the parent graph.
+        """
+        return self.graph.complement()
+
+    def __str__(self):
+        output = str(self.__class__.__name__) + ": "
+        output += "vertices " + str(self.getNumVertices())
+        if self.undirected:
+            output += ", undirected"
+        else:
+            output += ", directed"
+        return output
+
+    graph = None
+    undirected = None
+    size = property(getNumVertices, doc="The number of vertices in the graph")
@@ -290,6 +290,8 @@ class CsArrayGraph(AbstractMatrixGraph):
         Removes all edges from this graph. 
         """
         self.W.setZero()
+        self._clearCache()
+        self._clearEdgeCounts()
 
     def setWeightMatrixSparse(self, W):
         """
@@ -300,6 +302,8 @@ class CsArrayGraph(AbstractMatrixGraph):
         :param W:  The scipy sparse weight matrix to use. 
         """      
         self.W[W.nonzero()] = W.data
+        self._clearCache()
+        self._clearEdgeCounts()
 
     def addVertices(self, n): 
         """
@@ -50,16 +50,18 @@ class DenseGraph(AbstractMatrixGraph):
         """
         Returns the total number of edges in this graph.
         """
+        numDirEdges, numSelfEdges = self._getEdgeCounts()
+
         if self.undirected:
-            return (numpy.flatnonzero(self.W).shape[0] + numpy.flatnonzero(numpy.diag(self.W)).shape[0])/2
+            return (numDirEdges + numSelfEdges)/2
         else: 
-            return numpy.flatnonzero(self.W).shape[0]
+            return numDirEdges
 
     def getNumDirEdges(self):
         """
         Returns the number of edges, taking this graph as a directed graph. 
         """
-        return numpy.flatnonzero(self.W).shape[0]
+        return self._getEdgeCounts()[0]
     
     def getWeightMatrix(self):
         """
@@ -107,23 +109,15 @@ class DenseGraph(AbstractMatrixGraph):
         """
         Return a vector of the (out)degree for each vertex.
         """
-        degrees = numpy.zeros(self.W.shape[0], dtype=numpy.int32)
-
-        for i in range(0, self.W.shape[0]):
-            degrees[i] = numpy.sum(self.W[i, :] != 0)
-
-        return degrees
+        computeDegrees = lambda: numpy.sum(self.W != 0, 1).astype(numpy.int32)
+        return self._cachedValue("outDegrees", computeDegrees).copy()
 
     def inDegreeSequence(self):
         """
-        Return a vector of the (out)degree for each vertex.
+        Return a vector of the (in)degree for each vertex.
         """
-        degrees = numpy.zeros(self.W.shape[0], dtype=numpy.int32)
-
-        for i in range(0, self.W.shape[0]):
-            degrees[i] = numpy.sum(self.W[:, i] != 0)
-
-        return degrees 
+        computeDegrees = lambda: numpy.sum(self.W != 0, 0).astype(numpy.int32)
+        return self._cachedValue("inDegrees", computeDegrees).copy()
 
     def subgraph(self, vertexIndices):
         """
@@ -133,12 +127,11 @@ class DenseGraph(AbstractMatrixGraph):
         :param vertexIndices: the indices of the subgraph vertices.
         :type vertexIndices: :class:`list`
         """
-        Parameter.checkList(vertexIndices, Parameter.checkIndex, (0, self.getNumVertices()))
-        vertexIndices = numpy.unique(numpy.array(vertexIndices)).tolist()
-        vList = self.vList.subList(vertexIndices)
+        vertexIndices = self._checkVertexIndices(vertexIndices)
+        vList = self.vList.subList(vertexIndices.tolist())
 
-        subGraph = DenseGraph(vList, self.undirected, self.W.dtype)
-        subGraph.W = self.W[vertexIndices, :][:, vertexIndices]
+        subGraph = DenseGraph(vList, self.undirected, dtype=self.W.dtype)
+        subGraph.W = self.W[numpy.ix_(vertexIndices, vertexIndices)]
 
         return subGraph
 
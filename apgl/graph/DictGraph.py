@@ -2,6 +2,8 @@
 import numpy
 import heapq
 import scipy.sparse 
+import scipy.sparse.csgraph
+from apgl.util.Parameter import Parameter
 from apgl.graph.AbstractSingleGraph import AbstractSingleGraph
 
 
@@ -10,17 +12,27 @@ class DictGraph(AbstractSingleGraph):
     A graph with nodes stored in a dictionary. In particular the graph data structure is a
     dict of dicts. Edges and vertices can be labeled with anything.
     """
-    def __init__(self, undirected=True):
+    def __init__(self, undirected=True, reverseIndex=True):
         """
         Create a new DictGraph. 
 
         :param undirected: Specify whether the graph has directed or undirected edges 
         :type undirected: `bool`        
+
+        :param reverseIndex: Specify whether a directed graph maintains an index of the in-edges of each vertex, see setReverseIndex
+        :type reverseIndex: `bool`        
         
         """
+        Parameter.checkBoolean(reverseIndex)
         self.undirected = undirected
+        self.reverseIndex = reverseIndex
         self.adjacencies = {}
         self.vertices = {}
+        self._edgeCounts = [0, 0]
+        self._edgeCountsAdj = self.adjacencies
+        if reverseIndex:
+            self._inAdjacencies = {}
+            self._inAdjacenciesAdj = self.adjacencies
 
     def addEdge(self, vertex1, vertex2, value=1.0):
         """
@@ -37,10 +49,14 @@ class DictGraph(AbstractSingleGraph):
 
         self.__touchVertex(vertex1)
         self.__touchVertex(vertex2)
+        if vertex2 not in self.adjacencies[vertex1]:
+            self.__updateEdgeCounts(vertex1, vertex2, 1)
         self.adjacencies[vertex1][vertex2] = value
 
         if self.undirected:
            self.adjacencies[vertex2][vertex1] = value
+        else: 
+            self.__addInEdge(vertex1, vertex2)
 
     def addEdges(self, edgeList, edgeValues=None):
         """
@@ -55,17 +71,21 @@ class DictGraph(AbstractSingleGraph):
         i = 0
         for edge in edgeList:
             (vertex1, vertex2) = edge
-            if edgeValues == None:
+            if edgeValues is None:
                 value = 1
             else:
                 value = edgeValues[i]
 
             self.__touchVertex(vertex1)
             self.__touchVertex(vertex2)
+            if vertex2 not in self.adjacencies[vertex1]:
+                self.__updateEdgeCounts(vertex1, vertex2, 1)
             self.adjacencies[vertex1][vertex2] = value
 
             if self.undirected:
                 self.adjacencies[vertex2][vertex1] = value
+            else: 
+                self.__addInEdge(vertex1, vertex2)
             i += 1 
 
     def __touchVertex(self, vertexId):
@@ -87,8 +107,9 @@ class DictGraph(AbstractSingleGraph):
         :param vertex2: The name of the second vertex.
         """
         self.__removeDirectedEdge(vertex1, vertex2)
+        self.__updateEdgeCounts(vertex1, vertex2, -1)
 
-        if self.undirected:
+        if self.undirected and vertex1 != vertex2:
            self.__removeDirectedEdge(vertex2, vertex1)
 
     def __removeDirectedEdge(self, vertex1, vertex2):
@@ -99,6 +120,131 @@ class DictGraph(AbstractSingleGraph):
 
         del self.adjacencies[vertex1][vertex2]
 
+        inAdjacencies = self.__currentInAdjacencies()
+        if inAdjacencies is not None:
+            del inAdjacencies[vertex2][vertex1]
+
+    def __addInEdge(self, vertex1, vertex2):
+        """
+        Record the directed edge from vertex1 to vertex2 in the reverse 
+        adjacency index if it is up to date. 
+        """
+        inAdjacencies = self.__currentInAdjacencies()
+        if inAdjacencies is not None:
+            if vertex2 not in inAdjacencies:
+                inAdjacencies[vertex2] = {}
+            inAdjacencies[vertex2][vertex1] = None
+
+    def __currentInAdjacencies(self):
+        """
+        Returns the reverse adjacency index, or None if the graph is undirected,
+        the index is switched off or it is out of date. 
+        """
+        if not self.undirected and self.reverseIndex and self._inAdjacenciesAdj is self.adjacencies:
+            return self._inAdjacencies
+        else:
+            return None
+
+    def _getInAdjacencies(self):
+        """
+        Returns the reverse adjacency index of a directed graph, which is a dict
+        mapping each vertex id to a dict whose keys are the vertices with an 
+        edge to it. The index is rebuilt if it is out of date, and None is 
+        returned if the graph is undirected or the index is switched off. 
+        """
+        if self.undirected or not self.reverseIndex:
+            return None
+
+        if self.__currentInAdjacencies() is None:
+            self._inAdjacencies = {}
+            for vertex1, adjacency in self.adjacencies.items():
+                for vertex2 in adjacency:
+                    if vertex2 not in self._inAdjacencies:
+                        self._inAdjacencies[vertex2] = {}
+                    self._inAdjacencies[vertex2][vertex1] = None
+            self._inAdjacenciesAdj = self.adjacencies
+
+        return self._inAdjacencies
+
+    def setReverseIndex(self, reverseIndex):
+        """
+        Switch the reverse adjacency index of a directed graph on or off. The 
+        index is maintained as edges are added and removed, and gives neighbourOf, 
+        inDegreeSequence and removeVertex a cost proportional to the in-degree 
+        rather than the size of the graph. Switching it off saves the memory of 
+        a second copy of the edges, and the time to update it, for graphs which
+        are mostly written to. It has no effect for undirected graphs. 
+
+        :param reverseIndex: Whether to maintain the reverse adjacency index.
+        :type reverseIndex: :class:`bool`
+        """
+        Parameter.checkBoolean(reverseIndex)
+        self.reverseIndex = reverseIndex
+        self._inAdjacencies = None
+        self._inAdjacenciesAdj = None
+
+    def __updateEdgeCounts(self, vertex1, vertex2, delta):
+        """
+        Update the edge counts when the edge between vertex1 and vertex2 is added
+        (delta=1) or removed (delta=-1).
+        """
+        edgeCounts = self.__currentEdgeCounts()
+        if edgeCounts is None:
+            return
+
+        if vertex1 == vertex2:
+            edgeCounts[0] += delta
+            edgeCounts[1] += delta
+        elif self.undirected:
+            edgeCounts[0] += 2*delta
+        else:
+            edgeCounts[0] += delta
+
+    def __currentEdgeCounts(self):
+        """
+        Returns the maintained edge counts, or None if they are out of date.
+        """
+        if self._edgeCountsAdj is self.adjacencies:
+            return self._edgeCounts
+        else:
+            return None
+
+    def _getEdgeCounts(self):
+        """
+        Returns a list containing the number of directed edges and the number of 
+        self edges of this graph. The counts are maintained by the methods which
+        add and remove edges, and recomputed if they are out of date. 
+        """
+        edgeCounts = self.__currentEdgeCounts()
+
+        if edgeCounts is None:
+            self._edgeCounts = self._countEdges()
+            self._edgeCountsAdj = self.adjacencies
+        else:
+            self._verifyEdgeCounts(edgeCounts, self._countEdges)
+
+        return self._edgeCounts
+
+    def _countEdges(self):
+        """
+        Count the number of directed edges and self edges from the adjacencies.
+        """
+        numDirEdges = 0
+        numSelfEdges = 0
+        for vertex1, adjacency in self.adjacencies.items():
+            numDirEdges += len(adjacency)
+            numSelfEdges += vertex1 in adjacency
+
+        return [numDirEdges, numSelfEdges]
+
+    def _clearEdgeCounts(self):
+        """
+        Mark the edge counts and the reverse adjacency index as out of date, 
+        which is required after the adjacencies are modified directly. 
+        """
+        self._edgeCountsAdj = None
+        self._inAdjacenciesAdj = None
+
     def isUndirected(self):
         """
         Returns true if the current graph is undirected, otherwise false. 
@@ -109,18 +255,13 @@ class DictGraph(AbstractSingleGraph):
         """
         Returns the total number of edges in graph. 
         """
-        numEdges = 0
-        for vertex1 in self.adjacencies.keys():
-            numEdges += len(self.adjacencies[vertex1])
+        numDirEdges, numSelfEdges = self._getEdgeCounts()
 
         if not self.undirected:
-            return numEdges
+            return numDirEdges
         else:
             #Count self edges again
-            for vertex1 in self.adjacencies.keys():
-                if vertex1 in self.adjacencies[vertex1]:
-                    numEdges += 1
-            return numEdges/2
+            return (numDirEdges + numSelfEdges)/2
 
     def getNumVertices(self):
         """
@@ -184,19 +325,113 @@ class DictGraph(AbstractSingleGraph):
 
     def getAllEdges(self):
         """
-        Returns a list of tuples of all the edges of this graph. 
+        Returns a list of tuples of all the edges of this graph. For an 
+        undirected graph each edge is given once, from the vertex which comes 
+        first in getAllVertexIds. 
         """
+        return [(vertex1, vertex2) for vertex1, vertex2, value in self.__iterEdgeTuples()]
 
-        edges = []
+    def getAllEdgeArrays(self, withValues=True):
+        """
+        Returns the edges of this graph in the order of getAllEdges as a tuple of
+        arrays (src ids, dst ids, values), or (src ids, dst ids) if withValues 
+        is False. The arrays are numeric if the ids or values are numbers of one type, 
+        and otherwise are arrays of the original objects. 
 
-        for vertex1 in list(self.vertices.keys()):
-            for vertex2 in self.neighbours(vertex1):
-                if self.undirected == True and (vertex2, vertex1) not in edges:
-                    edges.append((vertex1, vertex2))
-                elif self.undirected == False:
-                    edges.append((vertex1, vertex2))
+        :param withValues: Whether to include the edge values.
+        :type withValues: :class:`bool`
+        """
+        Parameter.checkBoolean(withValues)
+        edgeTuples = list(self.__iterEdgeTuples())
+
+        if len(edgeTuples) == 0:
+            rows, cols, values = [], [], []
+        else:
+            rows, cols, values = zip(*edgeTuples)
+
+        return self.__edgeBlock(rows, cols, values, withValues)
+
+    def iterEdges(self, chunkSize=2**20, withValues=True):
+        """
+        Iterate over the edges of this graph in blocks of at most chunkSize
+        edges, in the order given by getAllEdges, by walking the adjacencies 
+        once. Each block is a tuple of arrays (rows, cols, values) of vertex ids 
+        and edge values, or (rows, cols) if withValues is False. The arrays 
+        are numeric if the ids or values are numbers of one type, and otherwise 
+        are arrays of the original objects. 
+
+        :param chunkSize: The maximum number of edges in each block.
+        :type chunkSize: :class:`int`
+
+        :param withValues: Whether to include the edge values in each block.
+        :type withValues: :class:`bool`
+        """
+        Parameter.checkInt(chunkSize, 1, float("inf"))
+        Parameter.checkBoolean(withValues)
+        rows = []
+        cols = []
+        values = []
+
+        for vertex1, vertex2, value in self.__iterEdgeTuples():
+            rows.append(vertex1)
+            cols.append(vertex2)
+            values.append(value)
+
+            if len(rows) == chunkSize:
+                yield self.__edgeBlock(rows, cols, values, withValues)
+                rows, cols, values = [], [], []
 
-        return edges
+        if len(rows) != 0:
+            yield self.__edgeBlock(rows, cols, values, withValues)
+
+    def __iterEdgeTuples(self):
+        """
+        A generator over the edges of this graph as tuples (vertex1, vertex2, value)
+        which walks the adjacencies once. An undirected edge is output from the
+        first of its vertices to be visited. 
+        """
+        visited = set()
+
+        for vertex1 in self.vertices:
+            for vertex2, value in self.adjacencies[vertex1].items():
+                if not self.undirected or vertex2 not in visited:
+                    yield vertex1, vertex2, value
+
+            if self.undirected:
+                visited.add(vertex1)
+
+    @staticmethod
+    def __edgeBlock(rows, cols, values, withValues):
+        """
+        Returns a tuple of arrays for the given lists of edges, as output by
+        iterEdges.
+        """
+        if withValues:
+            return DictGraph.__toArray(rows), DictGraph.__toArray(cols), DictGraph.__toArray(values)
+        else:
+            return DictGraph.__toArray(rows), DictGraph.__toArray(cols)
+
+    @staticmethod
+    def __toArray(lst):
+        """
+        Convert a list of vertex ids or edge values to a 1D numpy array, which is
+        an array of the original objects unless the elements are numbers of the
+        same type, so that mixed ints and floats are not upcast.
+        """
+        array = None
+
+        if len(set(type(item) for item in lst)) <= 1:
+            try:
+                array = numpy.array(lst)
+            except (TypeError, ValueError):
+                array = None
+
+        if array is None or array.shape != (len(lst), ) or array.dtype.kind not in "biuf":
+            array = numpy.empty(len(lst), object)
+            for i, item in enumerate(lst):
+                array[i] = item
+
+        return array
 
     def getWeightMatrix(self):
         """
@@ -204,9 +439,10 @@ class DictGraph(AbstractSingleGraph):
         indices in the matrix correspond to the keys returned by getAllVertexIds, 
         and edge labels are assigned to 1 for edges with non-numeric values.  
         """
+        rows, cols, weights = self.__weightArrays()
         W = numpy.zeros((self.getNumVertices(), self.getNumVertices()))
-        return self.__populateWeightMatrix(W)
-
+        W[rows, cols] = weights
+        return W
 
     def getSparseWeightMatrix(self, format="lil"):
         """
@@ -219,17 +455,11 @@ class DictGraph(AbstractSingleGraph):
         
         :param format: The format of the sparse matrix. 
         """
-        if format=="lil": 
-            W = scipy.sparse.lil_matrix((self.size, self.size))
-            W = self.__populateWeightMatrix(W) 
-        elif format=="csr": 
-            W = scipy.sparse.lil_matrix((self.size, self.size))
-            W = self.__populateWeightMatrix(W)
-            W = W.tocsr()
-        elif format=="csc":
-            W = scipy.sparse.lil_matrix((self.size, self.size))
-            W = self.__populateWeightMatrix(W)
-            W = W.tocsc()
+        if format in ["lil", "csr", "csc"]: 
+            rows, cols, weights = self.__weightArrays()
+            W = scipy.sparse.csr_matrix((weights, (rows, cols)), shape=(self.size, self.size))
+            W.eliminate_zeros()
+            W = W.asformat(format)
         elif format=="pysparse": 
             from pysparse import spmatrix
             W = spmatrix.ll_mat(self.size, self.size)
@@ -239,6 +469,42 @@ class DictGraph(AbstractSingleGraph):
             
         return W 
 
+    def __weightArrays(self): 
+        """
+        Returns arrays of the rows, columns and weights of the directed edges 
+        of this graph, in which indices correspond to the keys returned by 
+        getAllVertexIds and non-numeric edge values have weight 1. 
+        """
+        keyInds = dict((k, i) for i, k in enumerate(self.vertices.keys()))
+        rows = []
+        cols = []
+        values = []
+
+        for vertex1, neighbours in self.adjacencies.items():
+            rows.extend([keyInds[vertex1]]*len(neighbours))
+            cols.extend([keyInds[vertex2] for vertex2 in neighbours])
+            values.extend(neighbours.values())
+
+        try: 
+            weights = numpy.array(values, numpy.float)
+        except (TypeError, ValueError): 
+            weights = None 
+
+        if weights is None or weights.shape != (len(values), ): 
+            weights = numpy.array([self.__weight(value) for value in values], numpy.float)
+
+        return numpy.array(rows, numpy.int), numpy.array(cols, numpy.int), weights
+
+    @staticmethod
+    def __weight(value): 
+        """
+        Returns the weight corresponding to an edge value.
+        """
+        try: 
+            return float(value)
+        except (TypeError, ValueError): 
+            return 1 
+
     def __populateWeightMatrix(self, W):
         """
         Fill the weight matrix W with edge weights according to this graph.
@@ -273,72 +539,61 @@ class DictGraph(AbstractSingleGraph):
         """
         Returns a numpy array of size (numEdges x 2) of edge index pairs V. The ith
         row of V, V[i, :], corresponds to an edge from V[i, 0] to V[i, 1]. The corresponding
-        vertex names are found using getAllVertexIds().
+        vertex names are found using getAllVertexIds(). For an undirected graph
+        V[i, 0] <= V[i, 1]. 
         """
-        edges = numpy.zeros((self.getNumEdges(), 2), numpy.int)
-        keyInds = {}
+        keyInds = dict((k, i) for i, k in enumerate(self.vertices.keys()))
+        degrees = numpy.array([len(self.adjacencies[vertex1]) for vertex1 in self.vertices], numpy.int)
+        numDirEdges = int(numpy.sum(degrees))
 
-        i = 0
-        for k in self.vertices.keys():
-            keyInds[k] = i
-            i += 1
+        rows = numpy.repeat(numpy.arange(degrees.shape[0]), degrees)
+        cols = numpy.fromiter((keyInds[vertex2] for vertex1 in self.vertices for vertex2 in self.adjacencies[vertex1]), numpy.int, numDirEdges)
 
-        i = 0
-        for vertex1 in self.vertices.keys():
-            for vertex2 in self.neighbours(vertex1):
-                if self.undirected and keyInds[vertex2] >= keyInds[vertex1] or not self.undirected:
-                    edges[i, :] = numpy.array([keyInds[vertex1], keyInds[vertex2]])
-                    i += 1 
-
-        return edges
+        if self.undirected:
+            inds = cols >= rows
+            rows, cols = rows[inds], cols[inds]
 
+        return numpy.array(numpy.c_[rows, cols], numpy.int)
 
     def subgraph(self, vertexIds):
         """
         Compute the subgraph containing only the corresponding vertexIds and
-        the edges between them. 
-        """
-
-        subgraph = DictGraph(self.undirected)
-
-        """
-        edgeList = self.getAllEdges()
-        subgraphEdgeList = []
-
-        for edge in edgeList:
-            (vertex1, vertex2) = edge
-
-            if vertex1 in vertexIds and vertex2 in vertexIds:
-                subgraphEdgeList.append(edge)
-
-        subgraph.addEdges(subgraphEdgeList)
+        the edges between them. Only the adjacencies of the subgraph vertices 
+        are visited, and edges to vertices outside the subgraph are never copied. 
         """
+        subgraph = DictGraph(self.undirected, self.reverseIndex)
         vertexIds = set(vertexIds)
 
         for vertexId in vertexIds:
-            if vertexId in self.adjacencies.keys():
-                subgraph.__touchVertex(vertexId)
-                subgraph.adjacencies[vertexId] = self.adjacencies[vertexId].copy()
-
+            adjacency = self.adjacencies[vertexId]
+            
+            if len(adjacency) <= len(vertexIds): 
+                subgraph.adjacencies[vertexId] = dict((v, adjacency[v]) for v in adjacency if v in vertexIds)
+            else: 
+                subgraph.adjacencies[vertexId] = dict((v, adjacency[v]) for v in vertexIds if v in adjacency)
+                
             subgraph.vertices[vertexId] = self.vertices[vertexId]
-
-        deleteIdList = []
-
-        #Now remove the elements in the adjacencies:
-        for vertex1 in subgraph.adjacencies.keys():
-            for vertex2 in subgraph.adjacencies[vertex1].keys():
-                if vertex2 not in vertexIds:
-                    deleteIdList.append((vertex1, vertex2))
-
-        for vertex1, vertex2 in deleteIdList:         
-            del subgraph.adjacencies[vertex1][vertex2]
            
+        subgraph._clearEdgeCounts()
         return subgraph 
 
     def neighbourOf(self, vertex):
         """
-        Returns the list of neighbours of the current neighbour.
+        Returns the list of vertices with an edge to the given vertex. For an 
+        undirected graph these are the neighbours of the vertex, and for a 
+        directed graph they are read from the reverse adjacency index unless it 
+        is switched off. 
+
+        :param vertex: The id of the vertex.
         """
+        if self.undirected:
+            if vertex not in self.adjacencies:
+                return []
+            return list(self.adjacencies[vertex].keys())
+
+        inAdjacencies = self._getInAdjacencies()
+        if inAdjacencies is not None:
+            return list(inAdjacencies.get(vertex, {}).keys())
 
         lst = []
         for (v1, adj) in self.adjacencies.items():
@@ -352,14 +607,8 @@ class DictGraph(AbstractSingleGraph):
         Find the out degree sequence. Return the sequence as a vector along with
         the corresponding vertices in a list.
         """
-        vertexList = [] 
-        degSeq = numpy.zeros(self.getNumVertices(), numpy.int)
-
-        vertexIds = self.getAllVertexIds()
-        for i in range(len(vertexIds)):
-            vertex = vertexIds[i]
-            degSeq[i] = len(self.adjacencies[vertex])
-            vertexList.append(vertex)
+        vertexList = self.getAllVertexIds()
+        degSeq = numpy.array([len(self.adjacencies[vertex]) for vertex in vertexList], numpy.int)
 
         return degSeq, vertexList
             
@@ -368,16 +617,16 @@ class DictGraph(AbstractSingleGraph):
         Find the in degree sequence. Return the sequence as a vector along with
         the corresponding vertices in a list.
         """
-        vertexList = []
-        degSeq = numpy.zeros(self.getNumVertices(), numpy.int)
+        vertexList = self.getAllVertexIds()
+        inAdjacencies = self._getInAdjacencies()
 
-        vertexIds = self.getAllVertexIds()
-        for i in range(len(vertexIds)):
-            vertex = vertexIds[i]
-            for vertex2 in self.adjacencies[vertex].items():
-                degSeq[vertexIds.index(vertex2[0])] += 1
-                
-            vertexList.append(vertex)
+        if inAdjacencies is not None:
+            degSeq = numpy.array([len(inAdjacencies.get(vertex, {})) for vertex in vertexList], numpy.int)
+            return degSeq, vertexList
+
+        vertexIndices = dict((vertex, i) for i, vertex in enumerate(vertexList))
+        inVertices = [vertexIndices[vertex2] for vertex in vertexList for vertex2 in self.adjacencies[vertex]]
+        degSeq = numpy.bincount(numpy.array(inVertices, numpy.int), minlength=len(vertexList)).astype(numpy.int)
 
         return degSeq, vertexList
 
@@ -402,17 +651,38 @@ class DictGraph(AbstractSingleGraph):
         
         :param vertexId: The id of the vertex to remove. 
         """
+        edgeCounts = self.__currentEdgeCounts()
+        if edgeCounts is not None:
+            edgeCounts[0] -= len(self.adjacencies[vertexId])
+            edgeCounts[1] -= vertexId in self.adjacencies[vertexId]
+
         neighbours = self.neighbours(vertexId)
+        inAdjacencies = self._getInAdjacencies()
         del self.adjacencies[vertexId]
         del self.vertices[vertexId]
 
         if self.undirected:
             for vertexId2 in neighbours: 
-                del self.adjacencies[vertexId2][vertexId]
+                if vertexId2 != vertexId:
+                    del self.adjacencies[vertexId2][vertexId]
+                    if edgeCounts is not None:
+                        edgeCounts[0] -= 1
+        elif inAdjacencies is not None: 
+            for vertexId2 in inAdjacencies.pop(vertexId, {}): 
+                if vertexId2 != vertexId:
+                    del self.adjacencies[vertexId2][vertexId]
+                    if edgeCounts is not None:
+                        edgeCounts[0] -= 1
+
+            for vertexId2 in neighbours: 
+                if vertexId2 != vertexId:
+                    del inAdjacencies[vertexId2][vertexId]
         else: 
             for vertexId2 in self.getAllVertexIds(): 
                 if vertexId in self.adjacencies[vertexId2]: 
                     del self.adjacencies[vertexId2][vertexId]
+                    if edgeCounts is not None:
+                        edgeCounts[0] -= 1
 
     def toSparseGraph(self): 
         """
@@ -445,24 +715,22 @@ class DictGraph(AbstractSingleGraph):
         if not self.isUndirected():
             raise ValueError("degreeSequence is only for undirected graphs")
 
-        degSequence = self.outDegreeSequence()[0]
-
-        #A very slow method of adding diagonal entries
-        for j, i in enumerate(self.getAllVertexIds()):
-            if self.getEdge(i, i) != None:
-                degSequence[j] += 1
+        degSequence, vertexList = self.outDegreeSequence()
+        degSequence += numpy.array([vertex in self.adjacencies[vertex] for vertex in vertexList], numpy.int)
 
         return degSequence 
 
+    def diagonal(self):
+        """
+        :returns: a vector of the values of the self edges of each vertex, in the order given by getAllVertexIds, which is zero for vertices without a self edge. 
+        """
+        return numpy.array([self.adjacencies[vertex].get(vertex, 0) for vertex in self.getAllVertexIds()])
+
     def getNumDirEdges(self):
         """
         :returns: the number of edges, taking this graph as a directed graph.
         """
-        i = 0 
-        for v in self.adjacencies.keys(): 
-            i += len(self.adjacencies[v])
-        
-        return i
+        return self._getEdgeCounts()[0]
 
     def dijkstrasAlgorithm(self, vertexId, neighbourLists=None):
         """
@@ -471,68 +739,125 @@ class DictGraph(AbstractSingleGraph):
 
         :param vertexId: the index of the source vertex.
 
+        :param neighbourLists: an optional adjacency list as returned by adjacencyList.
+
         :returns: An array whose ith element is the distance to vertex i. 
         """
+        X = None
+
         if neighbourLists!=None:
             neighbourIndices, neighbourWeights = neighbourLists
 
             if len(neighbourIndices) != self.getNumVertices() or len(neighbourWeights) != self.getNumVertices():
                 raise ValueError("Adjacency lists must be of same size as graph")
+
+            rows = numpy.repeat(numpy.arange(self.size), [len(neighbours) for neighbours in neighbourIndices])
+            cols = numpy.array([j for neighbours in neighbourIndices for j in neighbours], numpy.int)
+            weights = numpy.array([w for weights in neighbourWeights for w in weights], numpy.float)
+            X = scipy.sparse.csr_matrix((weights, (rows, cols)), shape=(self.size, self.size))
+
+        return self.shortestPathDistances([vertexId], X=X)
+
+    def adjacencyCsr(self, useWeights=True):
+        """
+        Returns a snapshot of the edges of this graph as a scipy.sparse.csr_matrix 
+        X for the shortest path methods, in which the indices correspond to the
+        keys returned by getAllVertexIds. Edges with zero value are stored 
+        explicitly, and non-numeric edge values have weight 1. The snapshot can 
+        be reused between queries provided the graph is not modified. 
+
+        :param useWeights: If false then all edges have weight 1.
+        :type useWeights: :class:`bool`
+
+        :returns: A csr matrix of edge weights with sorted indices.
+        """
+        rows, cols, weights = self.__weightArrays()
+        if not useWeights:
+            weights = numpy.ones(weights.shape[0])
+
+        X = scipy.sparse.csr_matrix((weights, (rows, cols)), shape=(self.size, self.size))
+        X.sort_indices()
+        return X
+
+    def shortestPathDistances(self, vertexIds, targetId=None, radius=None, useWeights=True, X=None):
+        """
+        Find the shortest path distances from a set of source vertices to every
+        vertex, in which the distance is to the nearest source. The search 
+        can be bounded so that it stops once the target vertex is reached, or
+        only finds the vertices within a given radius of the sources. The 
+        unbounded searches are run in scipy.sparse.csgraph over an integer 
+        snapshot of the graph given by adjacencyCsr. 
+
+        :param vertexIds: A list of the ids of the source vertices.
+
+        :param targetId: The id of a vertex at which to stop the search, or None.
+
+        :param radius: The maximum distance from the sources to search, or None.
+        :type radius: :class:`float`
+
+        :param useWeights: If false then all edges have weight 1.
+        :type useWeights: :class:`bool`
+
+        :param X: A snapshot of the graph from adjacencyCsr to reuse, or None.
+        :type X: :class:`scipy.sparse.csr_matrix`
+
+        :returns: An array whose ith element is the distance to the ith vertex of getAllVertexIds, which is inf for vertices which are not reached. 
+        """
+        if X is None:
+            X = self.adjacencyCsr(useWeights)
+        elif X.shape != (self.size, self.size):
+            raise ValueError("Adjacency matrix must be of same size as graph")
+        if radius is None:
+            radius = numpy.inf
+        elif radius < 0:
+            raise ValueError("Radius must be non-negative: " + str(radius))
+
+        vertexInds = dict((vertexId, i) for i, vertexId in enumerate(self.vertices))
+        for vertexId in list(vertexIds) + ([targetId] if targetId is not None else []):
+            if vertexId not in vertexInds:
+                raise ValueError("Vertex is not present in graph: " + str(vertexId))
+
+        sources = numpy.unique(numpy.array([vertexInds[vertexId] for vertexId in vertexIds], numpy.int))
+
+        if sources.shape[0] == 0:
+            return numpy.ones(self.size)*numpy.inf
+        elif targetId is None:
+            return scipy.sparse.csgraph.dijkstra(X, indices=sources, min_only=True, limit=radius)
         else:
-            neighbourIndices, neighbourWeights = self.adjacencyList()
+            return DictGraph.__boundedDijkstra(X, sources, vertexInds[targetId], radius)
 
-        
-        vertexIds = self.getAllVertexIds()        
-        
-        previous = numpy.zeros(self.size)
-        #This is an array of distances so far with first col as distance, and 2nd cols 
-        distance = numpy.ones((self.size, 2))*numpy.inf
-        distance[vertexIds.index(vertexId), 0] = 0
-        distance[:, 1] = numpy.arange(self.size)
-        distance = distance.tolist()
-        heapq.heapify(distance)
-
-        #Dictionary of the tuples indexed by the vertex index returned at the end 
-        distanceDict = {}
-        for i in distance:
-            distanceDict[i[1]] = i
-        INVALID = -1
-        
-        #distanceArray is distance for each vertex 
-        distanceArray = numpy.ones(self.size)*numpy.inf
-        notVisited = numpy.ones(self.size, numpy.bool)
-
-        while len(distanceDict) != 0:
-            minVertexIndex = INVALID
-            while minVertexIndex == INVALID:
-                (minVertexDistance, minVertexIndex) = heapq.heappop(distance)
-
-            distanceArray[minVertexIndex] = minVertexDistance
-            del(distanceDict[minVertexIndex])
-            notVisited[minVertexIndex] = False 
-            if  minVertexDistance == numpy.inf:
-                break
+    @staticmethod
+    def __boundedDijkstra(X, sources, target, radius):
+        """
+        Run Dijkstras algorithm on the csr matrix X from the source indices 
+        until the target index is reached, only relaxing paths of length at 
+        most radius. Returns the distances of the vertices found before the 
+        target, and inf for the rest. 
+        """
+        distances = numpy.ones(X.shape[0])*numpy.inf
+        distances[sources] = 0
+        settled = numpy.zeros(X.shape[0], numpy.bool)
+        heap = [(0.0, int(i)) for i in sources]
 
-            minVertexIndex = int(minVertexIndex)
-            cols = numpy.array(neighbourIndices[minVertexIndex])
-            weights = numpy.array(neighbourWeights[minVertexIndex])
-            #updateDistances(cols, weights, minVertexDistance, distanceDict, previous, distanceArray)
-            
-            #If no neighbours then move onto next vertex 
-            if cols.size == 0: 
-                break 
+        while len(heap) != 0:
+            distance, i = heapq.heappop(heap)
+            if settled[i]:
+                continue
 
-            newDistances = weights + minVertexDistance
-            isBetter = numpy.logical_and(newDistances < distanceArray[cols], notVisited[cols])
+            settled[i] = True
+            if i == target:
+                break
+
+            cols = X.indices[X.indptr[i]:X.indptr[i+1]]
+            newDistances = distance + X.data[X.indptr[i]:X.indptr[i+1]]
+            isBetter = numpy.logical_and(newDistances < distances[cols], newDistances <= radius)
+            distances[cols[isBetter]] = newDistances[isBetter]
 
-            for i in range(cols[isBetter].shape[0]):
-                j = cols[isBetter][i]
-                distanceDict[j][1] = INVALID
-                distanceDict[j] = [newDistances[isBetter][i], j]
-                heapq.heappush(distance, distanceDict[j])
-                distanceArray[j] = newDistances[isBetter][i]
+            for item in zip(newDistances[isBetter].tolist(), cols[isBetter].tolist()):
+                heapq.heappush(heap, item)
 
-        return distanceArray
+        distances[numpy.logical_not(settled)] = numpy.inf
+        return distances
 
     def adjacencyList(self):
         """
@@ -547,9 +872,10 @@ class DictGraph(AbstractSingleGraph):
         neighbourIndices = []
         neighbourWeights = []
         vertexIds = self.getAllVertexIds()
+        vertexInds = dict((vertexId, i) for i, vertexId in enumerate(vertexIds))
         
         for i in vertexIds:
-            neighbours = list(map(vertexIds.index, self.adjacencies[i].keys()))
+            neighbours = [vertexInds[j] for j in self.adjacencies[i].keys()]
             neighbourIndices.append(neighbours)
             neighbourWeights.append(list(self.adjacencies[i].values()))
 
@@ -557,53 +883,27 @@ class DictGraph(AbstractSingleGraph):
 
     def findAllDistances(self, useWeights=True):
         """
-        Use the repeated calls to Dijkstra'  algorithm to find the shortest path 
-        between all pairs of vertices. Note that the shortest path of a vertex 
-        to itself is always zero. Returns a matrix whose ij th entry is the
-        shortest path between vertices i and j.
-
-        :returns:  A matrix of shortest paths between all vertices.
-        """
-        neighbourLists = self.adjacencyList()
-        P = numpy.zeros((self.size, self.size))
+        Find the shortest path between all pairs of vertices using Dijkstras 
+        algorithm from each vertex, over a single snapshot of the graph. Note 
+        that the shortest path of a vertex to itself is always zero. Returns a 
+        matrix whose ij th entry is the shortest path between vertices i and j.
 
-        for i, vertexId in enumerate(self.getAllVertexIds()):
-            P[i, :] = self.dijkstrasAlgorithm(vertexId, neighbourLists)
+        :param useWeights: If false then all edges have weight 1.
+        :type useWeights: :class:`bool`
 
-        return P 
-
-    def toIGraph(self):
-        """
-        Convert this graph into a igraph Graph object, which requires igraph to be
-        installed. Edge values are stored under the "value" index. Vertices
-        are stored as indices with a "label" value being the corresponding vertex value.
-
-        :returns:  An igraph Graph object.
+        :returns:  A matrix of shortest paths between all vertices.
         """
-        try:
-            import igraph
-        except ImportError:
-            raise ImportError("toIGraph() requires igraph")
-
-        newGraph = igraph.Graph(self.getNumVertices(), directed= not self.isUndirected())
-
-        #Add all vertices 
-        newGraph.vs["label"] = self.getVertices(self.getAllVertexIds())
-
-        vertices = self.getAllVertexIds()
-        allEdges = self.getAllEdges()
-        
-
-        for i in range(len(allEdges)):
-            vertexId1 = vertices.index(allEdges[i][0])
-            vertexId2 = vertices.index(allEdges[i][1])            
-            
-            newGraph.add_edge(vertexId1, vertexId2)
-            newGraph.es[i]["value"] = self.getEdge(allEdges[i][0], allEdges[i][1])
+        if self.size == 0:
+            return numpy.zeros((0, 0))
 
-        return newGraph
+        return scipy.sparse.csgraph.dijkstra(self.adjacencyCsr(useWeights))
 
     vertices = None 
     adjacencies = None 
     undirected = None
+    reverseIndex = True
+    _edgeCounts = None
+    _edgeCountsAdj = None
+    _inAdjacencies = None
+    _inAdjacenciesAdj = None
     size = property(getNumVertices, doc="The number of vertices in the graph")
\ No newline at end of file
@@ -371,4 +371,5 @@ class DictTree(DictGraph):
         for vertex1, vertex2 in deleteIdList:         
             del subtree.adjacencies[vertex1][vertex2]
            
+        subtree._clearEdgeCounts()
         return subtree 
@@ -39,7 +39,7 @@ class GeneralVertexList(AbstractVertexList):
 
         :returns: A set of vertices corresponding to the input indices. 
         """
-        if vertexIndices != None:
+        if vertexIndices is not None:
             Parameter.checkList(vertexIndices, Parameter.checkIndex, (0, len(self.V)))
         else:
             vertexIndices = range(len(self.V))
@@ -74,14 +74,14 @@ class GeneralVertexList(AbstractVertexList):
         :param indices: a list of indices of the same length as vertices or None for all indices in this object.
         :type indices: :class:`list`
         """
-        if indices!=None:
+        if indices is not None:
             Parameter.checkList(indices, Parameter.checkIndex, [0, len(self.V)])
             if len(vertices) != len(indices):
                 raise ValueError("Length of indices list must be same as that of vertices list")
-        if indices==None and len(vertices) != len(self.V):
+        if indices is None and len(vertices) != len(self.V):
             raise ValueError("Incorrect number of vertices " + str(len(vertices)) + ", expecting " + str(len(self.V)))
 
-        if indices == None:
+        if indices is None:
             for i in range(len(vertices)):
                 self.V[i] = vertices[i]
         else:
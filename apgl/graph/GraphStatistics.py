@@ -109,7 +109,11 @@ class GraphStatistics(object):
             
             #logging.debug("Studying max component")
             if len(subComponents) != 0:
-                maxCompGraph = graph.subgraph(list(subComponents[0]))
+                #Only edge counts and degrees are needed so avoid copying the component 
+                if isinstance(graph, AbstractMatrixGraph): 
+                    maxCompGraph = graph.subgraphView(subComponents[0])
+                else: 
+                    maxCompGraph = graph.subgraph(list(subComponents[0]))
                 statsArray[self.maxComponentSizeIndex] = len(subComponents[0])
 
                 if len(subComponents) >= 2:
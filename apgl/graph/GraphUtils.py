@@ -5,6 +5,7 @@ Some methods which are useful but didn't quite fit into the graph classes.
 import logging 
 import numpy
 import scipy.sparse 
+from apgl.util.SparseUtils import SparseUtils
 
 class GraphUtils(object):
     def __init__(self):
@@ -92,31 +93,166 @@ class GraphUtils(object):
         return numpy.max(distances[distances!=float('inf')])
 
 
+    @staticmethod 
+    def breadthFirstArrays(X, roots, maxDepth=None, visited=None, parents=None, depths=None):
+        """
+        Breadth first search over the graph whose edges are the stored entries of 
+        the csr matrix X, so that an edge from i to j corresponds to an entry X[i, j]. 
+        The search starts from all roots simultaneously and expands one level 
+        of the search at a time using a single pass over the rows of the current
+        frontier. Neighbours are visited in the order they are stored in X. 
+        
+        The arrays visited, parents and depths can be passed in to share state 
+        between several searches, in which case they are updated in place and 
+        vertices already marked as visited are not entered. 
+
+        :param X: a csr matrix without explicit zeros. 
+        
+        :param roots: an array of root vertex indices. 
+        :type roots: :class:`numpy.ndarray`
+        
+        :param maxDepth: the maximum depth of the search or None for no limit. 
+        :type maxDepth: :class:`int`
+        
+        :param visited: an optional boolean array of visited vertices. 
+        
+        :param parents: an optional array of parent vertices of length X.shape[0]. 
+        
+        :param depths: an optional array of vertex depths of length X.shape[0]. 
+        
+        :returns: A tuple (order, parents, depths) in which order is the array of vertices in the order they were visited. Unvisited vertices have parent and depth -1, and roots have parent -1.  
+        """
+        roots, visited, parents, depths = GraphUtils.__initSearch(X, roots, visited, parents, depths)
+        
+        order = [roots]
+        frontier = roots 
+        depth = 0 
+        
+        while frontier.shape[0] != 0 and (maxDepth is None or depth < maxDepth): 
+            rows, cols = SparseUtils.rowEntries(X, frontier)[0:2]
+            unvisited = numpy.logical_not(visited[cols])
+            rows, cols = rows[unvisited], cols[unvisited]
+            
+            #Keep the first occurrence of each new vertex, in frontier order 
+            cols, firstInds = numpy.unique(cols, return_index=True)
+            perm = numpy.argsort(firstInds)
+            cols, firstInds = cols[perm], firstInds[perm]
+            
+            depth += 1
+            visited[cols] = True 
+            parents[cols] = frontier[rows[firstInds]]
+            depths[cols] = depth 
+            order.append(cols)
+            frontier = cols 
+        
+        return numpy.concatenate(order), parents, depths 
+
+    @staticmethod 
+    def depthFirstArrays(X, roots, maxDepth=None, visited=None, parents=None, depths=None):
+        """
+        Depth first search over the graph whose edges are the stored entries of 
+        the csr matrix X, using an index stack of vertices and positions in 
+        X.indices. The roots are searched in turn, and each one that has not
+        already been visited starts a new search tree. Neighbours are visited 
+        in the order they are stored in X. With a depth limit, a vertex first 
+        reached via a long path is not expanded further even if there is a 
+        shorter path to it. The optional arrays are as in breadthFirstArrays. 
+
+        :param X: a csr matrix without explicit zeros. 
+        
+        :param roots: an array of root vertex indices. 
+        :type roots: :class:`numpy.ndarray`
+        
+        :param maxDepth: the maximum depth of the search or None for no limit. 
+        :type maxDepth: :class:`int`
+        
+        :returns: A tuple (order, parents, depths) as in breadthFirstArrays.  
+        """
+        roots, visited, parents, depths = GraphUtils.__initSearch(X, roots, visited, parents, depths)
+        visited[roots] = False 
+        
+        indptr = X.indptr 
+        indices = X.indices 
+        order = []
+        
+        for root in roots: 
+            if visited[root]: 
+                continue 
+            
+            visited[root] = True 
+            order.append(root)
+            stack = [root]
+            positions = [indptr[root]]
+            
+            while len(stack) != 0: 
+                vertex = stack[-1]
+                position = positions[-1]
+                end = indptr[vertex+1]
+                
+                if maxDepth is not None and len(stack) > maxDepth: 
+                    position = end 
+                
+                while position < end and visited[indices[position]]: 
+                    position += 1 
+                    
+                if position == end: 
+                    stack.pop()
+                    positions.pop()
+                else: 
+                    child = indices[position]
+                    positions[-1] = position+1
+                    visited[child] = True 
+                    parents[child] = vertex 
+                    depths[child] = len(stack)
+                    order.append(child)
+                    stack.append(child)
+                    positions.append(indptr[child])
+        
+        return numpy.array(order, numpy.int64), parents, depths 
+        
+    @staticmethod 
+    def __initSearch(X, roots, visited, parents, depths): 
+        """
+        Set up the arrays used for a search from the given roots, removing 
+        duplicate roots and those already visited. 
+        """
+        numVertices = X.shape[0]
+        
+        if visited is None: 
+            visited = numpy.zeros(numVertices, numpy.bool)
+        if parents is None: 
+            parents = numpy.ones(numVertices, numpy.int64)*-1
+        if depths is None: 
+            depths = numpy.ones(numVertices, numpy.int64)*-1
+        
+        roots = numpy.atleast_1d(numpy.asarray(roots, numpy.int64))
+        roots = roots[numpy.logical_not(visited[roots])]
+        firstInds = numpy.sort(numpy.unique(roots, return_index=True)[1])
+        roots = roots[firstInds]
+        
+        visited[roots] = True 
+        parents[roots] = -1
+        depths[roots] = 0 
+        
+        return roots, visited, parents, depths 
+
     @staticmethod
     def modularity(W, clustering):
         """
         Give a symmetric weight matrix W and a clustering array "clustering", compute the
         modularity of Newman and Girvan. The input matrix W can be either an
-        ndarray or a scipy.sparse matrix.
+        ndarray or a scipy.sparse matrix. The weights within each cluster are 
+        aggregated in a single product C^T W C where C is the cluster indicator 
+        matrix, which takes O(m) time for a sparse W with m non-zero entries. 
         """
-        numVertices = W.shape[0]        
-        clusterIds = numpy.unique(clustering)
-
-        if type(W) == numpy.ndarray:
-            degSequence = numpy.sum(W, 0)
-        else:
-            degSequence = numpy.array(W.sum(0)).ravel()
-
+        C = GraphUtils.__indicatorMatrix(clustering)
+        degSequence = GraphUtils.__sums(W, 0)
         numEdges = numpy.sum(degSequence)/2.0
-        Q = 0
-
-        for i in clusterIds:
-            inds = numpy.arange(numVertices)[i==clustering]
-            subW = W[inds, :][:, inds]
 
-            Q += subW.sum()
-            Q -= degSequence[inds].sum()**2/(2.0*numEdges)
+        clusterWeights = GraphUtils.__clusterWeights(W, C)
+        clusterDegrees = C.T.dot(degSequence)
 
+        Q = numpy.sum(clusterWeights - clusterDegrees**2/(2.0*numEdges))
         Q = Q/(2*numEdges)
         return Q 
 
@@ -125,22 +261,50 @@ class GraphUtils(object):
     def kwayNormalisedCut(W, clustering):
         """
         Do k-way normalised cut. Each cluster should have at least 1 edge. The input
-        matrix W can be either an ndarray or a scipy.sparse matrix.
-        """
-        numVertices = W.shape[0]
-        clusterIds = numpy.unique(clustering)
-
-        Q = 0 
-        for i in clusterIds:
-            inds = numpy.arange(numVertices)[i==clustering]
-            invInds = numpy.arange(numVertices)[i!=clustering]
-            numClustEdges = float((W[inds, :]).sum())
-            if (len(invInds) != 0) and (numClustEdges != 0): 
-                Q += (W[inds, :][:, invInds]).sum()/numClustEdges
+        matrix W can be either an ndarray or a scipy.sparse matrix. The cut of
+        each cluster is found from the product C^T W C where C is the cluster 
+        indicator matrix. 
+        """
+        C = GraphUtils.__indicatorMatrix(clustering)
+        clusterSizes = numpy.array(C.sum(0)).ravel()
+        clusterVolumes = C.T.dot(GraphUtils.__sums(W, 1))
+        clusterCuts = clusterVolumes - GraphUtils.__clusterWeights(W, C)
+
+        valid = numpy.logical_and(clusterSizes != W.shape[0], clusterVolumes != 0)
+        Q = numpy.sum(clusterCuts[valid]/clusterVolumes[valid])
             
-        Q = Q/clusterIds.shape[0]
+        Q = Q/C.shape[1]
         return Q 
 
+    @staticmethod
+    def __indicatorMatrix(clustering):
+        """
+        Return the sparse n x k indicator matrix C of a clustering of n vertices
+        into k clusters, such that C[i, j] = 1 if vertex i is in the jth cluster
+        in the order of numpy.unique(clustering). 
+        """
+        inverse = numpy.unique(clustering, return_inverse=True)[1]
+        numVertices = inverse.shape[0]
+        indptr = numpy.arange(numVertices+1)
+        return scipy.sparse.csr_matrix((numpy.ones(numVertices), inverse, indptr), shape=(numVertices, numpy.max(inverse)+1))
+
+    @staticmethod
+    def __sums(W, axis):
+        if type(W) == numpy.ndarray:
+            return numpy.sum(W, axis)
+        else:
+            return numpy.array(W.sum(axis)).ravel()
+
+    @staticmethod
+    def __clusterWeights(W, C):
+        """
+        Return the total weight of the edges within each cluster, i.e. the 
+        diagonal of C^T W C. 
+        """
+        if type(W) == numpy.ndarray:
+            return numpy.array(C.T.dot(C.T.dot(W).T)).diagonal()
+        else:
+            return (C.T.dot(scipy.sparse.csr_matrix(W)).dot(C)).diagonal()
 
     @staticmethod 
     def shiftLaplacian(W):
@@ -225,18 +389,84 @@ class GraphUtils(object):
         
         return B 
     
+    @staticmethod
+    def contingencyTable(clustering1, clustering2):
+        """
+        Compute the contingency table of 2 clusterings of the same vertices, in 
+        which the (i, j)th entry is the number of vertices in the ith cluster of
+        clustering1 and the jth cluster of clustering2. Clusters are ordered as 
+        in numpy.unique. 
+
+        :returns: A scipy.sparse.csr_matrix of counts.
+        """
+        if clustering1.shape[0] != clustering2.shape[0]:
+            raise ValueError("Clusterings must be of the same length")
+
+        inverse1 = numpy.unique(clustering1, return_inverse=True)[1]
+        inverse2 = numpy.unique(clustering2, return_inverse=True)[1]
+        shape = (numpy.max(inverse1)+1, numpy.max(inverse2)+1) if inverse1.shape[0] != 0 else (0, 0)
+        
+        counts = scipy.sparse.coo_matrix((numpy.ones(inverse1.shape[0], numpy.int), (inverse1, inverse2)), shape=shape)
+        return counts.tocsr()
+
     @staticmethod
     def randIndex(clustering1, clustering2):
         """
-        Compute the rand index for 2 clusterings given in arrays v1 and v2.
+        Compute the rand index for 2 clusterings given in arrays v1 and v2. The
+        value returned is the fraction of pairs of vertices on which the 
+        clusterings disagree, i.e. 1 minus the Rand index, and it is computed 
+        from the contingency table in O(n log n) time. 
         """
         numVertices = clustering1.shape[0]
-        error = 0        
-        
-        for i in range(numVertices):
-            same_cl = clustering1[i] == clustering1
-            same_learned_cl = clustering2[i] == clustering2
-            error += (same_cl != same_learned_cl).sum()
+        N = GraphUtils.contingencyTable(clustering1, clustering2)
+        sumSquares1 = numpy.sum(numpy.array(N.sum(1), numpy.float)**2)
+        sumSquares2 = numpy.sum(numpy.array(N.sum(0), numpy.float)**2)
+        sumSquares = numpy.sum(numpy.array(N.data, numpy.float)**2)
+
+        error = sumSquares1 + sumSquares2 - 2*sumSquares
         
         return float(error)/(numVertices*(numVertices-1))
-        
\ No newline at end of file
+
+    @staticmethod
+    def adjustedRandIndex(clustering1, clustering2):
+        """
+        Compute the adjusted Rand index of Hubert and Arabie for 2 clusterings, 
+        which is 1 for identical clusterings and 0 in expectation for random 
+        ones. It is computed from the contingency table. 
+        """
+        N = GraphUtils.contingencyTable(clustering1, clustering2)
+        comb2 = lambda x: numpy.sum(x*(x-1)/2.0)
+
+        index = comb2(numpy.array(N.data, numpy.float))
+        sumRows = comb2(numpy.array(N.sum(1), numpy.float))
+        sumCols = comb2(numpy.array(N.sum(0), numpy.float))
+        expectedIndex = sumRows*sumCols/comb2(numpy.array([clustering1.shape[0]], numpy.float)) if clustering1.shape[0] > 1 else 0
+        maxIndex = (sumRows + sumCols)/2
+
+        if maxIndex == expectedIndex: 
+            return 1.0
+        
+        return (index - expectedIndex)/(maxIndex - expectedIndex)
+
+    @staticmethod
+    def normalisedMutualInformation(clustering1, clustering2):
+        """
+        Compute the normalised mutual information 2I(X, Y)/(H(X) + H(Y)) of 2 
+        clusterings X and Y from the contingency table, where I is the mutual 
+        information and H is the entropy. If both clusterings consist of a 
+        single cluster then 1 is returned. 
+        """
+        numVertices = float(clustering1.shape[0])
+        N = GraphUtils.contingencyTable(clustering1, clustering2).tocoo()
+        p1 = numpy.array(N.sum(1)).ravel()/numVertices
+        p2 = numpy.array(N.sum(0)).ravel()/numVertices
+        p = N.data/numVertices
+
+        entropy1 = -numpy.sum(p1*numpy.log(p1))
+        entropy2 = -numpy.sum(p2*numpy.log(p2))
+        mutualInformation = numpy.sum(p*numpy.log(p/(p1[N.row]*p2[N.col])))
+
+        if entropy1 + entropy2 == 0: 
+            return 1.0 
+
+        return 2*mutualInformation/(entropy1 + entropy2)
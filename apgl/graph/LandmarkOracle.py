@@ -0,0 +1,434 @@
+import multiprocessing
+import numpy
+import scipy.sparse.csgraph
+import apgl
+from apgl.graph.PathFinder import PathFinder
+from apgl.util.Parameter import Parameter
+
+
+def _landmarkDistances(args):
+    """
+    Compute the distances from a block of landmarks to every vertex. This is a
+    module level function so that it can be used with a process pool.
+    """
+    X, landmarks = args
+    return scipy.sparse.csgraph.dijkstra(X, indices=landmarks)
+
+
+class LandmarkOracle(object):
+    """
+    An approximate distance oracle built from single source searches from a
+    small set of landmark vertices. For each landmark L the distances d(L, v)
+    from L and d(v, L) to L are stored in a table of size the number of
+    landmarks times the number of vertices, and by the triangle inequality the
+    distance from u to v is bounded by
+
+    max_L max(d(L, v) - d(L, u), d(u, L) - d(v, L)) <= d(u, v) <= min_L d(u, L) + d(L, v)
+
+    so that each query takes O(k) time for k landmarks. The bounds are exact
+    when a landmark lies on a shortest path (for the upper bound) or beyond
+    one of the vertices on a shortest path (for the lower bound), hence
+    landmarks on the periphery of the graph work best. Integral distances, e.g.
+    hop counts, are stored as int16 if they fit and otherwise as int32, and
+    other distances as float64. Undirected graphs only store one table. The
+    bounds on non-integral distances are widened by a relative tolerance of
+    the number of vertices times the machine epsilon, which covers the
+    rounding of the distances along a path.
+    """
+    def __init__(self, landmarks, fromDistances, toDistances=None):
+        """
+        Create an oracle from a precomputed table of landmark distances, in
+        which the ith row of fromDistances is the distance from the ith landmark
+        to each vertex and the ith row of toDistances is the distance from each
+        vertex to the ith landmark, with numpy.inf for vertices which are not
+        connected. For undirected graphs toDistances is None. Use fromGraph to
+        compute the distances for a graph.
+
+        :param landmarks: an array of the indices of the landmark vertices.
+        :type landmarks: :class:`numpy.ndarray`
+
+        :param fromDistances: A matrix of distances from the landmarks of size numLandmarks x numVertices.
+        :type fromDistances: :class:`numpy.ndarray`
+
+        :param toDistances: A matrix of distances to the landmarks of size numLandmarks x numVertices, or None.
+        :type toDistances: :class:`numpy.ndarray`
+        """
+        landmarks = numpy.asarray(landmarks, numpy.int)
+        fromDistances = numpy.asarray(fromDistances)
+
+        if fromDistances.ndim != 2 or fromDistances.shape[0] != landmarks.shape[0]:
+            raise ValueError("Landmark distances must have a row per landmark: " + str(fromDistances.shape))
+        Parameter.checkIndexArray(landmarks, 0, fromDistances.shape[1])
+        if toDistances is not None and numpy.asarray(toDistances).shape != fromDistances.shape:
+            raise ValueError("Landmark distance matrices must have the same shape")
+
+        self.landmarks = landmarks
+        self.undirected = toDistances is None
+        self.fromTable = LandmarkOracle.__compact(fromDistances)
+
+        if self.undirected:
+            self.toTable = self.fromTable
+        else:
+            self.toTable = LandmarkOracle.__compact(numpy.asarray(toDistances))
+
+    @staticmethod
+    def fromGraph(graph, numLandmarks=16, landmarks=None, useWeights=True, numProcesses=1):
+        """
+        Build an oracle for a matrix graph with non-negative edge weights. If
+        landmarks is None then numLandmarks landmarks are chosen by farthest
+        first selection: each landmark is the vertex furthest from the
+        landmarks chosen so far, except that a (weakly) connected component
+        without a landmark and with at least numVertices/numLandmarks vertices
+        gets one first, starting with the largest, at the furthest vertex from
+        its vertex of highest degree. Pairs of vertices in components without a
+        landmark have the trivial bounds 0 and numpy.inf. The selection needs
+        the searches of the earlier landmarks and is sequential, however when
+        the landmarks are given, and for the distances to the landmarks of a
+        directed graph, the searches are divided between numProcesses
+        processes.
+
+        :param graph: the graph to query.
+        :type graph: :class:`apgl.graph.AbstractMatrixGraph`
+
+        :param numLandmarks: The number of landmarks to choose, used if landmarks is None.
+        :type numLandmarks: :class:`int`
+
+        :param landmarks: an array of the indices of the landmark vertices, or None.
+        :type landmarks: :class:`numpy.ndarray`
+
+        :param useWeights: If false then all edges have weight 1 and the distances are hop counts.
+        :type useWeights: :class:`bool`
+
+        :param numProcesses: the number of processes to use, or None for the number of CPUs.
+        :type numProcesses: :class:`int`
+
+        :returns: A LandmarkOracle for the graph.
+        """
+        if numProcesses is None:
+            numProcesses = multiprocessing.cpu_count()
+        Parameter.checkInt(numProcesses, 1, float('inf'))
+
+        X = PathFinder.weightMatrix(graph, useWeights)
+        numVertices = X.shape[0]
+
+        if landmarks is None:
+            Parameter.checkInt(numLandmarks, 0, numVertices)
+            landmarks, fromDistances = LandmarkOracle.__selectLandmarks(X, numLandmarks)
+        else:
+            landmarks = numpy.asarray(landmarks, numpy.int)
+            Parameter.checkIndexArray(landmarks, 0, numVertices)
+            fromDistances = LandmarkOracle.__searches(X, landmarks, numProcesses)
+
+        if graph.isUndirected():
+            toDistances = None
+        else:
+            toDistances = LandmarkOracle.__searches(X.T.tocsr(), landmarks, numProcesses)
+
+        return LandmarkOracle(landmarks, fromDistances, toDistances)
+
+    @staticmethod
+    def __selectLandmarks(X, numLandmarks):
+        """
+        Choose landmarks by farthest first selection and return them with their
+        distances to each vertex.
+        """
+        numVertices = X.shape[0]
+        landmarks = numpy.zeros(numLandmarks, numpy.int)
+        fromDistances = numpy.zeros((numLandmarks, numVertices))
+
+        if numLandmarks == 0:
+            return landmarks, fromDistances
+
+        numComponents, labels = scipy.sparse.csgraph.connected_components(X, connection="weak")
+        componentSizes = numpy.bincount(labels)
+        degrees = numpy.diff(X.indptr)
+        minDistances = numpy.ones(numVertices)*numpy.inf
+
+        for i in range(numLandmarks):
+            #Vertices which are not reached by any landmark or are landmarks score -1
+            scores = numpy.array(minDistances)
+            scores[numpy.logical_not(numpy.isfinite(scores))] = -1
+            scores[landmarks[0:i]] = -1
+
+            uncoveredSizes = numpy.array(componentSizes)
+            uncoveredSizes[labels[landmarks[0:i]]] = 0
+            component = numpy.argmax(uncoveredSizes)
+
+            if uncoveredSizes[component]*numLandmarks >= numVertices or (numpy.max(scores) <= 0 and uncoveredSizes[component] != 0):
+                #Start from the periphery of the component at its highest degree vertex
+                vertex = numpy.argmax(numpy.where(labels == component, degrees, -1))
+                distances = scipy.sparse.csgraph.dijkstra(X, indices=vertex)
+                distances[numpy.logical_not(numpy.isfinite(distances))] = -1
+                landmark = numpy.argmax(distances)
+            elif numpy.max(scores) > 0:
+                landmark = numpy.argmax(scores)
+            else:
+                landmark = numpy.setdiff1d(numpy.arange(numVertices), landmarks[0:i])[0]
+
+            landmarks[i] = landmark
+            fromDistances[i, :] = scipy.sparse.csgraph.dijkstra(X, indices=landmark)
+            minDistances = numpy.minimum(minDistances, fromDistances[i, :])
+
+        return landmarks, fromDistances
+
+    @staticmethod
+    def __searches(X, landmarks, numProcesses):
+        """
+        Compute the distances from each landmark to every vertex, dividing the
+        landmarks between numProcesses processes.
+        """
+        numProcesses = min(numProcesses, landmarks.shape[0])
+
+        if numProcesses <= 1:
+            return _landmarkDistances((X, landmarks))
+
+        args = [(X, block) for block in numpy.array_split(landmarks, numProcesses)]
+        pool = multiprocessing.Pool(numProcesses)
+        try:
+            blocks = pool.map(_landmarkDistances, args)
+        finally:
+            pool.terminate()
+
+        return numpy.concatenate(blocks)
+
+    @staticmethod
+    def __compact(distances):
+        """
+        Store a matrix of distances using the smallest of int16 and int32 which
+        represents it, with the largest integer for infinity, and otherwise as
+        float64.
+        Tables which are already compact are copied.
+        """
+        if distances.dtype in [numpy.int16, numpy.int32]:
+            return numpy.array(distances)
+
+        distances = numpy.asarray(distances, numpy.float)
+        finite = numpy.isfinite(distances)
+        finiteDistances = distances[finite]
+
+        if numpy.all(finiteDistances == numpy.round(finiteDistances)):
+            for dtype in [numpy.int16, numpy.int32]:
+                infinity = numpy.iinfo(dtype).max
+                if finiteDistances.shape[0] == 0 or numpy.max(finiteDistances) < infinity:
+                    table = numpy.ones(distances.shape, dtype)*infinity
+                    table[finite] = finiteDistances
+                    return table
+
+        return numpy.array(distances)
+
+    @staticmethod
+    def __expand(table):
+        """
+        Convert a block of a compact table into a float matrix with numpy.inf
+        for infinite distances.
+        """
+        distances = numpy.array(table, numpy.float)
+        if table.dtype.kind in "iu":
+            distances[table == numpy.iinfo(table.dtype).max] = numpy.inf
+        return distances
+
+    @staticmethod
+    def __differences(distances1, distances2, tol):
+        """
+        Returns distances1 - distances2 reduced by tol times the size of the
+        finite distances, so that rounding errors cannot raise a lower bound
+        above the distance.
+        """
+        differences = distances1 - distances2
+
+        if tol != 0:
+            slack = tol*(distances1 + distances2)
+            slack[numpy.logical_not(numpy.isfinite(slack))] = 0
+            differences -= slack
+
+        return differences
+
+    def getNumVertices(self):
+        """
+        :returns: the number of vertices of the graph.
+        """
+        return self.fromTable.shape[1]
+
+    def getNumLandmarks(self):
+        """
+        :returns: the number of landmarks.
+        """
+        return self.landmarks.shape[0]
+
+    def getLandmarks(self):
+        """
+        :returns: an array of the indices of the landmark vertices.
+        """
+        return self.landmarks
+
+    def isUndirected(self):
+        """
+        :returns: True if the oracle is for an undirected graph.
+        """
+        return self.undirected
+
+    def getDistanceTables(self):
+        """
+        Return the tables of distances from and to the landmarks as float
+        matrices with numpy.inf for vertices which are not connected, e.g. to
+        pass to PathFinder.setLandmarkDistances. The second table is None for
+        undirected graphs.
+
+        :returns: A tuple (fromDistances, toDistances) of matrices of size numLandmarks x numVertices.
+        """
+        fromDistances = LandmarkOracle.__expand(self.fromTable)
+
+        if self.undirected:
+            return fromDistances, None
+        else:
+            return fromDistances, LandmarkOracle.__expand(self.toTable)
+
+    def bounds(self, source, target):
+        """
+        Find lower and upper bounds on the length of the shortest path from
+        source to target.
+
+        :param source: the index of the source vertex.
+        :type source: :class:`int`
+
+        :param target: the index of the target vertex.
+        :type target: :class:`int`
+
+        :returns: A tuple (lower, upper) of bounds on the distance, in which upper is numpy.inf if no landmark connects the vertices.
+        """
+        Parameter.checkIndex(source, 0, self.getNumVertices())
+        Parameter.checkIndex(target, 0, self.getNumVertices())
+        lowerBounds, upperBounds = self.pairBounds(numpy.array([source]), numpy.array([target]))
+        return lowerBounds[0], upperBounds[0]
+
+    def distance(self, source, target):
+        """
+        Estimate the length of the shortest path from source to target by the
+        upper bound, which is the length of the shortest path through a landmark.
+
+        :param source: the index of the source vertex.
+        :type source: :class:`int`
+
+        :param target: the index of the target vertex.
+        :type target: :class:`int`
+
+        :returns: The approximate distance from source to target.
+        """
+        return self.bounds(source, target)[1]
+
+    def pairBounds(self, sources, targets):
+        """
+        Find lower and upper bounds on the lengths of the shortest paths between
+        pairs of vertices, in O(k) time per pair for k landmarks.
+
+        :param sources: an array of the indices of the source vertices.
+        :type sources: :class:`numpy.ndarray`
+
+        :param targets: an array of the indices of the target vertices.
+        :type targets: :class:`numpy.ndarray`
+
+        :returns: A tuple (lower, upper) of arrays whose ith elements bound the distance from sources[i] to targets[i].
+        """
+        sources = numpy.asarray(sources, numpy.int)
+        targets = numpy.asarray(targets, numpy.int)
+        if sources.shape != targets.shape:
+            raise ValueError("Sources and targets must have the same shape")
+        Parameter.checkIndexArray(sources, 0, self.getNumVertices())
+        Parameter.checkIndexArray(targets, 0, self.getNumVertices())
+
+        if self.getNumLandmarks() == 0:
+            lowerBounds = numpy.zeros(sources.shape[0])
+            upperBounds = numpy.ones(sources.shape[0])*numpy.inf
+        else:
+            fromSources = LandmarkOracle.__expand(self.fromTable[:, sources])
+            fromTargets = LandmarkOracle.__expand(self.fromTable[:, targets])
+
+            if self.undirected:
+                toSources = fromSources
+                toTargets = fromTargets
+            else:
+                toSources = LandmarkOracle.__expand(self.toTable[:, sources])
+                toTargets = LandmarkOracle.__expand(self.toTable[:, targets])
+
+            if self.fromTable.dtype.kind == "f":
+                tol = self.getNumVertices()*numpy.finfo(numpy.float).eps
+            else:
+                tol = 0
+
+            upperBounds = numpy.min(toSources + fromTargets, 0)*(1 + tol)
+
+            #Differences of infinite distances are nan and give no bound
+            with numpy.errstate(invalid="ignore"):
+                lowerBounds = numpy.fmax(LandmarkOracle.__differences(fromTargets, fromSources, tol), LandmarkOracle.__differences(toSources, toTargets, tol))
+            lowerBounds = numpy.max(numpy.fmax(lowerBounds, 0), 0)
+            lowerBounds = numpy.minimum(lowerBounds, upperBounds)
+
+        lowerBounds[sources == targets] = 0
+        upperBounds[sources == targets] = 0
+
+        return lowerBounds, upperBounds
+
+    def distances(self, sources, targets):
+        """
+        Estimate the lengths of the shortest paths between pairs of vertices
+        by the upper bounds of pairBounds.
+
+        :param sources: an array of the indices of the source vertices.
+        :type sources: :class:`numpy.ndarray`
+
+        :param targets: an array of the indices of the target vertices.
+        :type targets: :class:`numpy.ndarray`
+
+        :returns: An array whose ith element is the approximate distance from sources[i] to targets[i].
+        """
+        return self.pairBounds(sources, targets)[1]
+
+    def save(self, filename):
+        """
+        Save the oracle to filename.dor.npz, so that it can be stored next to
+        the zip file written by the save method of the graph using the same
+        filename.
+
+        :param filename: The name of the file to save.
+        :type filename: :class:`str`
+
+        :returns: The name of the saved file including extension.
+        """
+        Parameter.checkClass(filename, str)
+        arrays = {"landmarks": self.landmarks, "fromTable": self.fromTable}
+        arrays["version"] = numpy.array(apgl.__version__)
+        if not self.undirected:
+            arrays["toTable"] = self.toTable
+
+        numpy.savez(filename + LandmarkOracle.ext, **arrays)
+
+        return filename + LandmarkOracle.ext
+
+    @staticmethod
+    def load(filename):
+        """
+        Load an oracle from filename.dor.npz as created using save().
+
+        :param filename: The name of the file to load.
+        :type filename: :class:`str`
+
+        :returns: The loaded LandmarkOracle.
+        """
+        Parameter.checkClass(filename, str)
+        arrays = numpy.load(filename + LandmarkOracle.ext)
+        try:
+            if "toTable" in arrays.files:
+                toDistances = arrays["toTable"]
+            else:
+                toDistances = None
+            oracle = LandmarkOracle(arrays["landmarks"], arrays["fromTable"], toDistances)
+        finally:
+            arrays.close()
+
+        return oracle
+
+    landmarks = None
+    fromTable = None
+    toTable = None
+    undirected = True
+    ext = ".dor.npz"
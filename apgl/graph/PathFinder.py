@@ -0,0 +1,387 @@
+import heapq
+import numpy
+import scipy.sparse
+import scipy.sparse.csgraph
+from apgl.graph.AbstractMatrixGraph import AbstractMatrixGraph
+from apgl.util.Parameter import Parameter
+
+
+class PathFinder(object):
+    """
+    Answer point-to-point shortest path queries on a static graph. The edges
+    are read once into a csr matrix for the forward search, and for a directed
+    graph its csc form gives the in-edges for the reverse search. Each query
+    runs a bidirectional search from the source and the target which stops when
+    the two searches meet, so only a small part of the graph is visited for
+    nearby vertices. Unweighted queries use a bidirectional breadth first search
+    and weighted queries a bidirectional Dijkstra search. If landmarks are set,
+    the Dijkstra search is directed towards the target using lower bounds from
+    the landmark distances (the ALT algorithm of Goldberg and Harrelson), which
+    also prunes the vertices which cannot be on a path. The graph must not be
+    modified after the PathFinder is created.
+    """
+    def __init__(self, graph, useWeights=True):
+        """
+        Create a PathFinder for the given graph, whose edges must have
+        non-negative weights.
+
+        :param graph: the graph to query.
+        :type graph: :class:`apgl.graph.AbstractMatrixGraph`
+
+        :param useWeights: If false then all edges have weight 1.
+        :type useWeights: :class:`bool`
+        """
+        self.X = PathFinder.weightMatrix(graph, useWeights)
+        self.undirected = graph.isUndirected()
+        self.useWeights = useWeights
+
+        if self.undirected:
+            self.Xr = self.X
+        else:
+            self.Xr = self.X.tocsc()
+            self.Xr.sort_indices()
+
+        #The row pointers are read once per settled vertex and are faster as lists
+        self.__indptrs = [self.X.indptr.tolist(), self.Xr.indptr.tolist()]
+
+    @staticmethod
+    def weightMatrix(graph, useWeights=True):
+        """
+        Read the edges of a matrix graph into a csr matrix of non-negative edge
+        weights with sorted indices, in which the ith row contains the out-edges
+        of the ith vertex.
+
+        :param graph: the graph to read.
+        :type graph: :class:`apgl.graph.AbstractMatrixGraph`
+
+        :param useWeights: If false then all edges have weight 1.
+        :type useWeights: :class:`bool`
+
+        :returns: A scipy.sparse.csr_matrix of the edge weights.
+        """
+        Parameter.checkClass(graph, AbstractMatrixGraph)
+        Parameter.checkBoolean(useWeights)
+
+        X = graph._adjacencyCsr()
+        numVertices = X.shape[0]
+
+        if not useWeights:
+            weights = numpy.ones(X.nnz)
+        elif scipy.sparse.issparse(graph.W) or type(graph.W) == numpy.ndarray:
+            weights = numpy.array(X.data, numpy.float)
+        else:
+            rows = numpy.repeat(numpy.arange(numVertices), numpy.diff(X.indptr))
+            weights = graph.getEdgeValues(numpy.c_[rows, X.indices])
+
+        if numpy.any(weights < 0):
+            raise ValueError("Edge weights must be non-negative")
+
+        return scipy.sparse.csr_matrix((weights, X.indices, X.indptr), shape=X.shape)
+
+    def getNumVertices(self):
+        """
+        :returns: the number of vertices of the graph.
+        """
+        return self.X.shape[0]
+
+    def setLandmarks(self, landmarks):
+        """
+        Compute the distances from and to each of the given landmark vertices,
+        which are used to bound the distances to the target in later queries.
+        Landmarks on the periphery of the graph, e.g. found by repeatedly taking
+        the furthest vertex from those chosen, give the tightest bounds. The
+        cost is a single source search per landmark, and the memory is 2 arrays
+        of size the number of landmarks times the number of vertices (or 1 array
+        for undirected graphs).
+
+        :param landmarks: an array of the indices of the landmark vertices.
+        :type landmarks: :class:`numpy.ndarray`
+        """
+        landmarks = numpy.asarray(landmarks, numpy.int)
+        Parameter.checkIndexArray(landmarks, 0, self.getNumVertices())
+
+        if landmarks.shape[0] == 0:
+            self.setLandmarkDistances(None)
+            return
+
+        fromDistances = scipy.sparse.csgraph.dijkstra(self.X, indices=landmarks)
+
+        if self.undirected:
+            toDistances = None
+        else:
+            toDistances = scipy.sparse.csgraph.dijkstra(self.Xr.T, indices=landmarks)
+
+        self.setLandmarkDistances(fromDistances, toDistances)
+        self.landmarks = landmarks
+
+    def setLandmarkDistances(self, fromDistances, toDistances=None):
+        """
+        Set a precomputed table of landmark distances, in which the ith row of
+        fromDistances is the distance from the ith landmark to each vertex and
+        the ith row of toDistances is the distance from each vertex to the ith
+        landmark, with numpy.inf for vertices which are not connected. For
+        undirected graphs toDistances is the same as fromDistances and can be
+        None. Pass None as fromDistances to remove the landmarks.
+
+        :param fromDistances: A matrix of distances from the landmarks of size numLandmarks x numVertices.
+        :type fromDistances: :class:`numpy.ndarray`
+
+        :param toDistances: A matrix of distances to the landmarks of size numLandmarks x numVertices, or None.
+        :type toDistances: :class:`numpy.ndarray`
+        """
+        self.landmarks = None
+
+        if fromDistances is None:
+            self.fromDistances = None
+            self.toDistances = None
+            self.__landmarkTable = None
+            return
+
+        if toDistances is None:
+            if not self.undirected:
+                raise ValueError("The distances to the landmarks are required for a directed graph")
+            toDistances = fromDistances
+
+        for distances in [fromDistances, toDistances]:
+            if distances.ndim != 2 or distances.shape[1] != self.getNumVertices():
+                raise ValueError("Landmark distances must have a column per vertex: " + str(distances.shape))
+        if fromDistances.shape != toDistances.shape:
+            raise ValueError("Landmark distance matrices must have the same shape")
+
+        self.fromDistances = fromDistances
+        self.toDistances = toDistances
+
+        #A table with a row per vertex of the distances from and minus the 
+        #distances to the landmarks, so that the lower bounds on the distance 
+        #from u to v are the elements of table[v] - table[u]. Infinite distances
+        #are replaced by a large number whose differences remain large. 
+        table = numpy.c_[numpy.array(fromDistances, numpy.float).T, -numpy.array(toDistances, numpy.float).T]
+        table[table == numpy.inf] = self.__infinity
+        table[table == -numpy.inf] = -self.__infinity
+        self.__landmarkTable = table
+
+    def distance(self, source, target):
+        """
+        Find the length of the shortest path from source to target.
+
+        :param source: the index of the source vertex.
+        :type source: :class:`int`
+
+        :param target: the index of the target vertex.
+        :type target: :class:`int`
+
+        :returns: The distance from source to target, or numpy.inf if there is no path.
+        """
+        return self.__search(source, target)[0]
+
+    def distances(self, sources, targets):
+        """
+        Find the length of the shortest paths between pairs of vertices.
+
+        :param sources: an array of the indices of the source vertices.
+        :type sources: :class:`numpy.ndarray`
+
+        :param targets: an array of the indices of the target vertices.
+        :type targets: :class:`numpy.ndarray`
+
+        :returns: An array whose ith element is the distance from sources[i] to targets[i].
+        """
+        sources = numpy.asarray(sources, numpy.int)
+        targets = numpy.asarray(targets, numpy.int)
+        if sources.shape != targets.shape:
+            raise ValueError("Sources and targets must have the same shape")
+
+        distances = numpy.zeros(sources.shape[0])
+        for i in range(sources.shape[0]):
+            distances[i] = self.distance(int(sources[i]), int(targets[i]))
+
+        return distances
+
+    def shortestPath(self, source, target):
+        """
+        Find a shortest path from source to target.
+
+        :param source: the index of the source vertex.
+        :type source: :class:`int`
+
+        :param target: the index of the target vertex.
+        :type target: :class:`int`
+
+        :returns: A tuple (distance, path) in which path is the list of vertex indices from source to target, or an empty list if there is no path.
+        """
+        distance, meeting, predecessors = self.__search(source, target)
+
+        if meeting == -1:
+            return distance, []
+
+        path = []
+        vertex = meeting
+        while vertex != -1:
+            path.append(vertex)
+            vertex = predecessors[0][vertex]
+        path.reverse()
+
+        vertex = predecessors[1][meeting]
+        while vertex != -1:
+            path.append(vertex)
+            vertex = predecessors[1][vertex]
+
+        return distance, path
+
+    def __search(self, source, target):
+        """
+        Run a bidirectional search from source and target, and return the
+        distance, the vertex at which the searches met (or -1) and the
+        predecessor dicts of the forward and reverse searches.
+        """
+        Parameter.checkIndex(source, 0, self.getNumVertices())
+        Parameter.checkIndex(target, 0, self.getNumVertices())
+        source = int(source)
+        target = int(target)
+
+        if source == target:
+            return 0.0, source, [{source: -1}, {target: -1}]
+        elif self.__landmarkTable is not None:
+            return self.__bidirectionalDijkstra(source, target, self.__potentials(source, target))
+        elif not self.useWeights:
+            return self.__bidirectionalBreadthFirst(source, target)
+        else:
+            return self.__bidirectionalDijkstra(source, target, None)
+
+    def __bidirectionalBreadthFirst(self, source, target):
+        """
+        Bidirectional breadth first search which expands a whole level of the
+        smaller frontier at a time, and stops at the first level at which the
+        searches meet.
+        """
+        matrices = [self.X, self.Xr]
+        indptrs = self.__indptrs
+        distances = [{source: 0}, {target: 0}]
+        predecessors = [{source: -1}, {target: -1}]
+        frontiers = [[source], [target]]
+
+        while len(frontiers[0]) != 0 and len(frontiers[1]) != 0:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            A = matrices[side]
+            sideDistances = distances[side]
+            otherDistances = distances[1-side]
+            nextFrontier = []
+            bestDistance = numpy.inf
+            meeting = -1
+
+            for i in frontiers[side]:
+                distance = sideDistances[i] + 1
+
+                for j in A.indices[indptrs[side][i]:indptrs[side][i+1]].tolist():
+                    if j not in sideDistances:
+                        sideDistances[j] = distance
+                        predecessors[side][j] = i
+                        nextFrontier.append(j)
+
+                        if j in otherDistances and distance + otherDistances[j] < bestDistance:
+                            bestDistance = distance + otherDistances[j]
+                            meeting = j
+
+            if meeting != -1:
+                return float(bestDistance), meeting, predecessors
+
+            frontiers[side] = nextFrontier
+
+        return numpy.inf, -1, predecessors
+
+    def __bidirectionalDijkstra(self, source, target, potentials):
+        """
+        Bidirectional Dijkstra search, in which the forward search uses the
+        reduced edge weights w(u, v) - p(u) + p(v) for the potential function
+        p and the reverse search uses p(u) - p(v), and the search stops once
+        the sum of the smallest keys of the two heaps is at least the length of
+        the best path found. The potentials function returns the potential of
+        an array of vertices, which is nan for vertices which are not on any
+        path from source to target. If it is None all potentials are zero.
+        """
+        matrices = [self.X, self.Xr]
+        indptrs = self.__indptrs
+        signs = [1, -1]
+        distances = [{source: 0.0}, {target: 0.0}]
+        predecessors = [{source: -1}, {target: -1}]
+        settled = [set(), set()]
+
+        if potentials is None:
+            heaps = [[(0.0, source)], [(0.0, target)]]
+        else:
+            endPotentials = potentials(numpy.array([source, target]))
+            if numpy.isnan(endPotentials).any():
+                return numpy.inf, -1, predecessors
+            heaps = [[(float(endPotentials[0]), source)], [(-float(endPotentials[1]), target)]]
+
+        bestDistance = numpy.inf
+        meeting = -1
+
+        while len(heaps[0]) != 0 and len(heaps[1]) != 0:
+            if heaps[0][0][0] + heaps[1][0][0] >= bestDistance:
+                break
+
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            key, i = heapq.heappop(heaps[side])
+            if i in settled[side]:
+                continue
+            settled[side].add(i)
+
+            A = matrices[side]
+            sideDistances = distances[side]
+            otherDistances = distances[1-side]
+            start, end = indptrs[side][i], indptrs[side][i+1]
+            cols = A.indices[start:end]
+            newDistances = sideDistances[i] + A.data[start:end]
+
+            if potentials is None:
+                keys = newDistances
+            else:
+                keys = newDistances + signs[side]*potentials(cols)
+
+            for j, distance, newKey in zip(cols.tolist(), newDistances.tolist(), keys.tolist()):
+                if newKey != newKey or (j in sideDistances and sideDistances[j] <= distance):
+                    continue
+
+                sideDistances[j] = distance
+                predecessors[side][j] = i
+                heapq.heappush(heaps[side], (newKey, j))
+
+                if j in otherDistances and distance + otherDistances[j] < bestDistance:
+                    bestDistance = distance + otherDistances[j]
+                    meeting = j
+
+        return bestDistance, meeting, predecessors
+
+    def __potentials(self, source, target):
+        """
+        Returns the potential function for a query using the landmark
+        distances, which is the average of the lower bound on the distance to
+        the target and minus the lower bound on the distance from the source.
+        """
+        table = self.__landmarkTable
+        sourceRow = table[source, :]
+        targetRow = table[target, :]
+        threshold = self.__infinity/2
+
+        def potentials(vertices):
+            rows = table[vertices, :]
+            targetBounds = numpy.maximum(numpy.max(targetRow - rows, 1), 0)
+            sourceBounds = numpy.maximum(numpy.max(rows - sourceRow, 1), 0)
+
+            vertexPotentials = (targetBounds - sourceBounds)/2
+            vertexPotentials[numpy.logical_or(targetBounds >= threshold, sourceBounds >= threshold)] = numpy.nan
+            return vertexPotentials
+
+        return potentials
+
+    X = None
+    Xr = None
+    undirected = None
+    useWeights = True
+    landmarks = None
+    fromDistances = None
+    toDistances = None
+    __landmarkTable = None
+    __indptrs = None
+    __infinity = 1e300
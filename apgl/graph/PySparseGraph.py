@@ -118,6 +118,8 @@ class PySparseGraph(AbstractMatrixGraph):
             self.W[vertexIndex2, vertexIndex1] = edge
         else:
             self.W[vertexIndex1, vertexIndex2] = edge
+        self._clearCache()
+        self._clearEdgeCounts()
 
     def getNumEdges(self):
         """
@@ -288,6 +290,8 @@ class PySparseGraph(AbstractMatrixGraph):
             self.setWeightMatrixSparse(W)
         else: 
             raise ValueError("Invalid matrix type: " + str(type(W)))
+        self._clearCache()
+        self._clearEdgeCounts()
 
     def weightMatrixType(self):
         """
@@ -443,5 +447,7 @@ class PySparseGraph(AbstractMatrixGraph):
                   
             for i in range(rowInds.shape[0]):
                 self.W[int(rowInds[i]), int(colInds[i])] = W[int(rowInds[i]), int(colInds[i])]
+        self._clearCache()
+        self._clearEdgeCounts()
         
         
\ No newline at end of file
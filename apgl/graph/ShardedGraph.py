@@ -0,0 +1,644 @@
+import os
+import numpy
+import scipy.sparse
+import apgl
+from apgl.graph.AbstractSingleGraph import AbstractSingleGraph
+from apgl.graph.GeneralVertexList import GeneralVertexList
+from apgl.graph.SparseGraph import SparseGraph
+from apgl.util.Util import Util
+from apgl.util.Parameter import Parameter
+
+
+class ShardedGraph(AbstractSingleGraph):
+    """
+    A read-only graph stored out-of-core as a directory of compressed sparse row
+    partitions, or shards. Each shard holds a contiguous range of rows of the
+    weight matrix in three numpy files (indptr, indices and data) which are
+    memory-mapped when used, so that only one shard needs to be in memory at a
+    time. The graph is created with fromEdgeBlocks, which partitions a stream of
+    edges on disk, or fromGraph, and opened again by passing the directory to
+    the constructor. Searches, components and degree statistics are computed
+    with a pass over the shards and arrays of length the number of vertices.
+    The vertices have no labels.
+    """
+    def __init__(self, directory):
+        """
+        Open a graph stored in a directory created using fromEdgeBlocks or
+        fromGraph.
+
+        :param directory: The directory of the graph.
+        :type directory: :class:`str`
+        """
+        Parameter.checkClass(directory, str)
+        metaDict = Util.loadPickle(os.path.join(directory, ShardedGraph._metaFilename))
+
+        self.directory = directory
+        self.numVertices = metaDict["numVertices"]
+        self.undirected = metaDict["undirected"]
+        self.rowStarts = metaDict["rowStarts"]
+        self.numDirEdges = metaDict["numDirEdges"]
+        self.numSelfEdges = metaDict["numSelfEdges"]
+
+    @staticmethod
+    def fromEdgeBlocks(directory, numVertices, edgeBlocks, undirected=True, rowsPerShard=2**20, dtype=numpy.float):
+        """
+        Create a graph in the given directory from an iterable of blocks of
+        edges, such as the edgeBlocks generators of ErdosRenyiGenerator or
+        StochasticKroneckerGenerator. Each block is an array with 2 columns of
+        edges, or a tuple (edges, values) of edges and edge values, otherwise
+        edges have value 1. The edges are first appended to a temporary file per
+        shard and then each shard is sorted and written in turn, so memory use is
+        bounded by the size of a block and of a shard. For undirected graphs
+        both directions of each edge are stored. Edges with value zero are
+        ignored, and if an edge occurs more than once then the last value is
+        used, for undirected graphs in either direction.
+
+        :param directory: The directory in which to store the graph, which is created if required.
+        :type directory: :class:`str`
+
+        :param numVertices: The number of vertices.
+        :type numVertices: :class:`int`
+
+        :param edgeBlocks: An iterable of edge arrays or (edges, values) tuples.
+
+        :param undirected: Whether the graph is undirected.
+        :type undirected: :class:`bool`
+
+        :param rowsPerShard: The number of rows of the weight matrix in each shard.
+        :type rowsPerShard: :class:`int`
+
+        :param dtype: The type of the edge values.
+
+        :returns: The new ShardedGraph.
+        """
+        Parameter.checkInt(numVertices, 0, float('inf'))
+        Parameter.checkBoolean(undirected)
+        Parameter.checkInt(rowsPerShard, 1, float('inf'))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        rowStarts = numpy.r_[numpy.arange(0, numVertices, rowsPerShard), numVertices].astype(numpy.int64)
+        numShards = rowStarts.shape[0]-1
+        tempFilenames = [os.path.join(directory, "shard" + str(i) + ".tmp") for i in range(numShards)]
+
+        for tempFilename in tempFilenames:
+            open(tempFilename, "wb").close()
+
+        for block in edgeBlocks:
+            if isinstance(block, tuple):
+                edges, values = block
+                values = numpy.asarray(values, numpy.float64)
+            else:
+                edges = block
+                values = numpy.ones(edges.shape[0])
+
+            edges = numpy.asarray(edges, numpy.int64).reshape(-1, 2)
+            if edges.shape[0] != 0:
+                Parameter.checkIndexArray(edges.ravel(), 0, numVertices)
+
+            nonZeros = values != 0
+            edges, values = edges[nonZeros, :], values[nonZeros]
+
+            if undirected:
+                #Follow each edge by its mirror so the last value is the same in both directions
+                offDiagonal = edges[:, 0] != edges[:, 1]
+                keep = numpy.c_[numpy.ones(edges.shape[0], numpy.bool), offDiagonal].ravel()
+                edges = numpy.c_[edges, edges[:, ::-1]].reshape(-1, 2)[keep, :]
+                values = numpy.repeat(values, 2)[keep]
+
+            #Write the edges of each shard as (row, col, value) triples of 8 bytes each
+            shards = numpy.searchsorted(rowStarts, edges[:, 0], side="right")-1
+            perm = numpy.argsort(shards, kind="mergesort")
+            triples = numpy.c_[edges, values.view(numpy.int64)][perm, :]
+            shards, starts = numpy.unique(shards[perm], return_index=True)
+            ends = numpy.r_[starts[1:], triples.shape[0]]
+
+            for i, start, end in zip(shards, starts, ends):
+                tempFile = open(tempFilenames[i], "ab")
+                triples[start:end, :].tofile(tempFile)
+                tempFile.close()
+
+        numDirEdges = 0
+        numSelfEdges = 0
+
+        for i in range(numShards):
+            triples = numpy.fromfile(tempFilenames[i], numpy.int64).reshape(-1, 3)
+            os.remove(tempFilenames[i])
+
+            rows, cols = triples[:, 0] - rowStarts[i], triples[:, 1]
+            values = triples[:, 2].view(numpy.float64)
+
+            #Keep the last occurrence of each edge using a stable sort
+            perm = numpy.lexsort((cols, rows))
+            rows, cols, values = rows[perm], cols[perm], values[perm]
+            last = numpy.r_[numpy.logical_or(rows[1:] != rows[:-1], cols[1:] != cols[:-1]), True] if rows.shape[0] != 0 else numpy.zeros(0, numpy.bool)
+            rows, cols, values = rows[last], cols[last], values[last]
+
+            indptr = numpy.r_[0, numpy.cumsum(numpy.bincount(rows, minlength=rowStarts[i+1]-rowStarts[i]))]
+            ShardedGraph.__saveShard(directory, i, indptr, cols, values.astype(dtype), numVertices)
+
+            numDirEdges += cols.shape[0]
+            numSelfEdges += numpy.sum(rows + rowStarts[i] == cols)
+
+        ShardedGraph.__saveMeta(directory, numVertices, undirected, rowStarts, numDirEdges, numSelfEdges)
+
+        return ShardedGraph(directory)
+
+    @staticmethod
+    def fromGraph(directory, graph, rowsPerShard=2**20):
+        """
+        Create a graph in the given directory with the same edges as an
+        in-memory graph which has a getSparseWeightMatrix method, such as
+        SparseGraph or DictGraph. The vertex labels are not stored.
+
+        :param directory: The directory in which to store the graph, which is created if required.
+        :type directory: :class:`str`
+
+        :param graph: The graph to store.
+
+        :param rowsPerShard: The number of rows of the weight matrix in each shard.
+        :type rowsPerShard: :class:`int`
+
+        :returns: The new ShardedGraph.
+        """
+        Parameter.checkInt(rowsPerShard, 1, float('inf'))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        W = scipy.sparse.csr_matrix(graph.getSparseWeightMatrix(), dtype=numpy.float)
+        W.eliminate_zeros()
+        W.sort_indices()
+        numVertices = W.shape[0]
+        rowStarts = numpy.r_[numpy.arange(0, numVertices, rowsPerShard), numVertices].astype(numpy.int64)
+
+        for i in range(rowStarts.shape[0]-1):
+            X = W[rowStarts[i]:rowStarts[i+1], :]
+            ShardedGraph.__saveShard(directory, i, X.indptr, X.indices, X.data, numVertices)
+
+        numSelfEdges = numpy.sum(W.diagonal() != 0)
+        ShardedGraph.__saveMeta(directory, numVertices, graph.isUndirected(), rowStarts, W.nnz, numSelfEdges)
+
+        return ShardedGraph(directory)
+
+    @staticmethod
+    def __saveShard(directory, i, indptr, indices, data, numVertices):
+        indexType = numpy.int32 if numVertices < 2**31 else numpy.int64
+        numpy.save(os.path.join(directory, "indptr" + str(i) + ".npy"), numpy.asarray(indptr, numpy.int64))
+        numpy.save(os.path.join(directory, "indices" + str(i) + ".npy"), numpy.asarray(indices, indexType))
+        numpy.save(os.path.join(directory, "data" + str(i) + ".npy"), data)
+
+    @staticmethod
+    def __saveMeta(directory, numVertices, undirected, rowStarts, numDirEdges, numSelfEdges):
+        metaDict = {}
+        metaDict["version"] = apgl.__version__
+        metaDict["numVertices"] = int(numVertices)
+        metaDict["undirected"] = undirected
+        metaDict["rowStarts"] = rowStarts
+        metaDict["numDirEdges"] = int(numDirEdges)
+        metaDict["numSelfEdges"] = int(numSelfEdges)
+        Util.savePickle(metaDict, os.path.join(directory, ShardedGraph._metaFilename))
+
+    def getNumShards(self):
+        """
+        :returns: the number of shards of the weight matrix.
+        """
+        return self.rowStarts.shape[0]-1
+
+    def getShard(self, i):
+        """
+        Return the ith shard of the weight matrix as a tuple (rowStart, indptr,
+        indices, data) of the first row of the shard and the memory-mapped
+        arrays of the rows in compressed sparse row format. Column indices within
+        each row are sorted.
+
+        :param i: The index of the shard.
+        :type i: :class:`int`
+        """
+        Parameter.checkIndex(i, 0, self.getNumShards())
+        arrays = [numpy.load(os.path.join(self.directory, name + str(i) + ".npy"), mmap_mode="r") for name in ["indptr", "indices", "data"]]
+        return (self.rowStarts[i], arrays[0], arrays[1], arrays[2])
+
+    def iterShards(self):
+        """
+        A generator over the shards of the weight matrix, as given by getShard.
+        """
+        for i in range(self.getNumShards()):
+            yield self.getShard(i)
+
+    def getNumVertices(self):
+        """
+        :returns: the number of vertices in this graph.
+        """
+        return self.numVertices
+
+    def isUndirected(self):
+        """
+        :returns: true if this graph is undirected, otherwise false.
+        """
+        return self.undirected
+
+    def getNumEdges(self):
+        """
+        :returns: the total number of edges in this graph.
+        """
+        if self.undirected:
+            return (self.numDirEdges + self.numSelfEdges)//2
+        else:
+            return self.numDirEdges
+
+    def getNumDirEdges(self):
+        """
+        :returns: the number of edges, taking this graph as a directed graph.
+        """
+        return self.numDirEdges
+
+    def __row(self, vertexIndex):
+        """
+        Return the column indices and values of the row of the weight matrix of
+        the given vertex.
+        """
+        Parameter.checkIndex(vertexIndex, 0, self.numVertices)
+        i = numpy.searchsorted(self.rowStarts, vertexIndex, side="right")-1
+        rowStart, indptr, indices, data = self.getShard(i)
+        row = vertexIndex - rowStart
+
+        return indices[indptr[row]:indptr[row+1]], data[indptr[row]:indptr[row+1]]
+
+    def neighbours(self, vertexIndex):
+        """
+        Return an array of the indices of the neighbours of the given vertex in
+        sorted order. For a directed graph these are the vertices connected by
+        an edge from the given vertex.
+
+        :param vertexIndex: the index of a vertex.
+        :type vertexIndex: :class:`int`
+        """
+        return numpy.array(self.__row(vertexIndex)[0], numpy.int64)
+
+    def getEdge(self, vertexIndex1, vertexIndex2):
+        """
+        Get the value of an edge, or None if no edge exists.
+
+        :param vertexIndex1: The index of the first vertex.
+        :type vertexIndex1: :class:`int`
+
+        :param vertexIndex2: The index of the second vertex.
+        :type vertexIndex2: :class:`int`
+        """
+        Parameter.checkIndex(vertexIndex2, 0, self.numVertices)
+        cols, values = self.__row(vertexIndex1)
+        i = numpy.searchsorted(cols, vertexIndex2)
+
+        if i < cols.shape[0] and cols[i] == vertexIndex2:
+            return values[i]
+        else:
+            return None
+
+    def getVertex(self, vertexIndex):
+        """
+        Vertices of a ShardedGraph have no labels, and so None is returned.
+
+        :param vertexIndex: the index of the vertex.
+        :type vertexIndex: :class:`int`
+        """
+        Parameter.checkIndex(vertexIndex, 0, self.numVertices)
+        return None
+
+    def getAllVertexIds(self):
+        """
+        Returns a list of all the vertex indices of this graph.
+        """
+        return list(range(0, self.numVertices))
+
+    def getAllEdges(self):
+        """
+        Returns a generator over the edges of this graph, with one array per
+        shard in which each row corresponds to an edge. For an undirected graph,
+        v1>=v2.
+        """
+        for rowStart, indptr, indices, data in self.iterShards():
+            rows = rowStart + numpy.repeat(numpy.arange(indptr.shape[0]-1), numpy.diff(indptr))
+            edges = numpy.c_[rows, numpy.array(indices, numpy.int64)]
+
+            if self.undirected:
+                edges = edges[edges[:, 0] >= edges[:, 1], :]
+
+            yield edges
+
+    def iterEdges(self, chunkSize=2**20, withValues=True):
+        """
+        Iterate over the edges of this graph in blocks of at most chunkSize
+        edges, in the order given by getAllEdges. The blocks are read from the
+        memory mapped shards, so only a single block is held in memory at a time.
+
+        :param chunkSize: The maximum number of edges in each block.
+        :type chunkSize: :class:`int`
+
+        :param withValues: Whether to include the edge values in each block.
+        :type withValues: :class:`bool`
+
+        :returns: A generator of tuples of arrays (rows, cols, values), or (rows, cols) if withValues is False.
+        """
+        Parameter.checkInt(chunkSize, 1, float("inf"))
+        Parameter.checkBoolean(withValues)
+
+        for rowStart, indptr, indices, data in self.iterShards():
+            for i in range(0, indptr[-1], chunkSize):
+                positions = numpy.arange(i, min(i+chunkSize, indptr[-1]))
+                rows = rowStart + numpy.searchsorted(indptr, positions, "right") - 1
+                cols = numpy.array(indices[positions], numpy.int64)
+
+                if self.undirected:
+                    inds = rows >= cols
+                    positions, rows, cols = positions[inds], rows[inds], cols[inds]
+
+                if rows.shape[0] == 0:
+                    continue
+                elif withValues:
+                    yield rows, cols, numpy.array(data[positions])
+                else:
+                    yield rows, cols
+
+    def outDegreeSequence(self):
+        """
+        :returns: a vector of the (out)degree sequence for each vertex.
+        """
+        degrees = [numpy.diff(indptr) for rowStart, indptr, indices, data in self.iterShards()]
+        return numpy.concatenate(degrees + [numpy.zeros(0)]).astype(numpy.int32)
+
+    def inDegreeSequence(self):
+        """
+        :returns: a vector of the (in)degree sequence for each vertex.
+        """
+        degrees = numpy.zeros(self.numVertices, numpy.int64)
+
+        for rowStart, indptr, indices, data in self.iterShards():
+            degrees += numpy.bincount(indices, minlength=self.numVertices)
+
+        return degrees.astype(numpy.int32)
+
+    def diagonal(self):
+        """
+        :returns: a vector of the values of the self edges of each vertex, which is zero for vertices without a self edge.
+        """
+        diagonal = numpy.zeros(self.numVertices)
+
+        for rowStart, indptr, indices, data in self.iterShards():
+            rows = rowStart + numpy.repeat(numpy.arange(indptr.shape[0]-1), numpy.diff(indptr))
+            selfEdges = rows == indices
+            diagonal[rows[selfEdges]] = data[selfEdges]
+
+        return diagonal
+
+    def degreeSequence(self):
+        """
+        :returns: a vector of the degrees (including self edges) for each vertex for an undirected graph.
+        """
+        if not self.isUndirected():
+            raise ValueError("degreeSequence is only for undirected graphs")
+
+        return self.outDegreeSequence() + (self.diagonal() != 0)
+
+    def degreeDistribution(self):
+        """
+        Return a vector of (out)degree distributions. The ith element of the vector
+        corresponds to the frequency of degree i.
+
+        :returns: A vector of (out)degree distributions.
+        """
+        if self.numVertices == 0:
+            return numpy.array([], numpy.int)
+
+        return numpy.bincount(self.outDegreeSequence())
+
+    def inDegreeDistribution(self):
+        """
+        Returns a vector of in-degree distributions. The ith element of the vector
+        corresponds to the frequency of degree i.
+
+        :returns: A vector of (in)degree distributions.
+        """
+        if self.numVertices == 0:
+            return numpy.array([], numpy.int)
+
+        return numpy.bincount(self.inDegreeSequence())
+
+    def subgraph(self, vertexIndices):
+        """
+        Pass in a list or set of vertexIndices and returns the subgraph containing
+        those vertices only, and edges between them, as an in-memory SparseGraph.
+        The subgraph indices correspond to the sorted input indices. The rows of
+        the subgraph are extracted from each shard in turn.
+
+        :param vertexIndices: the indices of the subgraph vertices.
+        :type vertexIndices: :class:`list`
+
+        :returns: A new SparseGraph containing only vertices and edges from vertexIndices
+        """
+        vertexIndices = numpy.asarray(vertexIndices)
+        if vertexIndices.ndim != 1 or vertexIndices.shape[0] != 0:
+            Parameter.checkIndexArray(vertexIndices, 0, self.numVertices)
+        vertexIndices = numpy.unique(numpy.array(vertexIndices, numpy.int64))
+
+        numSubVertices = vertexIndices.shape[0]
+        indexMap = numpy.ones(self.numVertices, numpy.int64)*-1
+        indexMap[vertexIndices] = numpy.arange(numSubVertices)
+        subRows, subCols, subValues = [], [], []
+
+        for rowStart, indptr, indices, data in self.iterShards():
+            rows = vertexIndices[numpy.logical_and(vertexIndices >= rowStart, vertexIndices < rowStart+indptr.shape[0]-1)]
+            r, cols, values = ShardedGraph.__rowEntries(indptr, indices, data, rows - rowStart)
+            cols = indexMap[cols]
+            inSubgraph = cols != -1
+            subRows.append(indexMap[rows[r[inSubgraph]]])
+            subCols.append(cols[inSubgraph])
+            subValues.append(values[inSubgraph])
+
+        subRows = numpy.concatenate(subRows + [numpy.zeros(0, numpy.int64)])
+        subCols = numpy.concatenate(subCols + [numpy.zeros(0, numpy.int64)])
+        subValues = numpy.concatenate(subValues + [numpy.zeros(0)])
+        W = scipy.sparse.csr_matrix((subValues, (subRows, subCols)), shape=(numSubVertices, numSubVertices))
+
+        return SparseGraph(GeneralVertexList(numSubVertices), self.undirected, W=W)
+
+    @staticmethod
+    def __rowEntries(indptr, indices, data, rows):
+        """
+        Find the entries in the given (local) rows of a shard. Returns a tuple
+        (r, c, v) such that r is the position in rows of each entry, c is its
+        column index and v is its value, as in SparseUtils.rowEntries.
+        """
+        starts = indptr[rows]
+        lengths = indptr[rows+1] - starts
+
+        r = numpy.repeat(numpy.arange(rows.shape[0]), lengths)
+        offsets = numpy.arange(r.shape[0]) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+        positions = numpy.repeat(starts, lengths) + offsets
+
+        return r, numpy.array(indices[positions], numpy.int64), numpy.array(data[positions])
+
+    def breadthFirstSearchArrays(self, roots, maxDepth=None):
+        """
+        Breadth first search starting from one or more roots simultaneously,
+        so that the depth of a vertex is its distance to the nearest root. The
+        search expands one level at a time, and each level reads the rows of
+        the frontier from each shard in turn. Neighbours are visited in order of
+        increasing index.
+
+        :param roots: The index of the root vertex or an array of root indices.
+        :type roots: :class:`numpy.ndarray`
+
+        :param maxDepth: The maximum depth of the search, or None for no limit.
+        :type maxDepth: :class:`int`
+
+        :returns: A tuple (order, parents, depths) of arrays, in which order contains the vertices in the order they were found, and parents and depths give the parent and depth of each vertex, with -1 for the parents of roots and for unvisited vertices.
+        """
+        roots = numpy.atleast_1d(numpy.asarray(roots, numpy.int64))
+        Parameter.checkIndexArray(roots, 0, self.numVertices)
+        if maxDepth is not None:
+            Parameter.checkInt(maxDepth, 0, float('inf'))
+
+        visited = numpy.zeros(self.numVertices, numpy.bool)
+        parents = numpy.ones(self.numVertices, numpy.int64)*-1
+        depths = numpy.ones(self.numVertices, numpy.int64)*-1
+
+        roots = roots[numpy.sort(numpy.unique(roots, return_index=True)[1])]
+        visited[roots] = True
+        depths[roots] = 0
+
+        order = [roots]
+        frontier = roots
+        depth = 0
+
+        while frontier.shape[0] != 0 and (maxDepth is None or depth < maxDepth):
+            shards = numpy.searchsorted(self.rowStarts, frontier, side="right")-1
+            positions, cols = [], []
+
+            for i in numpy.unique(shards):
+                rowStart, indptr, indices, data = self.getShard(i)
+                inShard = numpy.flatnonzero(shards == i)
+                r, c = ShardedGraph.__rowEntries(indptr, indices, data, frontier[inShard] - rowStart)[0:2]
+                positions.append(inShard[r])
+                cols.append(c)
+
+            positions = numpy.concatenate(positions)
+            cols = numpy.concatenate(cols)
+            unvisited = numpy.logical_not(visited[cols])
+            positions, cols = positions[unvisited], cols[unvisited]
+
+            #Keep the first occurrence of each new vertex, in frontier order
+            perm = numpy.lexsort((cols, positions))
+            positions, cols = positions[perm], cols[perm]
+            cols, firstInds = numpy.unique(cols, return_index=True)
+            perm = numpy.argsort(firstInds)
+            cols, firstInds = cols[perm], firstInds[perm]
+
+            depth += 1
+            visited[cols] = True
+            parents[cols] = frontier[positions[firstInds]]
+            depths[cols] = depth
+            order.append(cols)
+            frontier = cols
+
+        return numpy.concatenate(order), parents, depths
+
+    def breadthFirstSearch(self, root):
+        """
+        Breadth first search starting from a particular vertex. Returns a list of
+        connected vertices in the order they were found.
+
+        :param root: The index of the root vertex.
+        :type root: :class:`int`
+
+        :returns: A list of vertices connected to the input one via a path in the graph.
+        """
+        Parameter.checkIndex(root, 0, self.numVertices)
+        return self.breadthFirstSearchArrays(root)[0].tolist()
+
+    def componentLabels(self):
+        """
+        Label the connected components of an undirected graph, such that the
+        label of each vertex is the smallest vertex index in its component. The
+        labels are found by repeated passes over the shards, in which the root
+        of the component tree of each endpoint of an edge is hooked onto the
+        smaller root, followed by pointer jumping.
+
+        :returns: An array of component labels for each vertex.
+        """
+        if not self.isUndirected():
+            raise ValueError("Can only find components on undirected graphs")
+
+        parents = numpy.arange(self.numVertices, dtype=numpy.int64)
+        changed = True
+
+        while changed:
+            changed = False
+
+            for rowStart, indptr, indices, data in self.iterShards():
+                rows = rowStart + numpy.repeat(numpy.arange(indptr.shape[0]-1), numpy.diff(indptr))
+                lower = rows > indices
+                roots1 = ShardedGraph.__findRoots(parents, rows[lower])
+                roots2 = ShardedGraph.__findRoots(parents, numpy.array(indices[lower], numpy.int64))
+
+                different = roots1 != roots2
+                if not different.any():
+                    continue
+
+                changed = True
+                larger = numpy.maximum(roots1[different], roots2[different])
+                smaller = numpy.minimum(roots1[different], roots2[different])
+
+                #Hook each larger root onto its smallest neighbouring root
+                perm = numpy.lexsort((-smaller, larger))
+                parents[larger[perm]] = smaller[perm]
+
+            while True:
+                grandParents = parents[parents]
+                if (grandParents == parents).all():
+                    break
+                parents = grandParents
+
+        return parents
+
+    @staticmethod
+    def __findRoots(parents, vertices):
+        roots = parents[vertices]
+        while True:
+            nextRoots = parents[roots]
+            if (nextRoots == roots).all():
+                return roots
+            roots = nextRoots
+
+    def findConnectedComponents(self):
+        """
+        Finds a list of all connected components of the graph, in order of size
+        with the largest first, using componentLabels.
+
+        :returns: A list of lists of component indices.
+        """
+        labels = self.componentLabels()
+        perm = numpy.argsort(labels, kind="mergesort")
+        uniqLabels, starts, counts = numpy.unique(labels[perm], return_index=True, return_counts=True)
+        components = [perm[start:start+count].tolist() for start, count in zip(starts, counts)]
+
+        sortedIndices = numpy.argsort(counts, kind="mergesort")
+        return [components[i] for i in reversed(sortedIndices)]
+
+    def __str__(self):
+        output = str(self.__class__.__name__) + ": "
+        output += "vertices " + str(self.getNumVertices()) + ", edges " + str(self.getNumEdges())
+        output += ", shards " + str(self.getNumShards())
+        if self.undirected:
+            output += ", undirected"
+        else:
+            output += ", directed"
+        return output
+
+    directory = None
+    numVertices = 0
+    undirected = None
+    rowStarts = None
+    numDirEdges = 0
+    numSelfEdges = 0
+    size = property(getNumVertices, doc="The number of vertices in the graph")
+    _metaFilename = "metaDict.dat"
@@ -78,7 +78,8 @@ class SparseGraph(AbstractMatrixGraph):
         """
         Return an array of the indices of neighbours. In the case of a directed
         graph it is an array of those vertices connected by an edge from the current
-        one. 
+        one. For csr and lil weight matrices the row is read directly from the 
+        matrix structure. 
 
         :param vertexIndex: the index of a vertex.
         :type vertexIndex: :class:`int`
@@ -86,84 +87,170 @@ class SparseGraph(AbstractMatrixGraph):
         :returns: An array of the indices of all neigbours of the input vertex. 
         """
         Parameter.checkIndex(vertexIndex, 0, self.vList.getNumVertices())
-        #neighbours = self.W[vertexIndex, :].nonzero()[1]
-        neighbours = self.W.getrow(vertexIndex).nonzero()[1]
-        #neighbours = numpy.nonzero(self.W.getrow(vertexIndex).toarray())[1]
 
-        return neighbours
+        if sparse.isspmatrix_lil(self.W):
+            neighbours = numpy.array(self.W.rows[vertexIndex], numpy.int32)
+            return neighbours[numpy.array(self.W.data[vertexIndex]) != 0]
+
+        return self.__rowNonzeros(self.__outMatrix(), vertexIndex)
 
     def neighbourOf(self, vertexIndex):
         """
         Return an array of the indices of vertices than have an edge going to the input
-        vertex.
+        vertex. For directed graphs, the transpose of the weight matrix is stored in 
+        csr format the first time this method is called and reused until the graph
+        is modified. 
 
         :param vertexIndex: the index of a vertex.
         :type vertexIndex: :class:`int`
 
         :returns: An array of the indices of all vertices with an edge towards the input vertex.
         """
+        if self.undirected:
+            return self.neighbours(vertexIndex)
+
         Parameter.checkIndex(vertexIndex, 0, self.vList.getNumVertices())
-        nonZeroInds = self.W[:, vertexIndex].nonzero()
-        neighbours = nonZeroInds[0]
+        return self.__rowNonzeros(self.__inMatrix(), vertexIndex)
+
+    def neighboursOfMany(self, vertexIndices):
+        """
+        Find the neighbours of several vertices at once. The result is ragged
+        and stored in the same way as a CSR matrix: the neighbours of
+        vertexIndices[i] are neighbours[indptr[i]:indptr[i+1]].
+
+        :param vertexIndices: an array of vertex indices.
+        :type vertexIndices: :class:`numpy.ndarray`
+
+        :returns: A tuple (indptr, neighbours) of arrays.
+        """
+        return self.__raggedRows(self.__outMatrix(), vertexIndices)
+
+    def inNeighboursOfMany(self, vertexIndices):
+        """
+        Find the vertices with an edge towards each of several vertices. The
+        result is stored as in neighboursOfMany, such that the in-neighbours of
+        vertexIndices[i] are neighbours[indptr[i]:indptr[i+1]].
+
+        :param vertexIndices: an array of vertex indices.
+        :type vertexIndices: :class:`numpy.ndarray`
 
-        return neighbours
+        :returns: A tuple (indptr, neighbours) of arrays.
+        """
+        if self.undirected:
+            return self.neighboursOfMany(vertexIndices)
+
+        return self.__raggedRows(self.__inMatrix(), vertexIndices)
+
+    def __outMatrix(self):
+        """
+        Returns the weight matrix in csr format, using a cached copy if W is
+        stored in another format. 
+        """
+        if sparse.isspmatrix_csr(self.W):
+            return self.W
+
+        cache = self._getCache()
+        if "csr" not in cache:
+            cache["csr"] = self.W.tocsr()
+        return cache["csr"]
+
+    def __inMatrix(self):
+        """
+        Returns the transpose of the weight matrix in csr format, which is
+        cached until the graph is modified. 
+        """
+        cache = self._getCache()
+        if "transposeCsr" not in cache:
+            cache["transposeCsr"] = self.W.transpose().tocsr()
+        return cache["transposeCsr"]
+
+    @staticmethod
+    def __rowNonzeros(X, i):
+        """
+        Returns the column indices of the nonzero entries of row i of the csr
+        matrix X.
+        """
+        start, end = X.indptr[i], X.indptr[i+1]
+        return X.indices[start:end][X.data[start:end] != 0]
+
+    def __raggedRows(self, X, vertexIndices):
+        """
+        Returns the column indices of the nonzero entries of the given rows of
+        the csr matrix X as a tuple (indptr, indices). 
+        """
+        vertexIndices = numpy.asarray(vertexIndices)
+        Parameter.checkIndexArray(vertexIndices, 0, self.vList.getNumVertices())
+
+        rows, cols, vals = SparseUtils.rowEntries(X, vertexIndices)
+        nonzeros = vals != 0
+        rows, cols = rows[nonzeros], cols[nonzeros]
+
+        indptr = numpy.zeros(vertexIndices.shape[0]+1, numpy.int64)
+        indptr[1:] = numpy.cumsum(numpy.bincount(rows, minlength=vertexIndices.shape[0]))
+
+        return indptr, cols.astype(numpy.int64)
     
     def getNumEdges(self):
         """
         :returns: the total number of edges in this graph.
         """
-        if self.getNumVertices()==0:
-            return 0 
+        numDirEdges, numSelfEdges = self._getEdgeCounts()
 
-        #Note that self.W.getnnz() doesn't seem to work correctly 
         if self.undirected == True:
-            return (self.W.nonzero()[0].shape[0] + numpy.sum(SparseUtils.diag(self.W) != 0))/2
+            return (numDirEdges + numSelfEdges)/2
         else: 
-            return self.W.nonzero()[0].shape[0]
+            return numDirEdges
 
     def getNumDirEdges(self):
         """
         :returns: the number of edges, taking this graph as a directed graph.
         """
-        return self.W.nonzero()[0].shape[0]
+        return self._getEdgeCounts()[0]
     
     def outDegreeSequence(self):
         """
         :returns: a vector of the (out)degree sequence for each vertex.
         """
-        A = self.nativeAdjacencyMatrix()
-        degrees = numpy.array(A.sum(1), dtype=numpy.int32).ravel()
+        def computeDegrees():
+            X = self._adjacencyCsr()
+            return numpy.diff(X.indptr)[0:self.getNumVertices()].astype(numpy.int32)
 
-        return degrees 
+        return self._cachedValue("outDegrees", computeDegrees).copy()
 
     def inDegreeSequence(self):
         """
         :returns: a vector of the (in)degree sequence for each vertex.
         """
-        A = self.nativeAdjacencyMatrix()
-        degrees = numpy.array(A.sum(0), dtype=numpy.int32).ravel()
+        def computeDegrees():
+            X = self._adjacencyCsr()
+            return numpy.bincount(X.indices, minlength=self.getNumVertices())[0:self.getNumVertices()].astype(numpy.int32)
 
-        return degrees 
+        return self._cachedValue("inDegrees", computeDegrees).copy()
     
     def subgraph(self, vertexIndices):
         """
         Pass in a list or set of vertexIndices and returns the subgraph containing
         those vertices only, and edges between them. The subgraph indices correspond
-        to the sorted input indices. 
+        to the sorted input indices, see subgraphIndexMap. The submatrix is 
+        extracted in a single pass over the selected rows of the weight matrix. 
 
         :param vertexIndices: the indices of the subgraph vertices.
         :type vertexIndices: :class:`list`
 
         :returns: A new SparseGraph containing only vertices and edges from vertexIndices
         """
-        Parameter.checkList(vertexIndices, Parameter.checkIndex, (0, self.getNumVertices()))
-        vertexIndices = numpy.unique(numpy.array(vertexIndices)).tolist()
-        vList = self.vList.subList(vertexIndices)
+        vertexIndices = self._checkVertexIndices(vertexIndices)
+        vList = self.vList.subList(vertexIndices.tolist())
 
         subGraph = SparseGraph(vList, self.undirected)
         
-        if len(vertexIndices) != 0:
-            subGraph.W = self.W[vertexIndices, :][:, vertexIndices]
+        if vertexIndices.shape[0] != 0:
+            W = SparseUtils.submatrix(self.W, vertexIndices)
+            
+            if not sparse.isspmatrix_csr(self.W): 
+                W = self.weightMatrixType()(W)
+            
+            subGraph.W = W
 
         return subGraph
 
@@ -204,17 +291,11 @@ class SparseGraph(AbstractMatrixGraph):
         if self.undirected != graph.undirected:
             raise ValueError("Both graphs must be either undirected or directed")
 
-        #The ideal way is to add both weight matrices together, but this results in a csr
-        #We'll just do this manually
-        nonZeros = numpy.nonzero(graph.W)
-        newGraph = SparseGraph(self.vList, self.undirected)
-        newGraph.W = self.W.copy()
-
-        for i in range(len(nonZeros[0])):
-            ind1 = nonZeros[0][i]
-            ind2 = nonZeros[1][i]
-            newGraph.W[ind1, ind2] = self.W[ind1, ind2] +  graph.W[ind1, ind2]
+        W = (self.W + graph.W).tocsr()
+        W.eliminate_zeros()
 
+        newGraph = SparseGraph(self.vList, self.undirected)
+        newGraph.W = self.weightMatrixType()(W)
         return newGraph
 
     def multiply(self, graph):
@@ -249,15 +330,16 @@ class SparseGraph(AbstractMatrixGraph):
         """
         Returns a graph with identical vertices (same reference) to the current
         one, but with the complement of the set of edges. Edges that do not exist
-        have weight 1. This makes a sparse graph dense.
+        have weight 1. The complement is built row-wise from the edges of this
+        graph, however it has up to n^2 edges and complementView is more efficient
+        for queries on large graphs. 
 
         :returns: A new graph with edges complmenting the current one. 
         """
         newGraph = SparseGraph(self.vList, self.undirected)
-        newGraph.W = self.weightMatrixType()(numpy.ones((self.vList.getNumVertices(), self.vList.getNumVertices())))
 
-        A = self.nativeAdjacencyMatrix()
-        newGraph.W = newGraph.W - A
+        if self.getNumVertices() != 0: 
+            newGraph.W = self.weightMatrixType()(self.complementView().toCsr())
 
         return newGraph
 
@@ -320,19 +402,53 @@ class SparseGraph(AbstractMatrixGraph):
         """
         super(SparseGraph, self).removeEdge(vertexIndex1, vertexIndex2)
 
-        self.W.eliminate_zeros()
+        if sparse.isspmatrix_csr(self.W) or sparse.isspmatrix_csc(self.W):
+            self.W.eliminate_zeros()
+        self._clearCache()
 
     def nativeAdjacencyMatrix(self):
         """
         :returns: the adjacency matrix in the native sparse format.
         """
-        try: 
-            self.W.eliminate_zeros()
-        except AttributeError: 
-            pass 
-        
-        A = self.W/self.W
-        return A
+        return self.weightMatrixType()(self.__adjacencyPattern())
+
+    def union(self, graph):
+        """
+        Take the union of the edges of this graph and the input graph. Resulting edge
+        weights are ignored and only adjacencies are stored. The union is computed
+        by merging the sparsity patterns of both weight matrices, so edges whose 
+        weights cancel are retained. 
+
+        :param graph: the input graph.
+        :type graph: :class:`apgl.graph.SparseGraph`
+
+        :returns: A new graph with the union of edges of the current one.
+        """
+        self.__checkSetGraph(graph)
+        A = self.__adjacencyPattern() + graph.__adjacencyPattern()
+        A.data[:] = 1 
+
+        newGraph = SparseGraph(self.vList, self.undirected)
+        newGraph.W = self.weightMatrixType()(A)
+        return newGraph
+
+    def intersect(self, graph):
+        """
+        Take the intersection of the edges of this graph and the input graph.
+        Resulting edge weights are ignored and only adjacencies are stored.
+
+        :param graph: the input graph.
+        :type graph: :class:`apgl.graph.SparseGraph`
+
+        :returns: A new graph with the intersection of edges of the current plus graph.
+        """
+        self.__checkSetGraph(graph)
+        A = self.__adjacencyPattern().multiply(graph.__adjacencyPattern()).tocsr()
+        A.eliminate_zeros()
+
+        newGraph = SparseGraph(self.vList, self.undirected)
+        newGraph.W = self.weightMatrixType()(A)
+        return newGraph
 
     def setDiff(self, graph):
         """
@@ -344,22 +460,32 @@ class SparseGraph(AbstractMatrixGraph):
 
         :returns: A new graph with edges from the current graph and not in the input graph. 
         """
+        self.__checkSetGraph(graph)
+        A1 = self.__adjacencyPattern()
+        A = (A1 - A1.multiply(graph.__adjacencyPattern())).tocsr()
+        A.eliminate_zeros()
+
+        newGraph = SparseGraph(self.vList, self.undirected)
+        newGraph.W = self.weightMatrixType()(A)
+        return newGraph
+
+    def __checkSetGraph(self, graph): 
+        """
+        Check that graph can be used in a set operation with the current graph. 
+        """
         Parameter.checkClass(graph, SparseGraph)
         if graph.getNumVertices() != self.getNumVertices():
             raise ValueError("Can only add edges from graph with same number of vertices")
         if self.undirected != graph.undirected:
             raise ValueError("Both graphs must be either undirected or directed")
 
-        A1 = self.nativeAdjacencyMatrix()
-        A2 = graph.nativeAdjacencyMatrix()
-        A1 = A1 - A2
-
-        A = (A1 + A1.multiply(A1))/2
-        A.prune()
-
-        newGraph = SparseGraph(self.vList, self.undirected)
-        newGraph.W = A
-        return newGraph
+    def __adjacencyPattern(self): 
+        """
+        :returns: a new csr_matrix with entries of 1 at the edges of this graph.
+        """
+        A = self._adjacencyCsr().copy()
+        A.data = numpy.ones(A.data.shape[0], A.dtype)
+        return A 
 
     def getAllDirEdges(self):
         """
@@ -0,0 +1,189 @@
+import numpy
+import scipy.sparse
+from apgl.graph.AbstractSingleGraph import AbstractSingleGraph
+from apgl.util.SparseUtils import SparseUtils
+
+
+class SubgraphView(AbstractSingleGraph):
+    """
+    A read-only view of the subgraph of an AbstractMatrixGraph induced by a set
+    of vertex indices. Neither the weight matrix nor the vertex list of the
+    parent graph is copied, and queries are translated to the parent graph using
+    an index map. The view is useful for analytics on many subgraphs of a large
+    graph, and is invalid if the parent graph is subsequently modified. Vertex
+    indices in the view correspond to the sorted input indices, as with subgraph.
+    """
+    def __init__(self, graph, vertexIndices, indexMap=None):
+        """
+        Create a view of the subgraph of graph induced by vertexIndices.
+
+        :param graph: the parent graph.
+        :type graph: :class:`apgl.graph.AbstractMatrixGraph`
+
+        :param vertexIndices: a sorted array of unique vertex indices of graph.
+        :type vertexIndices: :class:`numpy.ndarray`
+
+        :param indexMap: an optional array whose ith entry is the index of vertex i in the view or -1.
+        :type indexMap: :class:`numpy.ndarray`
+        """
+        self.graph = graph
+        self.undirected = graph.isUndirected()
+        self.vertexIndices = numpy.asarray(vertexIndices, numpy.int64)
+
+        if indexMap is None:
+            indexMap = numpy.ones(graph.getNumVertices(), numpy.int64)*-1
+            indexMap[self.vertexIndices] = numpy.arange(self.vertexIndices.shape[0])
+
+        self.indexMap = indexMap
+
+    def getNumVertices(self):
+        """
+        :returns: the number of vertices in this subgraph.
+        """
+        return self.vertexIndices.shape[0]
+
+    def isUndirected(self):
+        """
+        :returns: true if the parent graph is undirected, otherwise false.
+        """
+        return self.undirected
+
+    def getParentIndices(self):
+        """
+        :returns: an array whose ith element is the index in the parent graph of vertex i.
+        """
+        return self.vertexIndices
+
+    def getIndexMap(self):
+        """
+        :returns: an array whose ith element is the index in this view of parent vertex i, or -1.
+        """
+        return self.indexMap
+
+    def neighbours(self, vertexIndex):
+        """
+        Return an array of the indices of the neighbours of the given vertex
+        within this subgraph.
+
+        :param vertexIndex: the index of a vertex.
+        :type vertexIndex: :class:`int`
+        """
+        neighbours = self.indexMap[self.graph.neighbours(int(self.vertexIndices[vertexIndex]))]
+        return neighbours[neighbours >= 0]
+
+    def getEdge(self, vertexIndex1, vertexIndex2):
+        """
+        Get the value of an edge, or None if no edge exists.
+
+        :param vertexIndex1: The index of the first vertex.
+        :type vertexIndex1: :class:`int`
+
+        :param vertexIndex2: The index of the second vertex.
+        :type vertexIndex2: :class:`int`
+        """
+        return self.graph.getEdge(int(self.vertexIndices[vertexIndex1]), int(self.vertexIndices[vertexIndex2]))
+
+    def getVertex(self, vertexIndex):
+        """
+        Returns the vertex associated with the given vertex index.
+
+        :param vertexIndex: the index of the vertex.
+        :type vertexIndex: :class:`int`
+        """
+        return self.graph.getVertex(int(self.vertexIndices[vertexIndex]))
+
+    def getAllVertexIds(self):
+        """
+        Returns a list of all the vertex indices of this subgraph.
+        """
+        return list(range(0, self.getNumVertices()))
+
+    def __entries(self):
+        """
+        Find the rows, columns and values (in view indices) of the directed
+        edges of this subgraph.
+        """
+        W = self.graph.W
+
+        if scipy.sparse.issparse(W):
+            rows, cols, vals = SparseUtils.rowEntries(W, self.vertexIndices)
+            cols = self.indexMap[cols]
+            mask = numpy.logical_and(cols >= 0, vals != 0)
+            return rows[mask], cols[mask], vals[mask]
+        else:
+            rows, cols = numpy.nonzero(W[numpy.ix_(self.vertexIndices, self.vertexIndices)])
+            return rows, cols, W[self.vertexIndices[rows], self.vertexIndices[cols]]
+
+    def outDegreeSequence(self):
+        """
+        :returns: a vector of the (out)degree sequence for each vertex.
+        """
+        rows = self.__entries()[0]
+        return numpy.bincount(rows, minlength=self.getNumVertices()).astype(numpy.int32)
+
+    def inDegreeSequence(self):
+        """
+        :returns: a vector of the (in)degree sequence for each vertex.
+        """
+        cols = self.__entries()[1]
+        return numpy.bincount(cols, minlength=self.getNumVertices()).astype(numpy.int32)
+
+    def getNumDirEdges(self):
+        """
+        :returns: the number of edges, taking this graph as a directed graph.
+        """
+        return self.__entries()[0].shape[0]
+
+    def getNumEdges(self):
+        """
+        :returns: the total number of edges in this subgraph.
+        """
+        rows, cols, vals = self.__entries()
+
+        if self.undirected:
+            return (rows.shape[0] + numpy.sum(rows == cols))/2
+        else:
+            return rows.shape[0]
+
+    def getAllDirEdges(self):
+        """
+        :returns: A matrix with 2 columns, and each row corresponding to a directed edge.
+        """
+        rows, cols, vals = self.__entries()
+        return numpy.c_[rows, cols]
+
+    def getAllEdges(self):
+        """
+        Returns the set of edges of this subgraph as a matrix in which each row
+        corresponds to an edge. For an undirected graph, v1>=v2.
+        """
+        edges = self.getAllDirEdges()
+
+        if self.undirected and edges.shape[0] != 0:
+            edges = edges[edges[:, 0] >= edges[:, 1], :]
+
+        return edges
+
+    def toGraph(self):
+        """
+        Materialise this view as a new graph of the same type as the parent
+        graph, copying the relevant vertices and edges.
+
+        :returns: The subgraph of the parent graph corresponding to this view.
+        """
+        return self.graph.subgraph(self.vertexIndices)
+
+    def __str__(self):
+        output = str(self.__class__.__name__) + ": "
+        output += "vertices " + str(self.getNumVertices()) + " of " + str(self.graph.getNumVertices())
+        if self.undirected:
+            output += ", undirected"
+        else:
+            output += ", directed"
+        return output
+
+    graph = None
+    vertexIndices = None
+    indexMap = None
+    undirected = None
+    size = property(getNumVertices, doc="The number of vertices in the graph")
@@ -7,6 +7,11 @@ from apgl.graph.GraphUtils import GraphUtils
 from apgl.graph.GraphStatistics import GraphStatistics
 from apgl.graph.AbstractSingleGraph import AbstractSingleGraph
 from apgl.graph.AbstractMatrixGraph import AbstractMatrixGraph
+from apgl.graph.SubgraphView import SubgraphView
+from apgl.graph.ComplementView import ComplementView
+from apgl.graph.ShardedGraph import ShardedGraph
+from apgl.graph.PathFinder import PathFinder
+from apgl.graph.LandmarkOracle import LandmarkOracle
 
 #Optional modules are tried and ignored if not present 
 try:
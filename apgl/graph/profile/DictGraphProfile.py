@@ -34,6 +34,20 @@ class DictGraphProfile(object):
         
         ProfileUtils.profile('self.graph.breadthFirstSearch(root)', globals(), locals())
 
+    def profileGetAllEdges(self):
+        ProfileUtils.profile('self.graph.getAllEdges()', globals(), locals())
+
+    def profileGetAllEdgeArrays(self):
+        ProfileUtils.profile('self.graph.getAllEdgeArrays()', globals(), locals())
+
+    def profileGetAllEdgeIndices(self):
+        ProfileUtils.profile('self.graph.getAllEdgeIndices()', globals(), locals())
+
+    def profileShortestPathDistances(self):
+        vertexIds = self.graph.getAllVertexIds()[0:10]
+
+        ProfileUtils.profile('self.graph.shortestPathDistances(vertexIds)', globals(), locals())
+
 profiler = DictGraphProfile()
 #profiler.profileDepthFirstSearch() 
 #profiler.profileBreadthFirstSearch() 
@@ -0,0 +1,34 @@
+import numpy
+import logging
+import sys
+from apgl.graph import *
+from apgl.generator import *
+from apgl.util import *
+
+logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+numpy.random.seed(21)
+
+class LandmarkOracleProfile(object):
+    def __init__(self):
+        numVertices = 200000
+        generator = ErdosRenyiGenerator(5.0/numVertices)
+        self.graph = generator.generate(SparseGraph(numVertices))
+
+        self.sources = numpy.random.randint(0, numVertices, 10**6)
+        self.targets = numpy.random.randint(0, numVertices, 10**6)
+
+    def profileFromGraph(self):
+        ProfileUtils.profile('LandmarkOracle.fromGraph(self.graph, 16, useWeights=False)', globals(), locals())
+
+    def profileFromGraphParallel(self):
+        landmarks = numpy.argsort(self.graph.degreeSequence())[-16:]
+        ProfileUtils.profile('LandmarkOracle.fromGraph(self.graph, landmarks=landmarks, useWeights=False, numProcesses=4)', globals(), locals())
+
+    def profilePairBounds(self):
+        oracle = LandmarkOracle.fromGraph(self.graph, 16, useWeights=False)
+        ProfileUtils.profile('oracle.pairBounds(self.sources, self.targets)', globals(), locals())
+
+profiler = LandmarkOracleProfile()
+profiler.profileFromGraph()
+#profiler.profileFromGraphParallel()
+#profiler.profilePairBounds()
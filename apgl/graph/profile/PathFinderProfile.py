@@ -0,0 +1,44 @@
+import numpy
+import logging
+import sys
+import scipy.sparse
+from apgl.graph import *
+from apgl.util import *
+
+logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+numpy.random.seed(21)
+
+class PathFinderProfile(object):
+    def __init__(self):
+        #A grid with random weights, which is similar to a road network 
+        width = 300
+        numVertices = width**2
+        inds = numpy.arange(numVertices).reshape(width, width)
+        rows = numpy.r_[inds[:, :-1].ravel(), inds[:-1, :].ravel()]
+        cols = numpy.r_[inds[:, 1:].ravel(), inds[1:, :].ravel()]
+        weights = numpy.random.rand(rows.shape[0]) + 0.5
+
+        W = scipy.sparse.csr_matrix((numpy.r_[weights, weights], (numpy.r_[rows, cols], numpy.r_[cols, rows])), shape=(numVertices, numVertices))
+        self.graph = SparseGraph(numVertices, W=W)
+        self.landmarks = numpy.array([0, width-1, numVertices-width, numVertices-1])
+
+        self.sources = numpy.random.randint(0, numVertices, 100)
+        self.targets = numpy.random.randint(0, numVertices, 100)
+
+    def profileDistances(self):
+        pathFinder = PathFinder(self.graph)
+        ProfileUtils.profile('pathFinder.distances(self.sources, self.targets)', globals(), locals())
+
+    def profileLandmarkDistances(self):
+        pathFinder = PathFinder(self.graph)
+        pathFinder.setLandmarks(self.landmarks)
+        ProfileUtils.profile('pathFinder.distances(self.sources, self.targets)', globals(), locals())
+
+    def profileBreadthFirstDistances(self):
+        pathFinder = PathFinder(self.graph, False)
+        ProfileUtils.profile('pathFinder.distances(self.sources, self.targets)', globals(), locals())
+
+profiler = PathFinderProfile()
+profiler.profileDistances()
+#profiler.profileLandmarkDistances()
+#profiler.profileBreadthFirstDistances()
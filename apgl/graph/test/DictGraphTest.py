@@ -1,4 +1,5 @@
 from apgl.graph.DictGraph import DictGraph
+from apgl.graph.AbstractGraph import AbstractGraph
 from apgl.util.Util import Util 
 import unittest
 import numpy 
@@ -143,6 +144,14 @@ class DictGraphTest(unittest.TestCase):
         self.assertEquals(dictGraph.getEdge(1, 2), 12)
         self.assertEquals(dictGraph.getEdge(2, 1), None)
 
+    def testGetEdgeValues(self):
+        dictGraph = DictGraph(False)
+        dictGraph.addEdge("a", "b", 12)
+        dictGraph.addEdge("b", "c", "abc")
+
+        self.assertEquals(dictGraph.getEdgeValues([("a", "b"), ("b", "c"), ("b", "a")]), [12, "abc", None])
+        self.assertEquals(dictGraph.getEdgeValues(dictGraph.getAllEdges()), [12, "abc"])
+
     def testGetNeighbours(self):
         dictGraph = DictGraph(True)
         dictGraph.addEdge(1, 2, 12)
@@ -244,6 +253,44 @@ class DictGraphTest(unittest.TestCase):
         self.assertTrue((2,1) in edges)
         self.assertTrue((1,3) in edges)
 
+        #Undirected edges are given once from the first vertex
+        dictGraph = DictGraph(True)
+        dictGraph.addEdge(3, 1)
+        dictGraph.addEdge(1, 1)
+        dictGraph.addEdge(2, 1)
+        dictGraph.addEdge(2, 3)
+        self.assertEquals(dictGraph.getAllEdges(), [(3, 1), (3, 2), (1, 1), (1, 2)])
+
+    def testIterEdges(self):
+        for graph in [self.graph, self.graph2]:
+            edges = graph.getAllEdges()
+
+            for chunkSize in [1, 4, 100]:
+                blocks = list(graph.iterEdges(chunkSize))
+                self.assertTrue(all(rows.shape[0] <= chunkSize for rows, cols, values in blocks))
+
+                rows = numpy.concatenate([block[0] for block in blocks])
+                cols = numpy.concatenate([block[1] for block in blocks])
+                values = numpy.concatenate([block[2] for block in blocks])
+                self.assertEquals(list(zip(rows, cols)), edges)
+                self.assertEquals(values.tolist(), [graph.getEdge(v1, v2) for v1, v2 in edges])
+
+        #Self edges and non-numeric ids and values
+        graph = DictGraph()
+        graph.addEdge("a", ("b", 1), "x")
+        graph.addEdge("a", "a", 2)
+        graph.addEdge(("b", 1), "c", "y")
+
+        rows, cols, values = next(graph.iterEdges())
+        self.assertEquals(rows.shape, (3, ))
+        self.assertEquals(list(zip(rows, cols)), graph.getAllEdges())
+        self.assertEquals(values.tolist(), ["x", 2, "y"])
+
+        rows, cols = next(graph.iterEdges(withValues=False))
+        self.assertEquals(cols.tolist(), [("b", 1), "a", "c"])
+
+        self.assertEquals(list(DictGraph().iterEdges()), [])
+
     def testDensity(self):
         numVertices = 10 
         graph = DictGraph(True)
@@ -387,6 +434,46 @@ class DictGraphTest(unittest.TestCase):
         for i in range(edgeIndices.shape[0]):
             self.assertTrue(graph.getEdge(keys[int(edgeIndices[i, 0])], keys[edgeIndices[i, 1]]) == 1)
 
+        #Self edges are included once and the indices match getAllEdges
+        graph.addEdge("e", "e")
+        edgeIndices = graph.getAllEdgeIndices()
+        keys = graph.getAllVertexIds()
+        self.assertEquals(edgeIndices.shape[0], 6)
+        self.assertEquals([(keys[i], keys[j]) for i, j in edgeIndices].count(("e", "e")), 1)
+
+        graph = DictGraph()
+        graph.addEdge("a", "b")
+        graph.addEdge("c", "a")
+        graph.addEdge("c", "c")
+        edgeIndices = graph.getAllEdgeIndices()
+        keys = graph.getAllVertexIds()
+        self.assertEquals(edgeIndices.shape, (3, 2))
+        self.assertTrue((edgeIndices[:, 0] <= edgeIndices[:, 1]).all())
+        self.assertEquals([(keys[i], keys[j]) for i, j in edgeIndices], graph.getAllEdges())
+
+        self.assertEquals(DictGraph().getAllEdgeIndices().shape, (0, 2))
+
+    def testGetAllEdgeArrays(self):
+        for graph in [self.graph, self.graph2]:
+            rows, cols, values = graph.getAllEdgeArrays()
+            self.assertEquals(list(zip(rows, cols)), graph.getAllEdges())
+            nptst.assert_array_equal(values, [graph.getEdge(v1, v2) for v1, v2 in graph.getAllEdges()])
+            self.assertEquals(rows.dtype.kind, "i")
+
+            rows2, cols2 = graph.getAllEdgeArrays(False)
+            nptst.assert_array_equal(rows, rows2)
+            nptst.assert_array_equal(cols, cols2)
+
+        graph = DictGraph()
+        graph.addEdge("a", "b", "x")
+        graph.addEdge("b", "a", "y")
+        rows, cols, values = graph.getAllEdgeArrays()
+        self.assertEquals(rows.tolist(), ["a"])
+        self.assertEquals(values.tolist(), ["y"])
+
+        rows, cols, values = DictGraph().getAllEdgeArrays()
+        self.assertEquals(rows.shape, (0, ))
+
     def testGetItem(self):
         graph = DictGraph()
         graph.addEdge(1, 1, 0.1)
@@ -579,6 +666,57 @@ class DictGraphTest(unittest.TestCase):
         self.assertTrue(graph.vertexExists(3))
         self.assertFalse(graph.vertexExists(4))
 
+    def testReverseIndex(self):
+        numpy.random.seed(21)
+        graph = DictGraph(False)
+        graph2 = DictGraph(False, reverseIndex=False)
+
+        for i in range(200):
+            vertex1, vertex2 = numpy.random.randint(0, 15, 2).tolist()
+            if numpy.random.rand() < 0.7:
+                graph.addEdge(vertex1, vertex2)
+                graph2.addEdges([(vertex1, vertex2)])
+            elif graph.edgeExists(vertex1, vertex2):
+                graph.removeEdge(vertex1, vertex2)
+                graph2.removeEdge(vertex1, vertex2)
+
+            if i % 50 == 49:
+                vertexId = graph.getAllVertexIds()[0]
+                graph.removeVertex(vertexId)
+                graph2.removeVertex(vertexId)
+
+            for vertexId in graph.getAllVertexIds():
+                self.assertEquals(set(graph.neighbourOf(vertexId)), set(graph2.neighbourOf(vertexId)))
+
+        self.assertEquals(graph.getNumEdges(), graph2.getNumEdges())
+        self.assertEquals(graph.getAllEdges(), graph2.getAllEdges())
+        nptst.assert_array_equal(graph.inDegreeSequence()[0], graph2.inDegreeSequence()[0])
+        self.assertEquals(graph.neighbourOf(100), [])
+
+        #No index is built when it is switched off
+        self.assertEquals(graph2._inAdjacencies, None)
+        graph2.addEdge(100, 101)
+        graph2.removeEdge(100, 101)
+        graph2.removeVertex(100)
+        self.assertEquals(graph2.neighbourOf(101), [])
+        self.assertEquals(graph2._inAdjacencies, None)
+
+        #The index is rebuilt after a direct modification or switching it on
+        graph.adjacencies[graph.getAllVertexIds()[0]][100] = 1
+        graph.vertices[100] = None
+        graph.adjacencies[100] = {}
+        graph._clearEdgeCounts()
+        self.assertEquals(graph.neighbourOf(100), [graph.getAllVertexIds()[0]])
+
+        graph.setReverseIndex(False)
+        graph.addEdge(100, 101)
+        graph.setReverseIndex(True)
+        self.assertEquals(graph.neighbourOf(101), [100])
+        self.assertTrue(graph.subgraph([100, 101]).reverseIndex)
+
+        self.assertEquals(self.graph.neighbourOf(0), self.graph.neighbours(0))
+        self.assertRaises(ValueError, graph.setReverseIndex, 1)
+
     def testRemoveVertex(self):
         graph = DictGraph()
         graph.addEdge(0, 1)
@@ -679,6 +817,82 @@ class DictGraphTest(unittest.TestCase):
         self.assertEquals(graph.breadthFirstSearch(5), [5, 4])
         self.assertEquals(graph.breadthFirstSearch(7), [7, 0, 8, 9, 1, 2, 3, 6])    
 
+    def testIterSearch(self):
+        graph = DictGraph()
+        graph.addEdge("a", "b")
+        graph.addEdge("a", "c")
+        graph.addEdge("b", "d")
+        graph.addEdge("d", "e")
+        graph.addEdge("f", "g")
+
+        searchList = list(graph.iterBreadthFirst("a"))
+        self.assertEquals([v for v, d, p in searchList], ["a", "b", "c", "d", "e"])
+        self.assertEquals(searchList[0], ("a", 0, None))
+        self.assertEquals(searchList[3], ("d", 2, "b"))
+
+        searchList = list(graph.iterDepthFirst("a"))
+        self.assertEquals(searchList, [("a", 0, None), ("b", 1, "a"), ("d", 2, "b"), ("e", 3, "d"), ("c", 1, "a")])
+
+        self.assertEquals([v for v, d, p in graph.iterDepthFirst("a", 1)], ["a", "b", "c"])
+        self.assertEquals([v for v, d, p in graph.iterBreadthFirst("f")], ["f", "g"])
+
+        expandFunc = lambda vertex, depth, neighbours: [v for v in neighbours if v != "b"]
+        self.assertEquals([v for v, d, p in graph.iterBreadthFirst("a", expandFunc=expandFunc)], ["a", "c"])
+
+        iterator = graph.iterDepthFirst("a")
+        self.assertEquals(next(iterator), ("a", 0, None))
+        self.assertRaises(ValueError, graph.iterBreadthFirst, "a", -1)
+
+    def testEdgeCounts(self): 
+        AbstractGraph.setVerifyEdgeCounts(True)
+        
+        try: 
+            for undirected in [True, False]: 
+                graph = DictGraph(undirected)
+                graph["a", "b"] = 1
+                graph["a", "b"] = 2
+                graph["b", "a"] = 1
+                graph["c", "c"] = 1
+                self.assertEquals(graph.getNumEdges(), 2 if undirected else 3)
+                self.assertEquals(graph.getNumDirEdges(), 3)
+
+                graph.addEdges([("d", "e"), ("e", "d"), ("d", "d")])
+                self.assertEquals(graph.getNumEdges(), 4 if undirected else 6)
+
+                graph.removeEdge("c", "c")
+                graph.removeEdge("a", "b")
+                self.assertEquals(graph.getNumEdges(), 2 if undirected else 4)
+
+                graph.removeVertex("d")
+                self.assertEquals(graph.getNumEdges(), 0 if undirected else 1)
+
+                subgraph = graph.subgraph(["a", "b"])
+                self.assertEquals(subgraph.getNumEdges(), 0 if undirected else 1)
+
+            graph.adjacencies["a"]["e"] = 1
+            self.assertRaises(ValueError, graph.getNumEdges)
+        finally: 
+            AbstractGraph.setVerifyEdgeCounts(False)
+
+    def testDiagonal(self): 
+        graph = DictGraph() 
+        graph.setVertex("a", 10)
+        graph["b", "c"] = 1
+        graph["e", "e"] = 2
+        
+        diagonal = graph.diagonal()
+        for i, vertexId in enumerate(graph.getAllVertexIds()): 
+            self.assertEquals(diagonal[i], 2 if vertexId == "e" else 0)
+
+        graph = DictGraph(False) 
+        graph["b", "c"] = 1
+        graph["c", "b"] = 1
+        graph["c", "d"] = 1
+        degSeq, vertexList = graph.inDegreeSequence()
+        self.assertEquals(dict(zip(vertexList, degSeq)), {"b": 1, "c": 1, "d": 1})
+        degSeq, vertexList = graph.outDegreeSequence()
+        self.assertEquals(dict(zip(vertexList, degSeq)), {"b": 1, "c": 2, "d": 0})
+
     def testDegreeSequence(self): 
         graph = DictGraph() 
         graph.setVertex("a", 10)
@@ -736,7 +950,8 @@ class DictGraphTest(unittest.TestCase):
         graph.addEdge(1, 2, 1)
         graph.addEdge(1, 3, 1)
 
-        self.assertTrue((graph.dijkstrasAlgorithm(0) == numpy.array([0, 1, 2, 2, numpy.inf])).all())
+        inds = Util.argsort(graph.getAllVertexIds())
+        self.assertTrue((graph.dijkstrasAlgorithm(0)[inds] == numpy.array([0, 1, 2, 2, numpy.inf])).all())
 
         #Test a graph in a ring
         graph = DictGraph()
@@ -764,6 +979,63 @@ class DictGraphTest(unittest.TestCase):
         self.assertTrue((graph.dijkstrasAlgorithm("d")[inds] == numpy.array([2, 1, 2, 0, 3])).all())
         self.assertTrue((graph.dijkstrasAlgorithm("e")[inds] == numpy.array([3, 2, 1, 3, 0])).all())
 
+    def testShortestPathDistances(self):
+        numpy.random.seed(21)
+
+        for undirected in [True, False]:
+            graph = DictGraph(undirected)
+            for i in range(60):
+                vertex1, vertex2 = numpy.random.randint(0, 30, 2)
+                graph.addEdge("v" + str(vertex1), "v" + str(vertex2), numpy.random.randint(0, 4))
+            graph.setVertex("isolated", None)
+
+            vertexIds = graph.getAllVertexIds()
+            P = graph.findAllDistances()
+            X = graph.adjacencyCsr()
+
+            for i, vertexId in enumerate(vertexIds[0:10]):
+                nptst.assert_array_equal(graph.dijkstrasAlgorithm(vertexId), P[i, :])
+                nptst.assert_array_equal(graph.dijkstrasAlgorithm(vertexId, graph.adjacencyList()), P[i, :])
+                nptst.assert_array_equal(graph.shortestPathDistances([vertexId], X=X), P[i, :])
+
+            #Multiple sources give the distance to the nearest source 
+            sources = [vertexIds[0], vertexIds[3], vertexIds[7]]
+            distances = graph.shortestPathDistances(sources)
+            nptst.assert_array_equal(distances, numpy.min(P[[0, 3, 7], :], 0))
+
+            #Only vertices within the radius are found 
+            radius = numpy.median(distances[numpy.isfinite(distances)])
+            distances2 = graph.shortestPathDistances(sources, radius=radius)
+            nptst.assert_array_equal(distances2[distances <= radius], distances[distances <= radius])
+            self.assertTrue(numpy.isinf(distances2[distances > radius]).all())
+
+            #The search stops at the target, after finding all closer vertices 
+            for j in [5, 20, len(vertexIds)-1]:
+                distances2 = graph.shortestPathDistances(sources, vertexIds[j])
+                self.assertEquals(distances2[j], distances[j])
+                nptst.assert_array_equal(distances2[distances < distances[j]], distances[distances < distances[j]])
+                self.assertTrue(numpy.isinf(distances2[distances > distances[j]]).all())
+
+                distances2 = graph.shortestPathDistances(sources, vertexIds[j], radius)
+                nptst.assert_array_equal(distances2[distances2 != numpy.inf], distances[distances2 != numpy.inf])
+
+            P = graph.findAllDistances(False)
+            nptst.assert_array_equal(graph.shortestPathDistances(sources, useWeights=False), numpy.min(P[[0, 3, 7], :], 0))
+            self.assertTrue(numpy.isinf(graph.shortestPathDistances([])).all())
+
+        #Non-numeric edges have weight 1 
+        graph = DictGraph(False)
+        graph.addEdge("a", "b", "x")
+        graph.addEdge("b", "c", 0)
+        graph.addEdge("a", "c", 2.5)
+        nptst.assert_array_equal(graph.shortestPathDistances(["a"]), [0, 1, 1])
+        nptst.assert_array_equal(graph.shortestPathDistances(["a"], "b"), [0, 1, numpy.inf])
+
+        self.assertRaises(ValueError, graph.shortestPathDistances, ["d"])
+        self.assertRaises(ValueError, graph.shortestPathDistances, ["a"], "d")
+        self.assertRaises(ValueError, graph.shortestPathDistances, ["a"], None, -1)
+        self.assertRaises(ValueError, graph.shortestPathDistances, ["a"], X=DictGraph().adjacencyCsr())
+
     def testAdjacencyList(self): 
         graph = DictGraph()
         graph.addEdge("a", "b", 1)
@@ -782,7 +1054,8 @@ class DictGraphTest(unittest.TestCase):
                 self.assertEquals(graph[vertexIds[i], vertexIds[j]], neighbourWeights[i][k])
          
     def testFindAllDistances(self):
-        P = self.graph.findAllDistances()
+        inds = Util.argsort(self.graph.getAllVertexIds())
+        P = self.graph.findAllDistances()[inds, :][:, inds]
 
         P2 = numpy.zeros((self.graph.size, self.graph.size))
         P2[0, :] = numpy.array([0, 1, 2, 2, 1, numpy.inf])
@@ -795,7 +1068,8 @@ class DictGraphTest(unittest.TestCase):
         self.assertTrue((P == P2).all())
 
         #Now test the directed graph
-        P = self.graph2.findAllDistances()
+        inds = Util.argsort(self.graph2.getAllVertexIds())
+        P = self.graph2.findAllDistances()[inds, :][:, inds]
 
         P2 = numpy.zeros((self.graph.size, self.graph.size))
         P2[0, :] = numpy.array([0, 1, 2, 2, 1, numpy.inf])
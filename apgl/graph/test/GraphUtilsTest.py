@@ -169,6 +169,20 @@ class AbstractMatrixGraphTest(unittest.TestCase):
         Ws = scipy.sparse.csr_matrix(W)
         self.assertEquals(GraphUtils.kwayNormalisedCut(Ws, clustering), 0.0)
 
+        #Compare with the cut computed from submatrices
+        numVertices = 30
+        W = numpy.random.rand(numVertices, numVertices) < 0.2
+        W = numpy.array(W + W.T, numpy.float)
+        clustering = numpy.random.randint(0, 4, numVertices)
+        Q = 0
+        for i in numpy.unique(clustering):
+            inds = clustering == i
+            Q += W[inds, :][:, numpy.logical_not(inds)].sum()/W[inds, :].sum()
+        Q /= numpy.unique(clustering).shape[0]
+
+        self.assertAlmostEquals(GraphUtils.kwayNormalisedCut(W, clustering), Q)
+        self.assertAlmostEquals(GraphUtils.kwayNormalisedCut(scipy.sparse.csr_matrix(W), clustering), Q)
+
     def testShiftLaplacian(self):
         numVertices = 10
         numFeatures = 0
@@ -263,7 +277,60 @@ class AbstractMatrixGraphTest(unittest.TestCase):
         self.assertEquals(GraphUtils.randIndex(clustering1, clustering2), 1/3.0) 
         
         clustering2 = numpy.array([1, 2, 2, 1, 1, 2])
-        self.assertEquals(GraphUtils.randIndex(clustering1, clustering2), 16/30.0) 
+        self.assertEquals(GraphUtils.randIndex(clustering1, clustering2), 16/30.0)
+
+        #Compare with the fraction of disagreeing pairs
+        numVertices = 50
+        clustering1 = numpy.random.randint(0, 5, numVertices)
+        clustering2 = numpy.random.randint(10, 13, numVertices)
+        error = 0
+        for i in range(numVertices):
+            error += ((clustering1[i] == clustering1) != (clustering2[i] == clustering2)).sum()
+
+        self.assertAlmostEquals(GraphUtils.randIndex(clustering1, clustering2), float(error)/(numVertices*(numVertices-1)))
+
+    def testContingencyTable(self):
+        clustering1 = numpy.array([1, 1, 1, 2, 2, 5])
+        clustering2 = numpy.array([0, 0, 3, 3, 3, 3])
+
+        N = GraphUtils.contingencyTable(clustering1, clustering2)
+        nptst.assert_array_equal(N.toarray(), numpy.array([[2, 1], [0, 2], [0, 1]]))
+
+        self.assertRaises(ValueError, GraphUtils.contingencyTable, clustering1, clustering2[1:])
+
+    def testAdjustedRandIndex(self):
+        clustering1 = numpy.array([1, 1, 1, 2, 2, 2])
+        clustering2 = numpy.array([2, 2, 2, 1, 1, 1])
+        self.assertEquals(GraphUtils.adjustedRandIndex(clustering1, clustering2), 1.0)
+
+        #Index 2, expected index 6*3/15 and maximum index 4.5
+        clustering1 = numpy.array([0, 0, 0, 1, 1, 1])
+        clustering2 = numpy.array([0, 0, 1, 1, 2, 2])
+        self.assertAlmostEquals(GraphUtils.adjustedRandIndex(clustering1, clustering2), (2 - 6*3/15.0)/(4.5 - 6*3/15.0))
+
+        self.assertEquals(GraphUtils.adjustedRandIndex(numpy.zeros(5), numpy.zeros(5)), 1.0)
+
+        #Random clusterings have an index close to 0
+        clustering1 = numpy.random.randint(0, 5, 10000)
+        clustering2 = numpy.random.randint(0, 5, 10000)
+        self.assertAlmostEquals(GraphUtils.adjustedRandIndex(clustering1, clustering2), 0.0, 2)
+
+    def testNormalisedMutualInformation(self):
+        clustering1 = numpy.array([1, 1, 1, 2, 2, 2])
+        clustering2 = numpy.array([2, 2, 2, 1, 1, 1])
+        self.assertAlmostEquals(GraphUtils.normalisedMutualInformation(clustering1, clustering2), 1.0)
+
+        clustering2 = numpy.array([1, 1, 1, 1, 1, 1])
+        self.assertEquals(GraphUtils.normalisedMutualInformation(clustering1, clustering2), 0.0)
+        self.assertEquals(GraphUtils.normalisedMutualInformation(clustering2, clustering2), 1.0)
+
+        #Compare with a direct computation
+        clustering1 = numpy.array([0, 0, 0, 1, 1, 1])
+        clustering2 = numpy.array([0, 0, 1, 1, 2, 2])
+        I = 2*(1/3.0)*numpy.log(2)
+        H1 = numpy.log(2)
+        H2 = numpy.log(3)
+        self.assertAlmostEquals(GraphUtils.normalisedMutualInformation(clustering1, clustering2), 2*I/(H1+H2))
 
     @unittest.skip("")
     def testModularityMatrix(self): 
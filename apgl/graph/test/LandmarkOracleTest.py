@@ -0,0 +1,163 @@
+
+import unittest
+import os
+import shutil
+import tempfile
+import numpy
+import numpy.testing as nptst
+import scipy.sparse.csgraph
+from apgl.graph.LandmarkOracle import LandmarkOracle
+from apgl.graph.PathFinder import PathFinder
+from apgl.graph.SparseGraph import SparseGraph
+from apgl.graph.DictGraph import DictGraph
+from apgl.graph.GeneralVertexList import GeneralVertexList
+from apgl.generator.ErdosRenyiGenerator import ErdosRenyiGenerator
+from apgl.graph.test.PathFinderTest import weightedGraphs
+from apgl.util.PathDefaults import PathDefaults
+
+class LandmarkOracleTest(unittest.TestCase):
+    def setUp(self):
+        self.numVertices = 60
+        self.graphs = weightedGraphs(self.numVertices)
+
+    def checkBounds(self, oracle, P):
+        sources, targets = numpy.nonzero(numpy.ones(P.shape))
+        lowerBounds, upperBounds = oracle.pairBounds(sources, targets)
+
+        self.assertTrue((lowerBounds <= P[sources, targets] + 10**-5).all())
+        self.assertTrue((upperBounds >= P[sources, targets] - 10**-5).all())
+        nptst.assert_array_equal(oracle.distances(sources, targets), upperBounds)
+
+        #The bounds are exact from a landmark
+        for landmark in oracle.getLandmarks():
+            lowerBounds, upperBounds = oracle.pairBounds(numpy.ones(self.numVertices, numpy.int)*landmark, numpy.arange(self.numVertices))
+            nptst.assert_array_almost_equal(lowerBounds, P[landmark, :], 5)
+            nptst.assert_array_almost_equal(upperBounds, P[landmark, :], 5)
+
+    def testFromGraph(self):
+        for graph in self.graphs:
+            for useWeights in [True, False]:
+                P = graph.floydWarshall(useWeights)
+                oracle = LandmarkOracle.fromGraph(graph, 6, useWeights=useWeights)
+
+                self.assertEquals(oracle.getNumLandmarks(), 6)
+                self.assertEquals(oracle.getNumVertices(), self.numVertices)
+                self.assertEquals(oracle.isUndirected(), graph.isUndirected())
+                self.assertEquals(numpy.unique(oracle.getLandmarks()).shape[0], 6)
+                self.checkBounds(oracle, P)
+
+                if useWeights:
+                    self.assertEquals(oracle.fromTable.dtype, numpy.float64)
+                else:
+                    self.assertEquals(oracle.fromTable.dtype, numpy.int16)
+
+                lower, upper = oracle.bounds(4, 9)
+                self.assertTrue(lower <= P[4, 9] + 10**-5 <= upper + 2*10**-5)
+                self.assertEquals(oracle.distance(4, 9), upper)
+                self.assertEquals(oracle.bounds(7, 7), (0, 0))
+
+        #Large components get a landmark before the periphery of the largest one
+        graph = SparseGraph(GeneralVertexList(13))
+        graph.addEdges(numpy.c_[numpy.r_[0:5, 6:11], numpy.r_[1:6, 7:12]])
+        oracle = LandmarkOracle.fromGraph(graph, 3)
+        landmarks = oracle.getLandmarks()
+        self.assertEquals(set(landmarks[0:2]//6), set([0, 1]))
+        self.assertTrue(landmarks[2] in [0, 5, 6, 11])
+        self.assertTrue(12 not in landmarks)
+        self.assertEquals(oracle.bounds(2, 9), (numpy.inf, numpy.inf))
+        self.assertEquals(oracle.bounds(3, 12), (numpy.inf, numpy.inf))
+
+        oracle = LandmarkOracle.fromGraph(graph, 13)
+        nptst.assert_array_equal(numpy.sort(oracle.getLandmarks()), numpy.arange(13))
+
+        graph = self.graphs[0]
+
+        #No landmarks give trivial bounds
+        oracle = LandmarkOracle.fromGraph(graph, 0)
+        self.assertEquals(oracle.bounds(2, 3), (0, numpy.inf))
+
+        self.assertRaises(ValueError, LandmarkOracle.fromGraph, graph, self.numVertices+1)
+        self.assertRaises(ValueError, LandmarkOracle.fromGraph, DictGraph())
+
+    def testBoundsRounding(self):
+        #The bounds hold exactly for the rounded distances of weighted graphs
+        for seed in range(5):
+            for undirected in [True, False]:
+                generator = ErdosRenyiGenerator(0.05)
+                generator.setSeed(seed)
+                graph = generator.generate(SparseGraph(GeneralVertexList(100), undirected))
+                edges = graph.getAllEdges()
+                graph.addEdges(edges, numpy.random.default_rng(seed).random(edges.shape[0])*10 + 0.01)
+
+                P = scipy.sparse.csgraph.dijkstra(PathFinder.weightMatrix(graph))
+                oracle = LandmarkOracle.fromGraph(graph, 8)
+                sources, targets = numpy.nonzero(numpy.ones(P.shape))
+                lowerBounds, upperBounds = oracle.pairBounds(sources, targets)
+
+                self.assertTrue((lowerBounds <= P[sources, targets]).all())
+                self.assertTrue((upperBounds >= P[sources, targets]).all())
+
+    def testLandmarks(self):
+        landmarks = numpy.array([0, 5, 20, 33, 5])
+
+        for graph in self.graphs:
+            for useWeights in [True, False]:
+                P = graph.floydWarshall(useWeights)
+                oracle = LandmarkOracle.fromGraph(graph, landmarks=landmarks, useWeights=useWeights)
+                oracle2 = LandmarkOracle.fromGraph(graph, landmarks=landmarks, useWeights=useWeights, numProcesses=2)
+
+                nptst.assert_array_equal(oracle.getLandmarks(), landmarks)
+                nptst.assert_array_equal(oracle.fromTable, oracle2.fromTable)
+                nptst.assert_array_equal(oracle.toTable, oracle2.toTable)
+                self.checkBounds(oracle, P)
+
+                fromDistances, toDistances = oracle.getDistanceTables()
+                nptst.assert_array_almost_equal(fromDistances, P[landmarks, :], 5)
+                if graph.isUndirected():
+                    self.assertEquals(toDistances, None)
+                else:
+                    nptst.assert_array_almost_equal(toDistances, P[:, landmarks].T, 5)
+
+                #The tables can be used to direct the search of a PathFinder
+                pathFinder = PathFinder(graph, useWeights)
+                pathFinder.setLandmarkDistances(fromDistances, toDistances)
+                nptst.assert_array_almost_equal(pathFinder.distances([1, 2, 3], [40, 50, 2]), P[[1, 2, 3], [40, 50, 2]])
+
+        #Precomputed distances are stored compactly
+        oracle = LandmarkOracle([0, 1], numpy.array([[0, 1, numpy.inf], [1, 0, numpy.inf]]))
+        self.assertEquals(oracle.fromTable.dtype, numpy.int16)
+        self.assertEquals(oracle.bounds(0, 2), (numpy.inf, numpy.inf))
+        oracle = LandmarkOracle([0, 1], numpy.array([[0, 1, 10**5], [1, 0, 10**5]]))
+        self.assertEquals(oracle.fromTable.dtype, numpy.int32)
+        self.assertEquals(oracle.bounds(1, 2), (10**5, 10**5))
+
+        self.assertRaises(ValueError, LandmarkOracle, [0, 3], numpy.zeros((2, 3)))
+        self.assertRaises(ValueError, LandmarkOracle, [0], numpy.zeros((2, 3)))
+        self.assertRaises(ValueError, LandmarkOracle, [0], numpy.zeros((1, 3)), numpy.zeros((1, 2)))
+        self.assertRaises(ValueError, oracle.bounds, 0, 3)
+        self.assertRaises(ValueError, oracle.pairBounds, [0, 1], [1])
+
+    def testSaveLoad(self):
+        directory = tempfile.mkdtemp(dir=PathDefaults.getTempDir())
+
+        try:
+            for graph in self.graphs:
+                for useWeights in [True, False]:
+                    filename = os.path.join(directory, "graph")
+                    graph.save(filename)
+                    oracle = LandmarkOracle.fromGraph(graph, 4, useWeights=useWeights)
+                    self.assertEquals(oracle.save(filename), filename + ".dor.npz")
+
+                    oracle2 = LandmarkOracle.load(filename)
+                    nptst.assert_array_equal(oracle2.getLandmarks(), oracle.getLandmarks())
+                    nptst.assert_array_equal(oracle2.fromTable, oracle.fromTable)
+                    nptst.assert_array_equal(oracle2.toTable, oracle.toTable)
+                    self.assertEquals(oracle2.fromTable.dtype, oracle.fromTable.dtype)
+                    self.assertEquals(oracle2.isUndirected(), graph.isUndirected())
+                    self.assertEquals(SparseGraph.load(filename).getNumEdges(), graph.getNumEdges())
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
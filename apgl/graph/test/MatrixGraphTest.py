@@ -1,3 +1,4 @@
+from apgl.graph.AbstractGraph import AbstractGraph
 from apgl.graph.VertexList import VertexList
 from apgl.graph.GeneralVertexList import GeneralVertexList
 from apgl.generator.BarabasiAlbertGenerator import BarabasiAlbertGenerator
@@ -84,6 +85,19 @@ class MatrixGraphTest():
         edgeValues = numpy.array([0.1, 0.0])
         self.assertRaises(ValueError, graph.addEdges, edgeIndexArray, edgeValues)
 
+        #Repeated edges take the last value and existing edges are overwritten
+        edgeIndexArray = numpy.array([[0, 4], [2, 3], [4, 0], [1, 1]])
+        graph.addEdges(edgeIndexArray, numpy.array([0.5, 0.3, 0.7, 2]))
+        self.assertEquals(graph.getEdge(0, 4), 0.7)
+        self.assertEquals(graph.getEdge(4, 0), 0.7)
+        self.assertEquals(graph.getEdge(3, 2), 0.3)
+        self.assertEquals(graph.getEdge(1, 2), 0.1)
+        self.assertEquals(graph.getEdge(1, 1), 2)
+        self.assertEquals(graph.getNumEdges(), 4)
+
+        graph.addEdges(numpy.zeros((0, 2), numpy.int))
+        self.assertEquals(graph.getNumEdges(), 4)
+
     def testRemoveEdge(self):
         self.graph.addEdge(1, 5, 2)
 
@@ -155,6 +169,44 @@ class MatrixGraphTest():
         self.assertTrue((graph.neighbourOf(3) == numpy.array([1, 2])).all())
         self.assertTrue((graph.neighbourOf(9) == numpy.array([])).all())
 
+    def testNeighboursOfMany(self):
+        numVertices = 10
+        numFeatures = 3
+        vList = VertexList(numVertices, numFeatures)
+
+        for undirected in [True, False]:
+            graph = self.GraphType(vList, undirected)
+            graph.addEdge(1, 5, 2)
+            graph.addEdge(1, 3, 5)
+            graph.addEdge(9, 1, 1)
+            graph.addEdge(2, 3, 2)
+
+            inds = numpy.array([3, 1, 4, 1, 9])
+            indptr, neighbours = graph.neighboursOfMany(inds)
+            self.assertEqual(indptr.shape[0], inds.shape[0]+1)
+
+            for i in range(inds.shape[0]):
+                nptst.assert_array_equal(numpy.sort(neighbours[indptr[i]:indptr[i+1]]), numpy.sort(graph.neighbours(inds[i])))
+
+            indptr, neighbours = graph.inNeighboursOfMany(inds)
+
+            for i in range(inds.shape[0]):
+                nptst.assert_array_equal(numpy.sort(neighbours[indptr[i]:indptr[i+1]]), numpy.sort(graph.neighbourOf(inds[i])))
+
+            #Cached structures are updated after the graph changes
+            graph.addEdge(4, 3)
+            graph.removeEdge(1, 3)
+            indptr, neighbours = graph.inNeighboursOfMany(numpy.array([3]))
+            nptst.assert_array_equal(numpy.sort(neighbours), numpy.sort(graph.neighbourOf(3)))
+            nptst.assert_array_equal(numpy.sort(graph.neighbourOf(3)), numpy.array([2, 4]))
+
+            indptr, neighbours = graph.neighboursOfMany(numpy.array([], numpy.int))
+            nptst.assert_array_equal(indptr, numpy.array([0]))
+            self.assertEqual(neighbours.shape[0], 0)
+
+            self.assertRaises(ValueError, graph.neighboursOfMany, numpy.array([10]))
+            self.assertRaises(ValueError, graph.inNeighboursOfMany, numpy.array([-1]))
+
     def testClusteringCoefficient(self):
         numVertices = 3
         numFeatures = 1
@@ -497,6 +549,40 @@ class MatrixGraphTest():
         edges = graph.getAllEdges()
         self.assertEquals(edges.shape, (0, 2))
 
+    def testIterEdges(self):
+        numVertices = 5
+        numFeatures = 1
+        vList = VertexList(numVertices, numFeatures)
+
+        for undirected in [True, False]:
+            graph = self.GraphType(vList, undirected)
+            graph.addEdge(0, 1, 5)
+            graph.addEdge(1, 2, 2)
+            graph.addEdge(2, 3, 3)
+            graph.addEdge(2, 2, 4)
+            graph.addEdge(4, 0, 0.5)
+
+            edges = graph.getAllEdges()
+            values = graph.getEdgeValues(edges)
+
+            for chunkSize in [1, 2, 3, 100]:
+                blocks = list(graph.iterEdges(chunkSize))
+                self.assertTrue(all(rows.shape[0] <= chunkSize for rows, cols, vals in blocks))
+
+                rows = numpy.concatenate([block[0] for block in blocks])
+                cols = numpy.concatenate([block[1] for block in blocks])
+                vals = numpy.concatenate([block[2] for block in blocks])
+                nptst.assert_array_equal(numpy.c_[rows, cols], edges)
+                nptst.assert_array_equal(vals, values)
+
+            blocks = list(graph.iterEdges(2, withValues=False))
+            self.assertEquals(len(blocks[0]), 2)
+            nptst.assert_array_equal(numpy.concatenate([cols for rows, cols in blocks]), edges[:, 1])
+
+        graph = self.GraphType(vList)
+        self.assertEquals(list(graph.iterEdges()), [])
+        self.assertRaises(ValueError, list, graph.iterEdges(0))
+
     def testGetNumEdges(self):
         numVertices = 10
         numFeatures = 3
@@ -560,6 +646,29 @@ class MatrixGraphTest():
 
         self.assertEquals(graph.getEdge(4, 4), None)
 
+    def testGetEdgeValues(self):
+        numVertices = 10
+
+        for undirected in [True, False]:
+            graph = self.GraphType(GeneralVertexList(numVertices), undirected)
+            graph.addEdge(2, 5, 1)
+            graph.addEdge(4, 8, 34)
+            graph.addEdge(9, 9, -2)
+            graph.addEdge(0, 9, 0.5)
+
+            edges = numpy.array([[2, 5], [5, 2], [4, 8], [9, 9], [0, 9], [4, 4], [9, 0], [0, 0]])
+            values = numpy.array([graph.getEdge(i, j) if graph.getEdge(i, j) is not None else 0 for i, j in edges])
+            nptst.assert_array_equal(graph.getEdgeValues(edges), values)
+
+            edges = graph.getAllEdges()
+            nptst.assert_array_equal(graph.getEdgeValues(edges), numpy.array([graph.getEdge(i, j) for i, j in edges]))
+            self.assertEquals(graph.getEdgeValues(numpy.zeros((0, 2), numpy.int)).shape[0], 0)
+            self.assertRaises(ValueError, graph.getEdgeValues, numpy.array([[0, numVertices]]))
+
+        #Edge values are found after removing edges
+        graph.removeEdge(0, 9)
+        nptst.assert_array_equal(graph.getEdgeValues(numpy.array([[0, 9], [4, 8]])), numpy.array([0, 34]))
+
     def testGetVertex(self):
         numVertices = 10
         numFeatures = 3
@@ -680,6 +789,61 @@ class MatrixGraphTest():
         self.assertTrue(subgraph.getEdge(1, 3) == 1)
 
         subgraph = graph.subgraph([])
+        
+        #Test with an array of unsorted indices and invalid indices 
+        subgraph = graph.subgraph(numpy.array([6, 2, 1, 5]))
+        self.assertEquals(subgraph.getNumVertices(), 4)
+        self.assertEquals(subgraph.getNumEdges(), 3)
+        self.assertTrue(subgraph.getEdge(1, 0) == 1)
+        
+        self.assertRaises(ValueError, graph.subgraph, [1, 10])
+        self.assertRaises(ValueError, graph.subgraph, [-1, 2])
+        self.assertRaises(ValueError, graph.subgraph, [1.0, 2.0])
+
+    def testSubgraphIndexMap(self): 
+        numVertices = 10
+        graph = self.GraphType(GeneralVertexList(numVertices))
+        graph.addEdge(0, 1)
+        graph.addEdge(2, 5)
+        graph.addEdge(5, 6)
+        
+        indexMap = graph.subgraphIndexMap([6, 2, 5, 2])
+        nptst.assert_array_equal(indexMap, numpy.array([-1, -1, 0, -1, -1, 1, 2, -1, -1, -1]))
+        
+        subgraph = graph.subgraph([6, 2, 5, 2])
+        edges = graph.getAllEdges()
+        edges = indexMap[edges]
+        edges = edges[(edges >= 0).all(1), :]
+        
+        for i in range(edges.shape[0]): 
+            self.assertEquals(subgraph.getEdge(edges[i, 0], edges[i, 1]), 1)
+        self.assertEquals(edges.shape[0], subgraph.getNumEdges())
+        
+        self.assertRaises(ValueError, graph.subgraphIndexMap, [11])
+
+    def testSubgraphView(self): 
+        numVertices = 10
+        graph = self.GraphType(GeneralVertexList(numVertices), False)
+        graph.addEdge(0, 1, 0.5)
+        graph.addEdge(0, 2)
+        graph.addEdge(2, 1)
+        graph.addEdge(2, 5)
+        graph.addEdge(6, 9)
+        graph.setVertex(2, "abc")
+        
+        view = graph.subgraphView([2, 0, 1, 9])
+        subgraph = graph.subgraph([2, 0, 1, 9])
+        
+        self.assertEquals(view.getNumVertices(), subgraph.getNumVertices())
+        self.assertEquals(view.getNumEdges(), subgraph.getNumEdges())
+        self.assertEquals(view.getEdge(0, 1), 0.5)
+        self.assertEquals(view.getVertex(2), "abc")
+        nptst.assert_array_equal(view.neighbours(2), numpy.array([1]))
+        nptst.assert_array_equal(view.outDegreeSequence(), numpy.array([2, 0, 1, 0]))
+        nptst.assert_array_equal(view.inDegreeSequence(), numpy.array([0, 2, 1, 0]))
+        
+        subgraph2 = view.toGraph() 
+        nptst.assert_array_equal(subgraph2.getWeightMatrix(), subgraph.getWeightMatrix())
 
     def testAdd(self):
         numVertices = 5
@@ -813,6 +977,42 @@ class MatrixGraphTest():
         self.assertEquals(graph.depthFirstSearch(7), [7])
         
 
+    def testSearchAfterEdit(self):
+        vList = VertexList(5, 0)
+        graph = self.GraphType(vList)
+        graph.addEdge(0, 1)
+        graph.addEdge(3, 4)
+
+        self.assertEquals(graph.breadthFirstSearch(0), [0, 1])
+        self.assertEquals(graph.depthFirstSearch(0), [0, 1])
+        self.assertEquals(len(graph.findConnectedComponents()), 3)
+        self.assertEquals(graph.getNumEdges(), 2)
+
+        graph.addEdge(1, 2)
+        self.assertEquals(graph.breadthFirstSearch(0), [0, 1, 2])
+        self.assertEquals(graph.depthFirstSearch(0), [0, 1, 2])
+        self.assertEquals(len(graph.findConnectedComponents()), 2)
+        self.assertEquals(graph.getNumEdges(), 3)
+
+        graph.removeEdge(0, 1)
+        self.assertEquals(graph.breadthFirstSearch(0), [0])
+        self.assertEquals(len(graph.findConnectedComponents()), 3)
+        self.assertEquals(graph.getNumEdges(), 2)
+
+        #A subclass which writes the weight matrix in place clears the cached values
+        graph.breadthFirstSearch(2)
+        graph.W[2, 3] = 1
+        graph.W[3, 2] = 1
+        graph._clearCache()
+        graph._clearEdgeCounts()
+        self.assertEquals(graph.breadthFirstSearch(2), [2, 1, 3, 4])
+        self.assertEquals(graph.getNumEdges(), 3)
+        nptst.assert_array_equal(graph.diagonal(), numpy.zeros(5))
+
+        graph.setWeightMatrix(numpy.zeros((5, 5)))
+        self.assertEquals(graph.breadthFirstSearch(2), [2])
+        self.assertEquals(graph.getNumEdges(), 0)
+
     def testBreadthFirstSearch(self):
         numVertices = 10
         numFeatures = 0
@@ -834,6 +1034,108 @@ class MatrixGraphTest():
         self.assertEquals(graph.breadthFirstSearch(4), [4, 5])
         self.assertEquals(graph.breadthFirstSearch(5), [5, 4])
         self.assertEquals(graph.breadthFirstSearch(7), [7, 0, 8, 9, 1, 2, 3, 6])        
+
+    def testIterSearch(self):
+        numVertices = 10
+        numFeatures = 0
+        vList = VertexList(numVertices, numFeatures)
+
+        graph = self.GraphType(vList)
+        graph.addEdge(0, 1)
+        graph.addEdge(0, 7)
+        graph.addEdge(7, 8)
+        graph.addEdge(7, 9)
+        graph.addEdge(1, 2)
+        graph.addEdge(1, 3)
+        graph.addEdge(2, 6)
+        graph.addEdge(4, 5)
+
+        self.assertEquals([v for v, d, p in graph.iterBreadthFirst(0)], graph.breadthFirstSearch(0))
+        self.assertEquals([v for v, d, p in graph.iterDepthFirst(0)], graph.depthFirstSearch(0))
+        self.assertEquals([v for v, d, p in graph.iterBreadthFirst(4)], [4, 5])
+
+        order, parents, depths = graph.breadthFirstSearchArrays(0)
+        for vertex, depth, parent in graph.iterBreadthFirst(0):
+            self.assertEquals(depth, depths[vertex])
+            self.assertEquals(parent, None if vertex == 0 else parents[vertex])
+
+        self.assertEquals(list(graph.iterDepthFirst(0, 1)), [(0, 0, None), (1, 1, 0), (7, 1, 0)])
+        self.assertEquals(list(graph.iterBreadthFirst(6, 1)), [(6, 0, None), (2, 1, 6)])
+
+        #Stop early, and only expand vertices with index less than 3
+        iterator = graph.iterBreadthFirst(0)
+        self.assertEquals(next(iterator), (0, 0, None))
+        self.assertEquals(next(iterator), (1, 1, 0))
+
+        expandFunc = lambda vertex, depth, neighbours: [i for i in neighbours if i < 3]
+        self.assertEquals([v for v, d, p in graph.iterBreadthFirst(0, expandFunc=expandFunc)], [0, 1, 2])
+        self.assertEquals([v for v, d, p in graph.iterDepthFirst(0, expandFunc=expandFunc)], [0, 1, 2])
+
+        self.assertRaises(ValueError, graph.iterBreadthFirst, 10)
+        self.assertRaises(ValueError, graph.iterDepthFirst, 0, -1)
+
+    def testSearchArrays(self):
+        numVertices = 10
+        numFeatures = 0
+        vList = VertexList(numVertices, numFeatures)
+
+        graph = self.GraphType(vList)
+        graph.addEdge(0, 1)
+        graph.addEdge(0, 7)
+        graph.addEdge(7, 8)
+        graph.addEdge(7, 9)
+        graph.addEdge(1, 2)
+        graph.addEdge(1, 3)
+        graph.addEdge(2, 6)
+        graph.addEdge(4, 5)
+
+        order, parents, depths = graph.breadthFirstSearchArrays(0)
+        nptst.assert_array_equal(order, numpy.array([0, 1, 7, 2, 3, 8, 9, 6]))
+        nptst.assert_array_equal(parents, numpy.array([-1, 0, 1, 1, -1, -1, 2, 0, 7, 7]))
+        nptst.assert_array_equal(depths, numpy.array([0, 1, 2, 2, -1, -1, 3, 1, 2, 2]))
+
+        order, parents, depths = graph.depthFirstSearchArrays(0)
+        nptst.assert_array_equal(order, numpy.array([0, 1, 2, 6, 3, 7, 8, 9]))
+        nptst.assert_array_equal(parents, numpy.array([-1, 0, 1, 1, -1, -1, 2, 0, 7, 7]))
+        nptst.assert_array_equal(depths, numpy.array([0, 1, 2, 2, -1, -1, 3, 1, 2, 2]))
+
+        #Multiple roots
+        order, parents, depths = graph.breadthFirstSearchArrays(numpy.array([6, 4, 6]))
+        nptst.assert_array_equal(order, numpy.array([6, 4, 2, 5, 1, 0, 3, 7, 8, 9]))
+        self.assertEquals(depths[5], 1)
+        self.assertEquals(depths[0], 3)
+        self.assertEquals(parents[4], -1)
+
+        order, parents, depths = graph.depthFirstSearchArrays(numpy.array([4, 8]))
+        nptst.assert_array_equal(order, numpy.array([4, 5, 8, 7, 0, 1, 2, 6, 3, 9]))
+
+        #Depth limited searches
+        order, parents, depths = graph.breadthFirstSearchArrays(0, 1)
+        nptst.assert_array_equal(order, numpy.array([0, 1, 7]))
+        order, parents, depths = graph.depthFirstSearchArrays(0, 2)
+        nptst.assert_array_equal(order, numpy.array([0, 1, 2, 3, 7, 8, 9]))
+        order, parents, depths = graph.depthFirstSearchArrays(0, 0)
+        nptst.assert_array_equal(order, numpy.array([0]))
+
+        self.assertRaises(ValueError, graph.breadthFirstSearchArrays, 10)
+        self.assertRaises(ValueError, graph.depthFirstSearchArrays, 0, -1)
+
+        #Search results are updated when edges change
+        graph.addEdge(5, 9)
+        order, parents, depths = graph.breadthFirstSearchArrays(4)
+        self.assertEquals(order.shape[0], 10)
+
+        #Directed graphs
+        graph = self.GraphType(vList, False)
+        graph.addEdge(0, 1)
+        graph.addEdge(1, 2)
+        graph.addEdge(3, 1)
+
+        order, parents, depths = graph.depthFirstSearchArrays(1)
+        nptst.assert_array_equal(order, numpy.array([1, 2]))
+        order, parents, depths = graph.breadthFirstSearchArrays(numpy.array([0, 3]))
+        nptst.assert_array_equal(order, numpy.array([0, 3, 1, 2]))
+        nptst.assert_array_equal(parents[[1, 2]], numpy.array([0, 1]))
         
 
     def testDiameter(self):
@@ -1215,6 +1517,44 @@ class MatrixGraphTest():
         self.assertEquals(graph2.getEdge(1,0), 1)
         self.assertEquals(graph2.getNumEdges(), 95)
 
+    def testComplementView(self):
+        numVertices = 10
+
+        for undirected in [True, False]:
+            graph = self.GraphType(GeneralVertexList(numVertices), undirected)
+            graph.addEdge(0, 1, 0.1)
+            graph.addEdge(2, 1, 0.2)
+            graph.addEdge(4, 2, 0.5)
+            graph.addEdge(6, 7, 0.9)
+            graph.addEdge(3, 3, 1.1)
+
+            view = graph.complementView()
+            graph2 = graph.complement()
+
+            self.assertEquals(view.isUndirected(), undirected)
+            self.assertEquals(view.getNumVertices(), numVertices)
+            self.assertEquals(view.getNumEdges(), graph2.getNumEdges())
+            self.assertEquals(view.getNumDirEdges(), graph2.getNumDirEdges())
+            self.assertEquals(view.getEdge(0, 1), None)
+            self.assertEquals(view.getEdge(3, 3), None)
+            self.assertEquals(view.getEdge(0, 0), 1)
+
+            for i in range(numVertices):
+                nptst.assert_array_equal(view.neighbours(i), numpy.sort(graph2.neighbours(i)))
+                nptst.assert_array_equal(view.neighbourOf(i), numpy.sort(graph2.neighbourOf(i)))
+
+            nptst.assert_array_equal(view.outDegreeSequence(), graph2.outDegreeSequence())
+            nptst.assert_array_equal(view.inDegreeSequence(), graph2.inDegreeSequence())
+            nptst.assert_array_equal(view.diagonal(), graph2.diagonal())
+            nptst.assert_array_equal(view.getAllEdges(), graph2.getAllEdges())
+            nptst.assert_array_equal(view.toCsr().toarray(), graph2.adjacencyMatrix())
+            nptst.assert_array_equal(view.toGraph().getWeightMatrix(), graph2.getWeightMatrix())
+
+            if undirected:
+                nptst.assert_array_equal(view.degreeSequence(), graph2.degreeSequence())
+            else:
+                self.assertRaises(ValueError, view.degreeSequence)
+
     def testFindTrees(self):
         numVertices = 10
         numFeatures = 1
@@ -2045,6 +2385,15 @@ class MatrixGraphTest():
         graph = self.GraphType(vList, False)
         self.assertTrue(graph.isTree())
 
+        #A root and a disjoint cycle is not a tree
+        numVertices = 4
+        vList = VertexList(numVertices, numFeatures)
+        graph = self.GraphType(vList, False)
+        graph.addEdge(0, 1)
+        graph.addEdge(2, 3)
+        graph.addEdge(3, 2)
+        self.assertFalse(graph.isTree())
+
     def testBetweenness(self):
         tol = 10**-6
         numVertices = 5
@@ -2230,6 +2579,80 @@ class MatrixGraphTest():
         graph.addEdge(1, 1)
         self.assertTrue((graph.degreeSequence() == [4, 5, 1, 1, 1]).all())
 
+        #Cached degrees are not changed by the caller, and are updated after edits
+        degrees = graph.outDegreeSequence()
+        degrees[0] = 10
+        nptst.assert_array_equal(graph.outDegreeSequence(), numpy.array([3, 4, 1, 1, 1]))
+        graph.removeEdge(0, 0)
+        nptst.assert_array_equal(graph.outDegreeSequence(), numpy.array([2, 4, 1, 1, 1]))
+        nptst.assert_array_equal(graph.inDegreeSequence(), numpy.array([2, 4, 1, 1, 1]))
+        self.assertEquals(graph.getNumEdges(), 5)
+        self.assertEquals(graph.getNumDirEdges(), 9)
+
+    def testEdgeCounts(self):
+        numVertices = 6
+        numFeatures = 0
+        vList = VertexList(numVertices, numFeatures)
+
+        AbstractGraph.setVerifyEdgeCounts(True)
+
+        try:
+            for undirected in [True, False]:
+                graph = self.GraphType(vList, undirected)
+                self.assertEquals(graph.getNumEdges(), 0)
+
+                graph.addEdge(0, 1)
+                graph.addEdge(0, 1, 2)
+                graph.addEdge(2, 2)
+                graph.addEdge(1, 0)
+                self.assertEquals(graph.getNumEdges(), 2 if undirected else 3)
+                self.assertEquals(graph.getNumDirEdges(), 3 if undirected else 3)
+
+                edges = numpy.array([[3, 4], [4, 3], [3, 4], [5, 5], [0, 1]])
+                graph.addEdges(edges)
+                self.assertEquals(graph.getNumEdges(), 4 if undirected else 6)
+                self.assertEquals(graph.getNumDirEdges(), 6 if undirected else 6)
+
+                graph.removeEdge(2, 2)
+                graph.removeEdge(3, 4)
+                graph.removeEdge(3, 4)
+                self.assertEquals(graph.getNumEdges(), 2 if undirected else 4)
+
+                graph.removeAllEdges()
+                self.assertEquals(graph.getNumEdges(), 0)
+                graph.addEdge(1, 2)
+                self.assertEquals(graph.getNumDirEdges(), 2 if undirected else 1)
+
+                #The counts are recomputed after the weight matrix is replaced
+                W = graph.getWeightMatrix().copy()
+                W[3, 3] = 1
+                graph.setWeightMatrix(W)
+                self.assertEquals(graph.getNumDirEdges(), 3 if undirected else 2)
+
+            #Verification finds counts which are out of date
+            graph.getNumEdges()
+            graph.W[4, 5] = 1
+            self.assertRaises(ValueError, graph.getNumEdges)
+        finally:
+            AbstractGraph.setVerifyEdgeCounts(False)
+
+    def testDiagonal(self):
+        numVertices = 5
+        numFeatures = 0
+        vList = VertexList(numVertices, numFeatures)
+
+        for undirected in [True, False]:
+            graph = self.GraphType(vList, undirected)
+            graph.addEdge(0, 1, 0.1)
+            nptst.assert_array_equal(graph.diagonal(), numpy.zeros(numVertices))
+
+            graph.addEdge(2, 2, 0.5)
+            graph.addEdge(4, 4, 2)
+            nptst.assert_array_equal(graph.diagonal(), numpy.array([0, 0, 0.5, 0, 2]))
+
+            graph.removeEdge(2, 2)
+            nptst.assert_array_equal(graph.diagonal(), numpy.array([0, 0, 0, 0, 2]))
+
     def testAdjacencyList(self):
         numVertices = 5
         numFeatures = 0
@@ -0,0 +1,103 @@
+
+import unittest
+import numpy
+import numpy.testing as nptst
+from apgl.graph.PathFinder import PathFinder
+from apgl.graph.SparseGraph import SparseGraph
+from apgl.graph.DenseGraph import DenseGraph
+from apgl.graph.DictGraph import DictGraph
+from apgl.graph.GeneralVertexList import GeneralVertexList
+from apgl.generator.ErdosRenyiGenerator import ErdosRenyiGenerator
+
+def weightedGraphs(numVertices, seed=21):
+    """
+    Return an undirected and a directed sparse graph with several components
+    and random edge weights, both generated from the given seed.
+    """
+    graphs = []
+    random = numpy.random.default_rng(seed)
+
+    for undirected in [True, False]:
+        generator = ErdosRenyiGenerator(0.04)
+        generator.setSeed(seed)
+        graph = generator.generate(SparseGraph(GeneralVertexList(numVertices), undirected))
+        edges = graph.getAllEdges()
+        graph.addEdges(edges, random.integers(1, 5, edges.shape[0])*random.random(edges.shape[0]))
+        graphs.append(graph)
+
+    return graphs
+
+class PathFinderTest(unittest.TestCase):
+    def setUp(self):
+        self.numVertices = 60
+        self.graphs = weightedGraphs(self.numVertices)
+
+    def checkPaths(self, pathFinder, P):
+        sources = numpy.random.randint(0, self.numVertices, 100)
+        targets = numpy.random.randint(0, self.numVertices, 100)
+        nptst.assert_array_almost_equal(pathFinder.distances(sources, targets), P[sources, targets])
+
+        for i in range(sources.shape[0]):
+            distance, path = pathFinder.shortestPath(sources[i], targets[i])
+            self.assertAlmostEquals(distance, P[sources[i], targets[i]])
+
+            if distance == numpy.inf:
+                self.assertEquals(path, [])
+            else:
+                self.assertEquals(path[0], sources[i])
+                self.assertEquals(path[-1], targets[i])
+                weights = [pathFinder.X[path[j], path[j+1]] for j in range(len(path)-1)]
+                self.assertTrue(numpy.all(numpy.array(weights) != 0))
+                self.assertAlmostEquals(numpy.sum(weights), distance)
+
+    def testDistance(self):
+        for graph in self.graphs:
+            for useWeights in [True, False]:
+                P = graph.floydWarshall(useWeights)
+                pathFinder = PathFinder(graph, useWeights)
+                self.checkPaths(pathFinder, P)
+
+                self.assertEquals(pathFinder.distance(3, 3), 0)
+                self.assertEquals(pathFinder.shortestPath(3, 3), (0, [3]))
+
+        #A directed path is only followed forwards
+        graph = DenseGraph(GeneralVertexList(4), False)
+        graph.addEdges(numpy.array([[0, 1], [1, 2], [2, 3]]), numpy.array([1.0, 2.0, 0.5]))
+        pathFinder = PathFinder(graph)
+        self.assertEquals(pathFinder.shortestPath(0, 3), (3.5, [0, 1, 2, 3]))
+        self.assertEquals(pathFinder.shortestPath(3, 0), (numpy.inf, []))
+
+        self.assertRaises(ValueError, pathFinder.distance, 0, 4)
+        self.assertRaises(ValueError, PathFinder, DictGraph())
+        graph.addEdge(0, 2, -1)
+        self.assertRaises(ValueError, PathFinder, graph)
+
+    def testSetLandmarks(self):
+        for graph in self.graphs:
+            for useWeights in [True, False]:
+                P = graph.floydWarshall(useWeights)
+                pathFinder = PathFinder(graph, useWeights)
+
+                pathFinder.setLandmarks(numpy.array([0, 5, 20]))
+                nptst.assert_array_equal(pathFinder.landmarks, [0, 5, 20])
+                nptst.assert_array_almost_equal(pathFinder.fromDistances, P[[0, 5, 20], :])
+                nptst.assert_array_almost_equal(pathFinder.toDistances, P[:, [0, 5, 20]].T)
+                self.checkPaths(pathFinder, P)
+
+                #Precomputed landmark distances 
+                pathFinder.setLandmarkDistances(P[[1, 2], :], P[:, [1, 2]].T)
+                self.assertEquals(pathFinder.landmarks, None)
+                self.checkPaths(pathFinder, P)
+
+                pathFinder.setLandmarks([])
+                self.assertEquals(pathFinder.fromDistances, None)
+                self.checkPaths(pathFinder, P)
+
+        pathFinder = PathFinder(self.graphs[1])
+        self.assertRaises(ValueError, pathFinder.setLandmarkDistances, numpy.zeros((2, self.numVertices)))
+        self.assertRaises(ValueError, pathFinder.setLandmarkDistances, numpy.zeros((2, 3)), numpy.zeros((2, 3)))
+        self.assertRaises(ValueError, pathFinder.setLandmarks, [self.numVertices])
+
+
+if __name__ == '__main__':
+    unittest.main()
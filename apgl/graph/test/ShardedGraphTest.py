@@ -0,0 +1,179 @@
+
+import unittest
+import os
+import shutil
+import tempfile
+import numpy
+import numpy.testing as nptst
+from apgl.graph.ShardedGraph import ShardedGraph
+from apgl.graph.SparseGraph import SparseGraph
+from apgl.graph.GeneralVertexList import GeneralVertexList
+from apgl.generator.ErdosRenyiGenerator import ErdosRenyiGenerator
+from apgl.util.PathDefaults import PathDefaults
+
+class ShardedGraphTest(unittest.TestCase):
+    def setUp(self):
+        numpy.random.seed(21)
+        self.directory = tempfile.mkdtemp(dir=PathDefaults.getTempDir())
+
+        self.numVertices = 50
+        self.graph = SparseGraph(GeneralVertexList(self.numVertices))
+        generator = ErdosRenyiGenerator(0.05)
+        generator.setSeed(21)
+        self.graph = generator.generate(self.graph)
+        self.graph.addEdge(3, 3, 0.5)
+        self.graph.addEdge(3, 7, 2.0)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testFromGraph(self):
+        for rowsPerShard in [1, 7, 100]:
+            shardedGraph = ShardedGraph.fromGraph(os.path.join(self.directory, str(rowsPerShard)), self.graph, rowsPerShard)
+
+            self.assertEquals(shardedGraph.getNumVertices(), self.numVertices)
+            self.assertEquals(shardedGraph.getNumEdges(), self.graph.getNumEdges())
+            self.assertEquals(shardedGraph.getNumDirEdges(), self.graph.getNumDirEdges())
+            self.assertEquals(shardedGraph.getNumShards(), int(numpy.ceil(self.numVertices/float(rowsPerShard))))
+            self.assertTrue(shardedGraph.isUndirected())
+
+            for i in range(self.numVertices):
+                nptst.assert_array_equal(shardedGraph.neighbours(i), numpy.sort(self.graph.neighbours(i)))
+
+            self.assertEquals(shardedGraph.getEdge(3, 3), 0.5)
+            self.assertEquals(shardedGraph.getEdge(7, 3), 2.0)
+            self.assertEquals(shardedGraph.getEdge(3, 7), self.graph.getEdge(3, 7))
+
+            #The graph can be opened again
+            shardedGraph = ShardedGraph(shardedGraph.directory)
+            self.assertEquals(shardedGraph.getNumEdges(), self.graph.getNumEdges())
+
+    def testFromEdgeBlocks(self):
+        edges = self.graph.getAllEdges()
+        values = self.graph.getEdgeValues(edges)
+        blocks = [(edges[0:20], values[0:20]), (edges[20:], values[20:])]
+        shardedGraph = ShardedGraph.fromEdgeBlocks(self.directory, self.numVertices, blocks, rowsPerShard=8)
+
+        self.assertEquals(shardedGraph.getNumEdges(), self.graph.getNumEdges())
+        for i in range(self.numVertices):
+            nptst.assert_array_equal(shardedGraph.neighbours(i), numpy.sort(self.graph.neighbours(i)))
+        self.assertEquals(shardedGraph.getEdge(7, 3), 2.0)
+
+        #Duplicate edges use the last value and blocks can be plain arrays
+        blocks = [numpy.array([[0, 1], [2, 1]]), (numpy.array([[1, 0], [4, 4]]), numpy.array([3.0, 1.0]))]
+        shardedGraph = ShardedGraph.fromEdgeBlocks(self.directory, 5, blocks, False, rowsPerShard=2)
+        self.assertFalse(shardedGraph.isUndirected())
+        self.assertEquals(shardedGraph.getNumEdges(), 4)
+        self.assertEquals(shardedGraph.getEdge(1, 0), 3.0)
+        self.assertEquals(shardedGraph.getEdge(0, 1), 1.0)
+        self.assertEquals(shardedGraph.getEdge(1, 2), None)
+
+        #The last value is used in both directions and zero values are ignored
+        blocks = [(numpy.array([[1, 0], [0, 1], [2, 3]]), numpy.array([2.0, 3.0, 1.0])), (numpy.array([[3, 2], [4, 4]]), numpy.array([0.0, 0.0]))]
+        shardedGraph = ShardedGraph.fromEdgeBlocks(self.directory, 5, blocks, rowsPerShard=2)
+        self.assertEquals(shardedGraph.getEdge(0, 1), 3.0)
+        self.assertEquals(shardedGraph.getEdge(1, 0), 3.0)
+        self.assertEquals(shardedGraph.getEdge(2, 3), 1.0)
+        self.assertEquals(shardedGraph.getEdge(3, 2), 1.0)
+        self.assertEquals(shardedGraph.getEdge(4, 4), None)
+        self.assertEquals(shardedGraph.getNumEdges(), 2)
+
+        #Use the blocks of a generator
+        generator = ErdosRenyiGenerator(0.1)
+        generator.setSeed(21)
+        shardedGraph = ShardedGraph.fromEdgeBlocks(self.directory, 100, generator.edgeBlocks(100, blockSize=50), rowsPerShard=30)
+        self.assertEquals(shardedGraph.getNumEdges(), generator.generateEdges(100).shape[0])
+
+        self.assertRaises(ValueError, ShardedGraph.fromEdgeBlocks, self.directory, 3, [numpy.array([[0, 3]])])
+
+    def testGetAllEdges(self):
+        shardedGraph = ShardedGraph.fromGraph(self.directory, self.graph, 8)
+        edges = numpy.concatenate(list(shardedGraph.getAllEdges()))
+
+        self.assertEquals(edges.shape[0], self.graph.getNumEdges())
+        self.assertTrue((edges[:, 0] >= edges[:, 1]).all())
+        nptst.assert_array_equal(self.graph.getEdgeValues(edges) != 0, True)
+
+    def testIterEdges(self):
+        for undirected in [True, False]:
+            self.graph.undirected = undirected
+            shardedGraph = ShardedGraph.fromGraph(os.path.join(self.directory, str(undirected)), self.graph, 8)
+            edges = self.graph.getAllEdges()
+
+            for chunkSize in [1, 10, 1000]:
+                blocks = list(shardedGraph.iterEdges(chunkSize))
+                rows = numpy.concatenate([block[0] for block in blocks])
+                cols = numpy.concatenate([block[1] for block in blocks])
+                values = numpy.concatenate([block[2] for block in blocks])
+
+                nptst.assert_array_equal(numpy.c_[rows, cols], edges)
+                nptst.assert_array_equal(values, self.graph.getEdgeValues(edges))
+
+            rows, cols = next(shardedGraph.iterEdges(withValues=False))
+            nptst.assert_array_equal(rows, edges[0:rows.shape[0], 0])
+
+    def testDegrees(self):
+        shardedGraph = ShardedGraph.fromGraph(self.directory, self.graph, 8)
+
+        nptst.assert_array_equal(shardedGraph.outDegreeSequence(), self.graph.outDegreeSequence())
+        nptst.assert_array_equal(shardedGraph.inDegreeSequence(), self.graph.inDegreeSequence())
+        nptst.assert_array_equal(shardedGraph.degreeSequence(), self.graph.degreeSequence())
+        nptst.assert_array_equal(shardedGraph.diagonal(), self.graph.diagonal())
+        nptst.assert_array_equal(shardedGraph.degreeDistribution(), self.graph.degreeDistribution())
+        nptst.assert_array_equal(shardedGraph.inDegreeDistribution(), self.graph.inDegreeDistribution())
+
+    def testSubgraph(self):
+        shardedGraph = ShardedGraph.fromGraph(self.directory, self.graph, 8)
+        inds = numpy.array([7, 3, 20, 45, 11, 30, 2])
+
+        subgraph = shardedGraph.subgraph(inds)
+        subgraph2 = self.graph.subgraph(inds)
+        nptst.assert_array_equal(subgraph.getWeightMatrix(), subgraph2.getWeightMatrix())
+
+        subgraph = shardedGraph.subgraph([])
+        self.assertEquals(subgraph.getNumVertices(), 0)
+
+        self.assertRaises(ValueError, shardedGraph.subgraph, [1.7, 2.2])
+        self.assertRaises(ValueError, shardedGraph.subgraph, [3, self.numVertices])
+
+    def testBreadthFirstSearch(self):
+        shardedGraph = ShardedGraph.fromGraph(self.directory, self.graph, 8)
+
+        for root in [0, 3, 17]:
+            self.assertEquals(shardedGraph.breadthFirstSearch(root), self.graph.breadthFirstSearch(root))
+
+        roots = numpy.array([5, 1, 5])
+        for maxDepth in [None, 0, 2]:
+            order, parents, depths = shardedGraph.breadthFirstSearchArrays(roots, maxDepth)
+            order2, parents2, depths2 = self.graph.breadthFirstSearchArrays(roots, maxDepth)
+            nptst.assert_array_equal(order, order2)
+            nptst.assert_array_equal(parents, parents2)
+            nptst.assert_array_equal(depths, depths2)
+
+    def testFindConnectedComponents(self):
+        shardedGraph = ShardedGraph.fromGraph(self.directory, self.graph, 8)
+
+        components = shardedGraph.findConnectedComponents()
+        components2 = self.graph.findConnectedComponents()
+        self.assertEquals(sorted(components), sorted(components2))
+        self.assertEquals([len(c) for c in components], [len(c) for c in components2])
+
+        labels = shardedGraph.componentLabels()
+        for component in components:
+            nptst.assert_array_equal(labels[component], numpy.min(component))
+
+        #A path whose vertices are in reverse order needs several passes
+        numVertices = 20
+        graph = SparseGraph(GeneralVertexList(numVertices))
+        perm = numpy.random.permutation(numVertices)
+        graph.addEdges(numpy.c_[perm[:-1], perm[1:]])
+        shardedGraph = ShardedGraph.fromGraph(self.directory, graph, 3)
+        nptst.assert_array_equal(shardedGraph.componentLabels(), 0)
+
+        graph = SparseGraph(GeneralVertexList(3), False)
+        shardedGraph = ShardedGraph.fromGraph(self.directory, graph, 3)
+        self.assertRaises(ValueError, shardedGraph.componentLabels)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@ import unittest
 import numpy
 import scipy
 import logging
+import numpy.testing as nptst
 
 class SparseGraphTest(unittest.TestCase, MatrixGraphTest):
     def setUp(self):
@@ -188,7 +189,67 @@ class SparseGraphTest(unittest.TestCase, MatrixGraphTest):
         self.assertEquals(graph[0, 1], 0)
         self.assertEquals(graph[2, 1], 1)
         self.assertEquals(graph[3, 8], 0.2)
-        
+
+    def testNeighboursFormats(self):
+        numVertices = 10
+
+        for frmt in ["csr", "csc", "lil"]:
+            graph = SparseGraph(numVertices, False, frmt=frmt)
+            graph.addEdge(1, 5, 2)
+            graph.addEdge(1, 3, 5)
+            graph.addEdge(9, 1, 1)
+            graph.addEdge(2, 3, 2)
+
+            nptst.assert_array_equal(numpy.sort(graph.neighbours(1)), numpy.array([3, 5]))
+            nptst.assert_array_equal(numpy.sort(graph.neighbourOf(3)), numpy.array([1, 2]))
+
+            graph.removeEdge(2, 3)
+            nptst.assert_array_equal(graph.neighbourOf(3), numpy.array([1]))
+
+            #Replacing the weight matrix also invalidates the cached transpose
+            W = sparse.csr_matrix((numVertices, numVertices))
+            W[4, 3] = 1
+            graph.setWeightMatrixSparse(W)
+            nptst.assert_array_equal(graph.neighbourOf(3), numpy.array([4]))
+            nptst.assert_array_equal(graph.neighbours(1), numpy.array([]))
+
+    def testSetOperationsFormats(self):
+        numVertices = 6
+
+        for frmt in ["csr", "csc", "lil"]:
+            graph = SparseGraph(numVertices, frmt=frmt)
+            graph.addEdge(0, 1, 1)
+            graph.addEdge(2, 3, -1)
+            graph.addEdge(4, 4, 2)
+
+            graph2 = SparseGraph(numVertices, frmt=frmt)
+            graph2.addEdge(2, 3, 1)
+            graph2.addEdge(1, 5, 3)
+
+            #Weights cancel in the sum but not in the union 
+            newGraph = graph.add(graph2)
+            self.assertEquals(type(newGraph.W), type(graph.W))
+            self.assertEquals(newGraph.getEdge(2, 3), None)
+            self.assertEquals(newGraph.getNumEdges(), 3)
+
+            newGraph = graph.union(graph2)
+            self.assertEquals(type(newGraph.W), type(graph.W))
+            self.assertEquals(newGraph.getEdge(2, 3), 1)
+            self.assertEquals(newGraph.getNumEdges(), 4)
+
+            newGraph = graph.intersect(graph2)
+            nptst.assert_array_equal(newGraph.getAllEdges(), numpy.array([[3, 2]]))
+
+            newGraph = graph.setDiff(graph2)
+            self.assertEquals(newGraph.getNumEdges(), 2)
+            self.assertEquals(newGraph.getEdge(4, 4), 1)
+
+            newGraph = graph.complement()
+            self.assertEquals(type(newGraph.W), type(graph.W))
+            self.assertEquals(newGraph.getNumDirEdges(), numVertices**2 - 5)
+            self.assertEquals(newGraph.getEdge(4, 4), None)
+            self.assertEquals(newGraph.getEdge(1, 1), 1)
+
 
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
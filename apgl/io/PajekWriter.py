@@ -76,10 +76,10 @@ class PajekWriter(GraphWriter):
         logging.info('Writing edges')
         if graph.isUndirected(): 
             f.write("*Edges\n")
-            f.write(self.__getEdgeString(graph))
+            self.__writeEdges(f, graph)
         else:
             f.write("*Arcs\n")
-            f.write(self.__getArcString(graph))
+            self.__writeArcs(f, graph)
                  
         f.close()
         logging.info("Finished, wrote " + str(numVertices) + " vertices & " + str(graph.getNumEdges()) + " edges.")
@@ -117,44 +117,35 @@ class PajekWriter(GraphWriter):
         else:
             return self.edgeWeightFunction(vertexIndex1, vertexIndex2, graph)
 
-    def __getEdgeString(self, graph):
-        edgeString = ""
-        ind = 0 
-        
-        for vertex1 in graph.getAllVertexIds():
-            Util.printIteration(ind, self.printStep, graph.getNumVertices())
-            neighbours = graph.neighbours(vertex1)
-            pajekIndex1 = self.vertexIdDict[vertex1]
-            
-            for vertex2 in neighbours:
-                pajekIndex2 = self.vertexIdDict[vertex2]
-                colour = self.getEdgeColour(vertex1, vertex2, graph)
-                edgeString = edgeString + str(pajekIndex1) + " " + str(pajekIndex2) + " " + str(self.getEdgeWeight(vertex1, vertex2, graph))
+    def __writeEdges(self, f, graph):
+        """
+        Write each undirected edge of the graph once to the file f, one block
+        of edges at a time. 
+        """
+        for rows, cols, values in graph.iterEdges():
+            edgeStrings = []
+
+            for vertex1, vertex2, value in zip(rows.tolist(), cols.tolist(), values):
+                if self.edgeWeightFunction != None:
+                    value = self.getEdgeWeight(vertex1, vertex2, graph)
+                edgeString = str(self.vertexIdDict[vertex1]) + " " + str(self.vertexIdDict[vertex2]) + " " + str(value)
                 edgeString = edgeString + " w " + str(self.getEdgeSize(vertex1, vertex2, graph))
-                edgeString = edgeString + " c " + colour + "\n"
-                
-            ind = ind + 1
-                    
-        return edgeString
+                edgeString = edgeString + " c " + self.getEdgeColour(vertex1, vertex2, graph) + "\n"
+                edgeStrings.append(edgeString)
+
+            f.write("".join(edgeStrings))
     
-    def __getArcString(self, graph):
-        arcString = ""
-        ind = 0 
-            
-        for vertex1 in graph.getAllVertexIds():
-            Util.printIteration(ind, self.printStep, graph.getNumVertices())
-            
-            neighbours = graph.neighbours(vertex1)
-            pajekIndex1 = self.vertexIdDict[vertex1]
-            
-            for vertex2 in neighbours:
-                pajekIndex2 = self.vertexIdDict[vertex2]
-                arcString = arcString + str(pajekIndex1) + " " + str(pajekIndex2) + " " + str(graph.getEdge(vertex1, vertex2))
-                arcString = arcString + " c " + self.colours[self.defaultColour] + "\n"
-                
-            ind = ind + 1
-           
-        return arcString
+    def __writeArcs(self, f, graph):
+        """
+        Write the directed edges of the graph to the file f, one block of edges
+        at a time. 
+        """
+        colour = self.colours[self.defaultColour]
+
+        for rows, cols, values in graph.iterEdges():
+            pajekIndices1 = [self.vertexIdDict[vertex1] for vertex1 in rows.tolist()]
+            pajekIndices2 = [self.vertexIdDict[vertex2] for vertex2 in cols.tolist()]
+            f.write("".join([str(index1) + " " + str(index2) + " " + str(value) + " c " + colour + "\n" for index1, index2, value in zip(pajekIndices1, pajekIndices2, values)]))
     
     defaultColour = None
     vertexIdDict = None
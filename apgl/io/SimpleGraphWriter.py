@@ -39,20 +39,16 @@ class SimpleGraphWriter(GraphWriter):
             f.write("Edges\n")
         else:
             f.write("Arcs\n")
-        f.write(self.__getArcString(graph))
+        self.__writeArcs(f, graph)
 
         f.close()
         logging.info("Finished, wrote " + str(numVertices) + " vertices & " + str(graph.getNumEdges()) + " edges.")
 
-    def __getArcString(self, graph):
-        arcString = ""
-
-        for edge in graph.getAllEdges():
-            vertex1 = edge[0]
-            vertex2 = edge[1]
-
-            index1 = self.vertexIdDict[vertex1]
-            index2 = self.vertexIdDict[vertex2]
-            arcString = arcString + str(index1) + ", " + str(index2) + ", " + str(graph.getEdge(vertex1, vertex2)) + "\n"
-
-        return arcString
\ No newline at end of file
+    def __writeArcs(self, f, graph):
+        """
+        Write the edges of the graph to the file f one block at a time.
+        """
+        for rows, cols, values in graph.iterEdges():
+            indices1 = [self.vertexIdDict[vertex1] for vertex1 in rows.tolist()]
+            indices2 = [self.vertexIdDict[vertex2] for vertex2 in cols.tolist()]
+            f.write("".join([str(index1) + ", " + str(index2) + ", " + str(value) + "\n" for index1, index2, value in zip(indices1, indices2, values)]))
@@ -1,6 +1,8 @@
 
 import unittest
 import os
+import shutil
+import tempfile
 from apgl.graph.DictGraph import DictGraph
 from apgl.io.SimpleGraphWriter import SimpleGraphWriter
 from apgl.util.PathDefaults import PathDefaults 
@@ -36,6 +38,34 @@ class  SimpleGraphWriterTest(unittest.TestCase):
         #os.remove(fileName1 + ".txt")
         #os.remove(fileName2 + ".txt")
 
+    def testWriteIntValues(self):
+        #Mixed int and float edge values are written as given
+        sgw = SimpleGraphWriter()
+        directory = tempfile.mkdtemp(dir=PathDefaults.getTempDir())
+        graph = DictGraph(False)
+        graph.addEdge("a", "b", 1.5)
+        graph.addEdge("b", "c", 2)
+        graph.addEdge("c", "a", 7)
+
+        try:
+            fileName = os.path.join(directory, "dictTestIntValues")
+            sgw.writeToFile(fileName, graph)
+
+            f = open(fileName + ".txt")
+            lines = f.read().splitlines()
+            f.close()
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEquals(lines[0:4], ["Vertices", "0", "1", "2"])
+        self.assertEquals(lines[4], "Arcs")
+        self.assertEquals(len(lines), 8)
+        ids = dict(zip(graph.getAllVertexIds(), range(3)))
+        edges = set(lines[5:])
+        self.assertTrue("%d, %d, 1.5" % (ids["a"], ids["b"]) in edges)
+        self.assertTrue("%d, %d, 2" % (ids["b"], ids["c"]) in edges)
+        self.assertTrue("%d, %d, 7" % (ids["c"], ids["a"]) in edges)
+
 if __name__ == '__main__':
     unittest.main()
 
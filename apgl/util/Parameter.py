@@ -23,6 +23,8 @@ class Parameter(object):
 
         :param objectType: The object to test. `
         """
+        if not Parameter.checking:
+            return True
         if not isinstance(obj, objectType):
             return Parameter.whatToDo("Expecting object of type " + str(objectType) + " but received " + str(obj.__class__ ), softCheck)
         return True
@@ -36,6 +38,8 @@ class Parameter(object):
         :param val: The value to test. 
         :type val: :class:`bool`
         """
+        if not Parameter.checking:
+            return True
         if type(val) != bool:
             return Parameter.whatToDo("Expecting boolean but received " + str(type(val)), softCheck)
         return True
@@ -56,6 +60,8 @@ class Parameter(object):
         :param max: The maximum+1 value of i.
         :type max: :class:`int`
         """
+        if not Parameter.checking:
+            return True
         if not (type(min) in Parameter.intTypes or min == float("-inf")):
             return Parameter.whatToDo("Minimum value is not an integer: " + str(min), softCheck)
         if not (type(max) in Parameter.intTypes or max == float("inf")):
@@ -83,6 +89,8 @@ class Parameter(object):
         :param max: The maximum value of i.
         :type max: :class:`int`
         """
+        if not Parameter.checking:
+            return True
         if not (type(min) in Parameter.intTypes or min == float("-inf")):
             return Parameter.whatToDo("Minimum value is not an integer: " + str(min), softCheck)
         if not (type(max) in Parameter.intTypes or max == float("inf")):
@@ -110,6 +118,8 @@ class Parameter(object):
         :param max: The maximum value of i.
         :type max: :class:`float`
         """
+        if not Parameter.checking:
+            return True
         if type(min) not in Parameter.floatTypes:
             return Parameter.whatToDo("Minimum value is not a float: " + str(min), softCheck)
         if type(max) not in Parameter.floatTypes:
@@ -132,6 +142,8 @@ class Parameter(object):
         :param strList: A list of valid strings.
         :type strList: :class:`list`
         """
+        if not Parameter.checking:
+            return True
         if type(strList) != list:
             return Parameter.whatToDo("Second parameter is required to be a list: " + str(strList), softCheck)
 
@@ -156,20 +168,154 @@ class Parameter(object):
         :param params: A list of parameter to the checking function. 
         :type lst: :class:`list`
         """
+        if not Parameter.checking:
+            return True
         if type(lst) != list and type(lst) != numpy.ndarray:
             return Parameter.whatToDo("First parameter is required to be a list or array, not " + str(type(lst)), softCheck)
         if type(lst) == numpy.ndarray and lst.ndim != 1:
             return Parameter.whatToDo("First parameter must be 1 dimensional: " + str(lst.shape), softCheck)
 
+        #Check arrays and integer lists in one pass. Lists of floats are checked
+        #elementwise since conversion to an array would silently accept ints
+        if func in Parameter.arrayChecks and (type(lst) == numpy.ndarray or func != Parameter.checkFloat):
+            array = numpy.asarray(lst)
+            if array.dtype.kind != "O":
+                return Parameter.arrayChecks[func](array, *params, softCheck=softCheck)
+
         for i in lst:
             func(i, *params)
         return True
+
+    @staticmethod
+    def checkIndexArray(array, min, max, softCheck = False):
+        """
+        Check if all elements of a 1D array are integers between min inclusive
+        and max exclusive and raise a ValueError if they are not. This is the
+        vectorised analogue of checkIndex, and the dtype, bounds and integrality
+        are checked in a single pass over the array.
+
+        :param array: The array to test, such that min <= array[i] < max.
+        :type array: :class:`numpy.ndarray`
+
+        :param min: The minimum value of the elements.
+        :type min: :class:`int`
+
+        :param max: The maximum+1 value of the elements.
+        :type max: :class:`int`
+        """
+        if not Parameter.checking:
+            return True
+        return Parameter.__checkNumericArray(array, min, max, True, False, softCheck)
+
+    @staticmethod
+    def checkIntArray(array, min, max, softCheck = False):
+        """
+        Check if all elements of a 1D array are integers between min and max
+        inclusive and raise a ValueError if they are not. This is the vectorised
+        analogue of checkInt.
+
+        :param array: The array to test, such that min <= array[i] <= max.
+        :type array: :class:`numpy.ndarray`
+
+        :param min: The minimum value of the elements.
+        :type min: :class:`int`
+
+        :param max: The maximum value of the elements.
+        :type max: :class:`int`
+        """
+        if not Parameter.checking:
+            return True
+        return Parameter.__checkNumericArray(array, min, max, True, True, softCheck)
+
+    @staticmethod
+    def checkFloatArray(array, min, max, softCheck = False):
+        """
+        Check if all elements of a 1D array are floating point values between min
+        and max inclusive and raise a ValueError if they are not. This is the
+        vectorised analogue of checkFloat.
+
+        :param array: The array to test, such that min <= array[i] <= max.
+        :type array: :class:`numpy.ndarray`
+
+        :param min: The minimum value of the elements.
+        :type min: :class:`float`
+
+        :param max: The maximum value of the elements.
+        :type max: :class:`float`
+        """
+        if not Parameter.checking:
+            return True
+        return Parameter.__checkNumericArray(array, min, max, False, True, softCheck)
+
+    @staticmethod
+    def __checkNumericArray(array, min, max, integer, maxInclusive, softCheck):
+        """
+        Check the dtype of a 1D array and that its elements lie in [min, max] or
+        [min, max).
+        """
+        if integer:
+            if not (type(min) in Parameter.intTypes or min == float("-inf")):
+                return Parameter.whatToDo("Minimum value is not an integer: " + str(min), softCheck)
+            if not (type(max) in Parameter.intTypes or max == float("inf")):
+                return Parameter.whatToDo("Maximum value is not an integer: " + str(max), softCheck)
+        else:
+            if type(min) not in Parameter.floatTypes:
+                return Parameter.whatToDo("Minimum value is not a float: " + str(min), softCheck)
+            if type(max) not in Parameter.floatTypes:
+                return Parameter.whatToDo("Maximum value is not a float: " + str(max), softCheck)
+
+        if type(array) != numpy.ndarray:
+            return Parameter.whatToDo("Expecting an array but received " + str(type(array)), softCheck)
+        if array.ndim != 1:
+            return Parameter.whatToDo("Array must be 1 dimensional: " + str(array.shape), softCheck)
+        if array.shape[0] == 0:
+            return True
+
+        if integer and array.dtype.kind not in ["i", "u"]:
+            return Parameter.whatToDo("Invalid array dtype (not int): " + str(array.dtype), softCheck)
+        if not integer and array.dtype.kind != "f":
+            return Parameter.whatToDo("Invalid array dtype (not float): " + str(array.dtype), softCheck)
+
+        if maxInclusive:
+            invalid = numpy.logical_or(array < min, array > max)
+            rangeStr = " not in [" + str(min)+ ", " + str(max) + "]"
+        else:
+            invalid = numpy.logical_or(array < min, array >= max)
+            rangeStr = " not in [" + str(min)+ ", " + str(max-1) + "]"
+
+        if invalid.any():
+            i = numpy.flatnonzero(invalid)[0]
+            return Parameter.whatToDo("Invalid parameter value: " + str(array[i]) + rangeStr + " at position " + str(i), softCheck)
+        return True
+
+    @staticmethod
+    def setChecking(checking):
+        """
+        Turn parameter checking on or off for the whole process. When checking
+        is off all check methods return True without examining their input,
+        which removes the validation overhead in trusted pipelines. Invalid
+        input then leads to undefined behaviour.
+
+        :param checking: Whether parameters are checked.
+        :type checking: :class:`bool`
+        """
+        Parameter.checkBoolean(checking)
+        Parameter.checking = checking
+
+    @staticmethod
+    def isChecking():
+        """
+        :returns: True if parameter checking is turned on, otherwise False.
+        """
+        return Parameter.checking
             
     @staticmethod
     def checkArray(array, softCheck = False, arrayInfo = ""):
         """
         Check that an array contains no nan or inf values
         """
+        if not Parameter.checking:
+            return True
         if numpy.isinf(array).any():
             return Parameter.whatToDo("The array " + arrayInfo + " contains a 'inf' value", softCheck)
         if numpy.isnan(array).any():
@@ -184,6 +330,8 @@ class Parameter(object):
         Takes as input a matrix A and checks if it is symmetric by verifying whether
         ||A - A.T||_F < tol.
         """
+        if not Parameter.checking:
+            return True
         if type(A)==numpy.ndarray and ((A.T - A)**2).sum() > tol**2:
             return Parameter.whatToDo("A=" + arrayInfo + " is not a symmetric matrix, ||A.T - A||_F^2 = " + str(((A.T - A)**2).sum()), softCheck)
         elif scipy.sparse.issparse(A) and ((A.T - A).multiply(A.T - A)).sum() > tol**2:
@@ -196,6 +344,8 @@ class Parameter(object):
         Takes as input a matrix A and checks if it is orthogonal by verifying whether
         ||A*A.T - Id||_F < tol.
         """
+        if not Parameter.checking:
+            return True
         diff = numpy.linalg.norm(A.conj().T.dot(A) - numpy.eye(A.shape[1]))
         if diff > tol:
             try :
@@ -220,3 +370,7 @@ class Parameter(object):
     b = numpy.int32(2)
     intTypes = [int, numpy.int8, numpy.int16, type(a+b), type(b+a), numpy.int64]
     floatTypes = [float, numpy.float32, numpy.float64]
+    checking = True
+
+#Vectorised versions of the element checks used by checkList
+Parameter.arrayChecks = {Parameter.checkIndex: Parameter.checkIndexArray, Parameter.checkInt: Parameter.checkIntArray, Parameter.checkFloat: Parameter.checkFloatArray}
@@ -30,12 +30,7 @@ class SparseUtils(object):
         """
         Find the diagonal of a sparse matrix and return as a numpy array. 
         """
-        d = numpy.zeros(X.shape[0])
-
-        for i in range(X.shape[0]):
-            d[i] = X[i, i]
-
-        return d
+        return numpy.array(X.diagonal(), numpy.float)
 
     @staticmethod
     def norm(X):
@@ -76,8 +71,64 @@ class SparseUtils(object):
         for i in range(rowInds.shape[0]): 
             newX[rowInds[i], colInds[i]] = X[rowInds[i], colInds[i]]
             
-        return newX 
+        return newX
+
+    @staticmethod 
+    def rowEntries(X, rows): 
+        """
+        Given a sparse matrix X and an array of row indices rows, find all the 
+        non-zero entries in those rows using a single pass over the compressed 
+        row pointers of X. Returns a tuple (r, c, v) such that r is the position 
+        in rows of each entry, c is its column index and v is its value. The 
+        entries are ordered by position in rows. 
+        
+        :param X: a sparse matrix, converted to csr format if required. 
+        
+        :param rows: an array of row indices of X. 
+        :type rows: :class:`numpy.ndarray`
+        """
+        if not scipy.sparse.isspmatrix_csr(X): 
+            X = X.tocsr()
+        
+        rows = numpy.asarray(rows, numpy.int64)
+        starts = X.indptr[rows]
+        lengths = X.indptr[rows+1] - starts 
+        
+        r = numpy.repeat(numpy.arange(rows.shape[0]), lengths)
+        offsets = numpy.arange(r.shape[0]) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+        positions = numpy.repeat(starts, lengths) + offsets 
+        
+        return r, X.indices[positions], X.data[positions]
+        
+    @staticmethod 
+    def submatrix(X, inds, indexMap=None): 
+        """
+        Compute the square submatrix X[inds, :][:, inds] of a sparse matrix X 
+        without forming the intermediate matrix of full rows. The indices must 
+        be sorted and unique, and the result is a csr_matrix. One can optionally 
+        pass in indexMap, an array whose ith entry is the position of i in inds 
+        or -1 if i is not in inds, to avoid recomputing it. 
+        
+        :param X: a square sparse matrix. 
+        
+        :param inds: a sorted array of unique row/column indices. 
+        :type inds: :class:`numpy.ndarray`
+        
+        :param indexMap: an optional array mapping indices of X to those of the submatrix. 
+        :type indexMap: :class:`numpy.ndarray`
+        """
+        inds = numpy.asarray(inds, numpy.int64)
+        
+        if indexMap is None: 
+            indexMap = numpy.ones(X.shape[0], numpy.int64)*-1 
+            indexMap[inds] = numpy.arange(inds.shape[0])
         
+        r, c, v = SparseUtils.rowEntries(X, inds)
+        c = indexMap[c]
+        mask = c >= 0 
+        r, c, v = r[mask], c[mask], v[mask]
         
+        indptr = numpy.zeros(inds.shape[0]+1, numpy.int64)
+        numpy.cumsum(numpy.bincount(r, minlength=inds.shape[0]), out=indptr[1:])
         
-        
\ No newline at end of file
+        return scipy.sparse.csr_matrix((v, c, indptr), shape=(inds.shape[0], inds.shape[0]))
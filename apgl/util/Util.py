@@ -36,12 +36,8 @@ class Util(object):
         if v.ndim != 1: 
             raise ValueError("Input must be a dimension 1 vector")
         
-        uniqElements = numpy.unique(v)
-        numElements = uniqElements.shape[0]
-        hist = numpy.zeros(numElements)
-        
-        for i in range(0, numElements): 
-            hist[i] = sum(v == uniqElements[i])
+        uniqElements, counts = Util.__uniqueCounts(v)
+        hist = numpy.array(counts, numpy.float)
 
         return (hist, uniqElements)
 
@@ -53,14 +49,25 @@ class Util(object):
         if v.ndim != 1:
             raise ValueError("Input must be a dimension 1 vector")
 
-        uniqElements = numpy.unique(v)
-        freqs = numpy.zeros(uniqElements.shape[0])
-
-        for i in range(uniqElements.shape[0]):
-            freqs[i] = numpy.sum(v == uniqElements[i])
+        uniqElements, freqs = Util.__uniqueCounts(v)
 
         return uniqElements[numpy.argmax(freqs)]
     
+    @staticmethod
+    def __uniqueCounts(v):
+        """
+        Return the sorted unique elements of a 1D vector v and their counts. 
+        Non-negative integers with a small maximum value, such as degree 
+        sequences, are counted in O(n) time with bincount and otherwise v is 
+        sorted. bincount cannot safely cast uint64 so it is sorted. 
+        """
+        if v.dtype.kind in "iub" and v.dtype != numpy.uint64 and v.shape[0] != 0 and v.min() >= 0 and v.max() <= 2*v.shape[0]:
+            counts = numpy.bincount(v)
+            inds = numpy.flatnonzero(counts)
+            return inds.astype(v.dtype), counts[inds]
+        else:
+            return numpy.unique(v, return_counts=True)
+
     @staticmethod  
     def sampleWithoutReplacement(sampleSize, totalSize):
         """ 
@@ -192,20 +199,34 @@ class Util(object):
         return gamma 
 
     @staticmethod
-    def fitDiscretePowerLaw(x, xmins = None):
+    def fitDiscretePowerLaw(x, xmins = None, newton = False):
         """
         Take a sample of discrete data points which are drawn from a power law probability
         distribution (p(x) = x-alpha / zeta(alpha, xmin)) and return the exponent.
         If xmins is supplied then it searches through the set of xmins rather than
         using all possible xmins. Most of the time it helps to keep xmins low. 
 
+        The likelihoods of all pairs of xmin and alpha in [1.5, 3.5) are computed 
+        at once using suffix sums over the histogram of x, and the KS statistics
+        of all xmins are computed from the cumulative histogram. If newton is 
+        True then the best alpha for each xmin is refined using Newton's method 
+        on the likelihood, starting from the best alpha on the grid. 
+
         Returns the goodness of fit, best alpha and xmin. If there is only 1 unique 
         value of x then -1, -1 min(x) is returned.
 
+        :param x: A vector of non-negative integers.
+        :type x: :class:`numpy.ndarray`
+
+        :param xmins: A vector of candidate values of xmin, or None.
+        :type xmins: :class:`numpy.ndarray`
+
+        :param newton: Whether to refine alpha using Newton's method.
+        :type newton: :class:`bool`
         """
-        
+        x = numpy.array(x, numpy.int)
         xmax = numpy.max(x)
-        if xmins == None:
+        if xmins is None:
             xmin = numpy.max(numpy.array([numpy.min(x), 1]))
             xmins = numpy.arange(xmin, xmax)
 
@@ -213,33 +234,89 @@ class Util(object):
         if xmins.shape[0] == 0:
             return -1, -1, numpy.min(x)
 
+        xmins = numpy.array(xmins, numpy.int)
         alphas = numpy.arange(1.5, 3.5, 0.01)
-        ksAlpha = numpy.zeros((xmins.shape[0], 2))
 
-        for j in range(xmins.shape[0]):
-            xmin = xmins[j]
-            z = x[x >= xmin]
-            n = z.shape[0]
+        #Number of elements and sum of log(x) for x >= xmin, for each xmin 
+        hist = numpy.bincount(x, minlength=max(xmax, numpy.max(xmins))+2)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            logHist = hist*numpy.log(numpy.arange(hist.shape[0]))
+        logHist[0] = 0 
+        ns = numpy.cumsum(hist[::-1])[::-1][xmins]
+        sumLogxs = numpy.cumsum(logHist[::-1])[::-1][xmins]
 
-            sumLogx = numpy.sum(numpy.log(z))
-            likelyhoods = numpy.zeros(alphas.shape[0])
-            
-            for i in range(alphas.shape[0]):
-                likelyhoods[i] = -n*numpy.log(scipy.special.zeta(alphas[i], xmin)) -alphas[i]*sumLogx
-        
-            k = numpy.argmax(likelyhoods)
+        likelyhoods = -numpy.outer(ns, numpy.ones(alphas.shape[0]))*numpy.log(scipy.special.zeta(alphas[None, :], xmins[:, None])) 
+        likelyhoods -= numpy.outer(sumLogxs, alphas)
+        bestAlphas = alphas[numpy.argmax(likelyhoods, 1)]
+
+        if newton: 
+            bestAlphas = Util.__newtonPowerLaw(bestAlphas, xmins, ns, sumLogxs, alphas[0], alphas[-1])
+
+        ks = Util.__powerLawKs(hist, xmax, xmins, ns, bestAlphas)
+        i = numpy.argmin(ks)
+
+        return ks[i], bestAlphas[i], xmins[i]
+
+    @staticmethod
+    def __newtonPowerLaw(alphas, xmins, ns, sumLogxs, minAlpha, maxAlpha, numIterations=20, h=10**-4):
+        """
+        Refine the exponents alphas of a discrete power law for each xmin by 
+        maximising the log likelihood -n log(zeta(alpha, xmin)) - alpha sum(log(x))
+        using Newton's method. The derivatives of log(zeta) are found by central 
+        differences, and alpha is kept in [minAlpha, maxAlpha] since the 
+        likelihood need not have a maximum when there are few x >= xmin. 
+        """
+        alphas = alphas.copy()
+        converged = ns == 0 
 
-            #Compute KS statistic
-            cdf = numpy.cumsum(numpy.bincount(z)[xmin:xmax]/float(n))
-            fit = numpy.arange(xmin, xmax)**-alphas[k] /scipy.special.zeta(alphas[k], xmin)
-            fit = numpy.cumsum(fit)
-            ksAlpha[j, 0] = numpy.max(numpy.abs(cdf - fit))
-            ksAlpha[j, 1] = alphas[k]
+        for i in range(numIterations):
+            logZetas = numpy.log(scipy.special.zeta(numpy.c_[alphas-h, alphas, alphas+h], xmins[:, None]))
+            grad = -ns*(logZetas[:, 2] - logZetas[:, 0])/(2*h) - sumLogxs
+            hess = -ns*(logZetas[:, 2] - 2*logZetas[:, 1] + logZetas[:, 0])/h**2
 
-        i = numpy.argmin(ksAlpha[:, 0])
+            step = numpy.zeros(alphas.shape[0])
+            valid = numpy.logical_and(hess < 0, numpy.logical_not(converged))
+            step[valid] = grad[valid]/hess[valid]
+            alphas = numpy.clip(alphas - step, minAlpha, maxAlpha)
+            converged = numpy.logical_or(converged, numpy.abs(step) < h)
 
-        return ksAlpha[i, 0], ksAlpha[i, 1], xmins[i]
+            if converged.all(): 
+                break 
 
+        return alphas
+
+    @staticmethod
+    def __powerLawKs(hist, xmax, xmins, ns, alphas):
+        """
+        Compute the KS statistic of the fit of a discrete power law for each xmin
+        and corresponding alpha over the range [xmin, xmax). Between consecutive 
+        values of x the empirical cdf is constant and the fitted cdf is 
+        increasing, so the maximum difference is found at xmin, the values of x 
+        and the values of x less 1. 
+        """
+        cumHist = numpy.cumsum(hist)
+        uniqX = numpy.flatnonzero(hist)
+        points = numpy.union1d(uniqX, uniqX-1)
+        points = points[numpy.logical_and(points >= 0, points < xmax)]
+
+        ks = numpy.zeros(xmins.shape[0])
+        blockSize = max(2**20 // (points.shape[0]+1), 1)
+
+        for i in range(0, xmins.shape[0], blockSize):
+            blockXmins = xmins[i:i+blockSize, None]
+            blockAlphas = alphas[i:i+blockSize, None]
+            blockPoints = numpy.c_[blockXmins, numpy.repeat(points[None, :], blockXmins.shape[0], 0)]
+            mask = numpy.logical_and(blockPoints >= blockXmins, blockPoints < xmax)
+            
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                cdf = (cumHist[blockPoints] - cumHist[blockXmins-1]*(blockXmins>0))/ns[i:i+blockSize, None].astype(numpy.float)
+                fit = 1 - scipy.special.zeta(blockAlphas, blockPoints+1)/scipy.special.zeta(blockAlphas, blockXmins)
+            
+            diffs = numpy.where(mask, numpy.abs(cdf - fit), -numpy.inf)
+            ks[i:i+blockSize] = numpy.max(diffs, 1)
+
+        ks[numpy.logical_or(ks == -numpy.inf, numpy.isnan(ks))] = numpy.inf
+        return ks
 
     @staticmethod
     def entropy(v):
@@ -247,15 +324,10 @@ class Util(object):
         Compute the information entropy of a vector of random vector observations
         using the log to the base 2.
         """
+        counts = Util.__uniqueCounts(numpy.ravel(v))[1]
+        probs = counts/float(v.shape[0])
 
-        items = numpy.unique(v)
-        infEnt = 0
-
-        for i in items:
-            prob = numpy.sum(v==i)/float(v.shape[0])
-            infEnt -= prob * numpy.log2(prob)
-
-        return infEnt
+        return -numpy.sum(probs * numpy.log2(probs))
 
     @staticmethod
     def expandIntArray(v):
@@ -265,16 +337,9 @@ class Util(object):
         vector is [0, 1, 1, 1, 2, 2, 3, 3, 3, 3]. 
         """
         Parameter.checkClass(v, numpy.ndarray)
-        Parameter.checkList(v, Parameter.checkInt, [0, float('inf')])
-        
-        w = numpy.zeros(numpy.sum(v), numpy.int)
-        currentInd = 0
-        
-        for i in range(v.shape[0]):
-            w[currentInd:currentInd+v[i]] = i
-            currentInd += v[i]
+        Parameter.checkIntArray(v, 0, float('inf'))
 
-        return w
+        return numpy.repeat(numpy.arange(v.shape[0], dtype=numpy.int), v)
 
 
     @staticmethod
@@ -662,12 +727,7 @@ class Util(object):
         Find the minimum element of a 1d array v for each subarray, starting 
         with the 1st elemnt. 
         """
-        u = numpy.zeros(v.shape[0])
-        
-        for i in range(v.shape[0]):
-            u[i] = numpy.min(v[0:i+1])
-            
-        return u 
+        return numpy.array(numpy.minimum.accumulate(v), numpy.float)
         
     @staticmethod         
     def argsort(seq):
@@ -722,15 +782,21 @@ class Util(object):
     @staticmethod 
     def argmaxN(a, N): 
         """
-        Return the top N elements of numpy array a 
+        Return the indices of the top N elements of numpy array a in descending 
+        order of value, with ties broken by the smallest index. The N largest 
+        elements are found in linear time using a partition and only these are 
+        sorted. 
         """
-        b = numpy.zeros(N, numpy.int)
-        tempA = a.copy()  
-        minA = numpy.min(a)
+        N = min(N, a.shape[0])
+        if N == 0: 
+            return numpy.zeros(0, numpy.int)
         
-        for i in range(N):
-            idx = numpy.argmax(tempA)
-            b[i] = idx 
-            tempA[idx] = minA
-            
-        return b 
+        threshold = numpy.partition(a, a.shape[0]-N)[a.shape[0]-N]
+        larger = numpy.flatnonzero(a > threshold)
+        equal = numpy.flatnonzero(a == threshold)[0:N-larger.shape[0]]
+        inds = numpy.sort(numpy.r_[larger, equal])[::-1]
+        
+        #A stable sort of reversed indices gives the smallest index first for ties 
+        b = inds[numpy.argsort(a[inds], kind="mergesort")[::-1]]
+        
+        return numpy.array(b, numpy.int) 
@@ -32,6 +32,18 @@ class ParameterProfile():
         stats = pstats.Stats(self.profileFileName)
         stats.strip_dirs().sort_stats("cumulative").print_stats(40)
 
+    def profileCheckList(self):
+        n = 10**6
+        inds = numpy.random.randint(0, n, n)
+
+        def runCheckList():
+            for i in range(10):
+                Parameter.checkList(inds, Parameter.checkIndex, [0, n])
+
+        print("Starting to profile ... ")
+        cProfile.runctx('runCheckList()', globals(), locals(), self.profileFileName)
+        stats = pstats.Stats(self.profileFileName)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(40)
 
 profiler = ParameterProfile()
 profiler.profileCheckInt()
\ No newline at end of file
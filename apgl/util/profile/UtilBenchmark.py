@@ -0,0 +1,89 @@
+"""
+Micro-benchmarks of the vectorised statistics helpers of Util, and of the
+power law fit used for degree sequences. Each helper is timed on vectors of
+increasing size, and compared to the original loop implementation on a small
+vector since the loops are O(nu) or O(n^2). Pass
+a list of sizes as arguments to change the default of 10^6 and 10^7, e.g.
+python UtilBenchmark.py 1000000 100000000 (which requires several GB).
+"""
+import numpy
+import logging
+import sys
+import time
+from apgl.util.Util import Util
+
+logging.basicConfig(stream=sys.stdout, level=logging.INFO)
+numpy.random.seed(22)
+
+
+def loopHistogram(v):
+    uniqElements = numpy.unique(v)
+    hist = numpy.zeros(uniqElements.shape[0])
+    for i in range(uniqElements.shape[0]):
+        hist[i] = numpy.sum(v == uniqElements[i])
+    return (hist, uniqElements)
+
+def loopEntropy(v):
+    infEnt = 0
+    for i in numpy.unique(v):
+        prob = numpy.sum(v==i)/float(v.shape[0])
+        infEnt -= prob * numpy.log2(prob)
+    return infEnt
+
+def loopCumMin(v):
+    u = numpy.zeros(v.shape[0])
+    for i in range(v.shape[0]):
+        u[i] = numpy.min(v[0:i+1])
+    return u
+
+def loopArgmaxN(a, N):
+    b = numpy.zeros(N, numpy.int)
+    tempA = a.copy()
+    minA = numpy.min(a)
+    for i in range(N):
+        idx = numpy.argmax(tempA)
+        b[i] = idx
+        tempA[idx] = minA
+    return b
+
+def loopExpandIntArray(v):
+    w = numpy.zeros(numpy.sum(v), numpy.int)
+    currentInd = 0
+    for i in range(v.shape[0]):
+        w[currentInd:currentInd+v[i]] = i
+        currentInd += v[i]
+    return w
+
+def timeFunction(func, *args):
+    startTime = time.time()
+    func(*args)
+    return time.time() - startTime
+
+def benchmarks(n):
+    """
+    Return a list of (name, vectorised function, loop function, arguments) for
+    vectors of size n.
+    """
+    degrees = numpy.random.zipf(2.5, n)
+    values = numpy.random.rand(n)
+    counts = numpy.random.randint(0, 3, n)
+    N = 1000
+
+    return [("histogram", Util.histogram, loopHistogram, (degrees,)),
+            ("mode", Util.mode, None, (degrees,)),
+            ("entropy", Util.entropy, loopEntropy, (degrees,)),
+            ("cumMin", Util.cumMin, loopCumMin, (values,)),
+            ("argmaxN", Util.argmaxN, loopArgmaxN, (values, N)),
+            ("expandIntArray", Util.expandIntArray, loopExpandIntArray, (counts,)),
+            ("fitDiscretePowerLaw", Util.fitDiscretePowerLaw, None, (degrees, numpy.arange(1, 20)))]
+
+sizes = [int(s) for s in sys.argv[1:]] or [10**6, 10**7]
+loopSize = 10**4
+
+for name, func, loopFunc, args in benchmarks(loopSize):
+    if loopFunc is not None:
+        logging.info(name + " n=" + str(loopSize) + ": loop " + "%.4f" % timeFunction(loopFunc, *args) + "s, vectorised " + "%.4f" % timeFunction(func, *args) + "s")
+
+for n in sizes:
+    for name, func, loopFunc, args in benchmarks(n):
+        logging.info(name + " n=" + str(n) + ": vectorised " + "%.4f" % timeFunction(func, *args) + "s")
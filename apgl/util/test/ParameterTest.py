@@ -113,6 +113,72 @@ class  ParameterTest(unittest.TestCase):
         lst = numpy.array([[0.1, 0.6, 1.4]])
         self.assertRaises(ValueError, Parameter.checkList, lst, Parameter.checkFloat, [0.1, 3.0])
 
+        lst = numpy.array([1, 2, 3], numpy.uint8)
+        Parameter.checkList(lst, Parameter.checkIndex, [0, 4])
+        self.assertRaises(ValueError, Parameter.checkList, lst, Parameter.checkIndex, [0, 3])
+        self.assertRaises(ValueError, Parameter.checkList, lst, Parameter.checkFloat, [0.0, 3.0])
+
+        #Lists of floats are checked elementwise
+        lst = [0.1, 1]
+        self.assertRaises(ValueError, Parameter.checkList, lst, Parameter.checkFloat, [0.0, 3.0])
+
+        #Empty lists and arrays are always valid
+        Parameter.checkList([], Parameter.checkInt, [1, 3])
+        Parameter.checkList(numpy.array([]), Parameter.checkIndex, [1, 3])
+
+    def testCheckIndexArray(self):
+        a = numpy.array([0, 4, 2, 2])
+
+        Parameter.checkIndexArray(a, 0, 5)
+        Parameter.checkIndexArray(a, 0, float("inf"))
+        Parameter.checkIndexArray(a.astype(numpy.int32), numpy.int32(0), numpy.int32(5))
+        self.assertRaises(ValueError, Parameter.checkIndexArray, a, 0, 4)
+        self.assertRaises(ValueError, Parameter.checkIndexArray, a, 1, 5)
+        self.assertRaises(ValueError, Parameter.checkIndexArray, a, 0.0, 5)
+        self.assertRaises(ValueError, Parameter.checkIndexArray, a.astype(numpy.float), 0, 5)
+        self.assertRaises(ValueError, Parameter.checkIndexArray, numpy.array([True]), 0, 5)
+        self.assertRaises(ValueError, Parameter.checkIndexArray, numpy.array([[1, 2]]), 0, 5)
+        self.assertRaises(ValueError, Parameter.checkIndexArray, [1, 2], 0, 5)
+
+        self.assertFalse(Parameter.checkIndexArray(a, 0, 4, softCheck=True))
+
+    def testCheckIntArray(self):
+        a = numpy.array([0, 4, 2, 2])
+
+        Parameter.checkIntArray(a, 0, 4)
+        Parameter.checkIntArray(a, float("-inf"), 4)
+        self.assertRaises(ValueError, Parameter.checkIntArray, a, 0, 3)
+        self.assertRaises(ValueError, Parameter.checkIntArray, a, 1, 4)
+        self.assertRaises(ValueError, Parameter.checkIntArray, a+0.5, 0, 5)
+
+    def testCheckFloatArray(self):
+        a = numpy.array([0.1, 0.6, 1.4])
+
+        Parameter.checkFloatArray(a, 0.1, 1.4)
+        Parameter.checkFloatArray(a.astype(numpy.float32), 0.0, float("inf"))
+        self.assertRaises(ValueError, Parameter.checkFloatArray, a, 0.2, 1.4)
+        self.assertRaises(ValueError, Parameter.checkFloatArray, a, 0.1, 1.0)
+        self.assertRaises(ValueError, Parameter.checkFloatArray, a, 0, 1.0)
+        self.assertRaises(ValueError, Parameter.checkFloatArray, numpy.array([1, 2]), 0.0, 3.0)
+
+    def testSetChecking(self):
+        self.assertTrue(Parameter.isChecking())
+
+        try:
+            Parameter.setChecking(False)
+            self.assertFalse(Parameter.isChecking())
+
+            Parameter.checkInt(-1, 0, 5)
+            Parameter.checkIndexArray(numpy.array([10]), 0, 5)
+            Parameter.checkList([1.5], Parameter.checkInt, [0, 5])
+            Parameter.checkBoolean(1)
+        finally:
+            Parameter.setChecking(True)
+
+        self.assertTrue(Parameter.isChecking())
+        self.assertRaises(ValueError, Parameter.checkInt, -1, 0, 5)
+        self.assertRaises(ValueError, Parameter.setChecking, 1)
+
 
     def checkBoolean(self):
         a = True
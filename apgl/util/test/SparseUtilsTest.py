@@ -0,0 +1,56 @@
+import unittest
+import numpy
+import scipy.sparse 
+import numpy.testing as nptst
+from apgl.util.SparseUtils import SparseUtils
+
+
+class SparseUtilsTest(unittest.TestCase):
+    def setUp(self): 
+        numpy.random.seed(21)
+        
+    def testDiag(self): 
+        X = scipy.sparse.rand(20, 20, 0.2, format="csr")
+        X[3, 3] = 2
+        
+        for Y in [X, X.tolil(), X.tocsc()]: 
+            d = SparseUtils.diag(Y)
+            nptst.assert_array_equal(d, numpy.diag(X.toarray()))
+            self.assertEqual(d.dtype, numpy.float)
+        
+    def testRowEntries(self): 
+        X = scipy.sparse.rand(20, 15, 0.2, format="csr")
+        rows = numpy.array([3, 0, 3, 19])
+        
+        r, c, v = SparseUtils.rowEntries(X, rows)
+        
+        for i in range(rows.shape[0]): 
+            nptst.assert_array_equal(c[r==i], X[rows[i], :].nonzero()[1])
+            nptst.assert_array_almost_equal(v[r==i], X[rows[i], c[r==i]].toarray().ravel())
+            
+        #Works with other formats and empty rows 
+        r, c, v = SparseUtils.rowEntries(X.tolil(), numpy.array([], numpy.int))
+        self.assertEquals(r.shape[0], 0)
+        
+    def testSubmatrix(self): 
+        n = 30
+        X = scipy.sparse.rand(n, n, 0.2, format="csr")
+        inds = numpy.array([0, 2, 5, 6, 20, 29])
+        
+        Y = SparseUtils.submatrix(X, inds)
+        nptst.assert_array_almost_equal(Y.toarray(), X.toarray()[inds, :][:, inds])
+        self.assertTrue(scipy.sparse.isspmatrix_csr(Y))
+        
+        Y = SparseUtils.submatrix(X.tocsc(), inds)
+        nptst.assert_array_almost_equal(Y.toarray(), X.toarray()[inds, :][:, inds])
+        
+        Y = SparseUtils.submatrix(X, numpy.array([], numpy.int))
+        self.assertEquals(Y.shape, (0, 0))
+        
+        indexMap = numpy.ones(n, numpy.int)*-1 
+        indexMap[inds] = numpy.arange(inds.shape[0])
+        Y = SparseUtils.submatrix(X, inds, indexMap)
+        nptst.assert_array_almost_equal(Y.toarray(), X.toarray()[inds, :][:, inds])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@ Created on 31 Jul 2009
 import unittest
 import numpy
 import scipy.linalg
+import scipy.special
 import logging
 import sys
 import numpy.testing as nptst 
@@ -37,6 +38,23 @@ class UtilTest(unittest.TestCase):
         self.assertTrue((freq == numpy.array([3, 1, 3, 2])).all())
         self.assertTrue((items == numpy.array([0, 1, 2, 5])).all())
 
+        v = numpy.array([0.5, 1.5, 0.5])
+        (freq, items) = Util.histogram(v)
+        nptst.assert_array_equal(freq, numpy.array([2, 1]))
+        nptst.assert_array_equal(items, numpy.array([0.5, 1.5]))
+
+        v = numpy.array([True, False, True])
+        (freq, items) = Util.histogram(v)
+        nptst.assert_array_equal(freq, numpy.array([1, 2]))
+        nptst.assert_array_equal(items, numpy.array([False, True]))
+
+        for dtype in [numpy.uint8, numpy.uint32, numpy.uint64]:
+            v = numpy.array([0, 0, 1, 5, 0, 2, 2, 2, 5], dtype)
+            (freq, items) = Util.histogram(v)
+            nptst.assert_array_equal(freq, numpy.array([3, 1, 3, 2]))
+            nptst.assert_array_equal(items, numpy.array([0, 1, 2, 5]))
+            self.assertEquals(items.dtype, dtype)
+
     def testComputeMeanVar(self):
         pass 
 
@@ -53,6 +71,12 @@ class UtilTest(unittest.TestCase):
         x = numpy.array([0])
         self.assertEquals(Util.mode(x), 0)
 
+        x = numpy.array([True, False, True])
+        self.assertEquals(Util.mode(x), True)
+
+        x = numpy.array([2, 7, 7], numpy.uint64)
+        self.assertEquals(Util.mode(x), 7)
+
     def testRank(self):
         X = numpy.random.rand(10, 1)
         self.assertEquals(Util.rank(X), 1)
@@ -177,6 +201,22 @@ class UtilTest(unittest.TestCase):
         ks, alpha2, xmin = Util.fitDiscretePowerLaw(x, xmins)
         self.assertAlmostEqual(alpha, alpha2, places=1)
 
+        ks2, alpha3, xmin2 = Util.fitDiscretePowerLaw(x, xmins, newton=True)
+        self.assertAlmostEqual(alpha, alpha3, places=1)
+        self.assertTrue(ks2 <= ks + 10**-3)
+        self.assertTrue(1.5 <= alpha3 <= 3.5)
+
+        #Compare the KS statistic of the best xmin with a direct computation 
+        z = x[x >= xmin]
+        xmax = numpy.max(x)
+        cdf = numpy.cumsum(numpy.bincount(z)[xmin:xmax]/float(z.shape[0]))
+        fit = numpy.cumsum(numpy.arange(xmin, xmax)**-alpha2 /scipy.special.zeta(alpha2, xmin))
+        self.assertAlmostEqual(ks, numpy.max(numpy.abs(cdf - fit)))
+
+        #Use all xmins 
+        ks, alpha2, xmin = Util.fitDiscretePowerLaw(x)
+        self.assertTrue(1 <= xmin < numpy.max(x))
+
     def testFitDiscretePowerLaw2(self):
         try:
             import networkx
@@ -201,6 +241,15 @@ class UtilTest(unittest.TestCase):
         v = numpy.array([1, 1, 1])
         self.assertEquals(Util.entropy(v), 0)
 
+        v = numpy.array([0, 1, 2, 3])
+        self.assertEquals(Util.entropy(v), 2)
+
+        v = numpy.array([True, False, True])
+        self.assertAlmostEquals(Util.entropy(v), 0.9182958340544896)
+
+        v = numpy.array([0, 1, 2, 3], numpy.uint64)
+        self.assertEquals(Util.entropy(v), 2)
+
 
     def testExpandIntArray(self):
         v = numpy.array([1, 3, 2, 4], numpy.int)
@@ -212,6 +261,10 @@ class UtilTest(unittest.TestCase):
         w = Util.expandIntArray(v)
         self.assertTrue((w == numpy.array([], numpy.int)).all())
 
+        v = numpy.array([0, 2, 0], numpy.int)
+        nptst.assert_array_equal(Util.expandIntArray(v), numpy.array([1, 1]))
+        self.assertRaises(ValueError, Util.expandIntArray, numpy.array([1, -1]))
+
 
     def testRandom2Choice(self):
         n = 1000
@@ -363,6 +416,21 @@ class UtilTest(unittest.TestCase):
         v = numpy.array([1, 2, 3])
         u = Util.cumMin(v)
         nptst.assert_array_equal(u, numpy.ones(3))    
+
+        v = numpy.array([])
+        u = Util.cumMin(v)
+        self.assertEquals(u.shape[0], 0)
+
+    def testArgmaxN(self): 
+        a = numpy.array([3, 1, 2, 3, 0, 2])
+        nptst.assert_array_equal(Util.argmaxN(a, 1), numpy.array([0]))
+        nptst.assert_array_equal(Util.argmaxN(a, 3), numpy.array([0, 3, 2]))
+        nptst.assert_array_equal(Util.argmaxN(a, 6), numpy.array([0, 3, 2, 5, 1, 4]))
+        nptst.assert_array_equal(Util.argmaxN(a, 10), numpy.array([0, 3, 2, 5, 1, 4]))
+        self.assertEquals(Util.argmaxN(a, 0).shape[0], 0)
+        
+        a = numpy.random.rand(100)
+        nptst.assert_array_equal(Util.argmaxN(a, 10), numpy.argsort(a)[::-1][0:10])
     
     
     def testExtendArray(self): 